@@ -3,12 +3,16 @@ package com.example.myapplication.backend.service
 import android.content.Context
 import com.example.myapplication.backend.database.DatabaseHelper
 import com.example.myapplication.data.model.*
+import okhttp3.OkHttpClient
+import okhttp3.Request
+import java.io.IOException
 import java.text.SimpleDateFormat
 import java.util.*
 
 class ProjectService(private val context: Context) {
     
     private val databaseHelper = DatabaseHelper(context)
+    private val httpClient = OkHttpClient()
     private val dateFormat = SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss.SSS'Z'", Locale.getDefault())
     
     fun getAllProjects(
@@ -146,6 +150,31 @@ class ProjectService(private val context: Context) {
         return updatedProject
     }
     
+    // Télécharge un document de `Project.documents` avec le jeton d'accès de l'utilisateur
+    fun downloadDocument(url: String, userId: Int): ProjectDocumentFile? {
+        val tokens = databaseHelper.getTokenByUserId(userId) ?: return null
+        val request = Request.Builder()
+            .url(url)
+            .header("Authorization", "Bearer ${tokens.first}")
+            .build()
+        
+        httpClient.newCall(request).execute().use { response ->
+            if (response.code == 404) return null
+            if (!response.isSuccessful) {
+                throw IOException("Téléchargement du document impossible (HTTP ${response.code})")
+            }
+            val body = response.body ?: return null
+            val nom = response.header("Content-Disposition")
+                ?.let { Regex("filename=\"?([^\";]+)\"?").find(it)?.groupValues?.get(1) }
+                ?: url.trimEnd('/').substringAfterLast('/')
+            return ProjectDocumentFile(
+                nom = nom,
+                contentType = body.contentType()?.toString(),
+                contenu = body.bytes()
+            )
+        }
+    }
+    
     private fun getStatusDisplay(status: String): String {
         return when (status) {
             "EN_ATTENTE_VALIDATION" -> "En attente de validation"
@@ -34,12 +34,23 @@ data class Project(
     val adresse: String? = null,
     @SerializedName("a_localisation")
     val aLocalisation: Boolean = false,
+    val documents: ProjectDocuments? = null
+)
+
+// URLs de téléchargement des documents (null si absent) ; l'endpoint exige le jeton d'accès
+data class ProjectDocuments(
     @SerializedName("business_plan")
     val businessPlan: String? = null,
     @SerializedName("plan_juridique")
     val planJuridique: String? = null
 )
 
+data class ProjectDocumentFile(
+    val nom: String,
+    val contentType: String?,
+    val contenu: ByteArray
+)
+
 enum class ProjectStatus {
     @SerializedName("EN_ATTENTE_VALIDATION")
     EN_ATTENTE_VALIDATION,
@@ -105,4 +105,17 @@ class ProjectRepository(private val context: Context) {
             Result.failure(e)
         }
     }
+    
+    suspend fun downloadDocument(url: String, userId: Int): Result<ProjectDocumentFile> = withContext(Dispatchers.IO) {
+        try {
+            val document = projectService.downloadDocument(url, userId)
+            if (document != null) {
+                Result.success(document)
+            } else {
+                Result.failure(Exception("Document non trouvé"))
+            }
+        } catch (e: Exception) {
+            Result.failure(e)
+        }
+    }
 } 
\ No newline at end of file
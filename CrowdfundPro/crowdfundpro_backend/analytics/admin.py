@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import Sketch
+
+
+@admin.register(Sketch)
+class SketchAdmin(admin.ModelAdmin):
+    """
+    Administration pour les résumés statistiques
+    """
+    list_display = ('nom', 'taille', 'date_modification')
+    exclude = ('donnees',)
+    readonly_fields = ('nom', 'taille', 'date_modification')
+
+    def taille(self, obj):
+        return f"{len(obj.donnees)} octets"
+    taille.short_description = 'Taille'
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from analytics.models import Sketch
+from analytics.store import SKETCHES, empty, save, update
+from investments.models import Investment
+
+
+class Command(BaseCommand):
+    help = "Recalcule les résumés statistiques depuis l'historique des investissements réussis"
+
+    def handle(self, *args, **options):
+        sketches = empty()
+        rows = Investment.objects.filter(statut_paiement='REUSSI').order_by().values_list(
+            'investisseur_id', 'projet_id', 'montant'
+        )
+        total = 0
+        for investisseur_id, projet_id, montant in rows.iterator(chunk_size=5000):
+            update(sketches, investisseur_id, projet_id, montant)
+            total += 1
+        with transaction.atomic():
+            save(sketches)
+            # Les deltas des processus commencés avant ce point sont compris dans l'historique :
+            # ils sont abandonnés à leur report
+            Sketch.objects.filter(nom__in=SKETCHES).update(generation=F('generation') + 1)
+        self.stdout.write(self.style.SUCCESS(f'Résumés recalculés sur {total} investissement(s)'))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sketch',
+            fields=[
+                ('nom', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('donnees', models.BinaryField()),
+                ('date_modification', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Résumé statistique',
+                'verbose_name_plural': 'Résumés statistiques',
+                'db_table': 'analytics_sketches',
+            },
+        ),
+    ]
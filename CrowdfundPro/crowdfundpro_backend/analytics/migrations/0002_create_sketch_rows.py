@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from analytics.sketches import KLL, CountMinSketch, HyperLogLog
+
+# Lignes verrouillées par les reports (select_for_update) : elles doivent exister
+EMPTY_SKETCHES = {
+    'investisseurs_distincts': HyperLogLog,
+    'montants_investis': KLL,
+    'montants_par_projet': CountMinSketch,
+}
+
+
+def create_rows(apps, schema_editor):
+    Sketch = apps.get_model('analytics', 'Sketch')
+    for nom, cls in EMPTY_SKETCHES.items():
+        Sketch.objects.get_or_create(nom=nom, defaults={'donnees': cls().to_bytes()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_create_sketch_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sketch',
+            name='generation',
+            field=models.PositiveIntegerField(default=0, help_text='Incrémentée par rebuild_sketches'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class Sketch(models.Model):
+    """
+    Résumé probabiliste sérialisé (voir `analytics.sketches`), fusionné avec
+    les deltas des processus par `analytics.store`.
+    """
+    nom = models.CharField(max_length=50, primary_key=True)
+    donnees = models.BinaryField()
+    generation = models.PositiveIntegerField(default=0, help_text="Incrémentée par rebuild_sketches")
+    date_modification = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'analytics_sketches'
+        verbose_name = 'Résumé statistique'
+        verbose_name_plural = 'Résumés statistiques'
+
+    def __str__(self):
+        return f"{self.nom} ({len(self.donnees)} octets)"
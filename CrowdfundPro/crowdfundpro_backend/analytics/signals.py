@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from investments.models import Investment
+from .store import delta_store
+
+
+@receiver(post_save, sender=Investment)
+def record_successful_investment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_statut_paiement_initial', None)
+    if instance.statut_paiement == 'REUSSI' and previous != 'REUSSI':
+        investisseur_id, projet_id, montant = instance.investisseur_id, instance.projet_id, instance.montant
+        transaction.on_commit(lambda: delta_store.record(investisseur_id, projet_id, montant))
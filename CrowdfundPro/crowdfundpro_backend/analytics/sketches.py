@@ -0,0 +1,185 @@
+"""
+Résumés probabilistes fusionnables, de taille fixe quel que soit le volume :
+- HyperLogLog : nombre d'éléments distincts (erreur ~1,04 / sqrt(2 ** p)) ;
+- KLL : quantiles (erreur de rang ~1,7 / k) ;
+- Count-Min (mise à jour conservatrice) : montants cumulés par clé
+  (surestimation bornée), avec une
+  liste de candidats pour les plus gros contributeurs.
+
+Deux résumés de même paramétrage se fusionnent sans perte supplémentaire,
+ce qui permet d'accumuler des deltas par processus et de les reporter en base.
+"""
+import hashlib
+import json
+import math
+import random
+import struct
+from array import array
+
+
+def _hash64(value, salt=b''):
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8, salt=salt).digest(), 'big')
+
+
+class HyperLogLog:
+
+    def __init__(self, p=14, registers=None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Petites cardinalités : comptage linéaire
+            return self.m * math.log(self.m / zeros)
+        return estimate
+
+    def to_bytes(self):
+        return bytes([self.p]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(p=data[0], registers=data[1:])
+
+
+class KLL:
+
+    def __init__(self, k=200, levels=None, n=0):
+        self.k = k
+        self.levels = levels or [[]]
+        self.n = n
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _size(self):
+        return sum(len(level) for level in self.levels)
+
+    def _compress(self):
+        while self._size() > sum(self._capacity(h) for h in range(len(self.levels))):
+            for h, level in enumerate(self.levels):
+                if len(level) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                    level.sort()
+                    offset = random.getrandbits(1)
+                    self.levels[h + 1].extend(level[offset::2])
+                    self.levels[h] = []
+                    break
+
+    def add(self, value):
+        self.levels[0].append(float(value))
+        self.n += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self.n += other.n
+        self._compress()
+
+    def quantiles(self, fractions):
+        items = sorted((value, 1 << h) for h, level in enumerate(self.levels) for value in level)
+        total = sum(weight for _value, weight in items)
+        if not total:
+            return [None for _fraction in fractions]
+        results = []
+        for fraction in fractions:
+            target = fraction * total
+            cumulative = 0
+            for value, weight in items:
+                cumulative += weight
+                if cumulative >= target:
+                    results.append(value)
+                    break
+            else:
+                results.append(items[-1][0])
+        return results
+
+    def bounds(self):
+        values = [value for level in self.levels for value in level]
+        return (min(values), max(values)) if values else (None, None)
+
+    def to_bytes(self):
+        return json.dumps({'k': self.k, 'n': self.n, 'levels': self.levels}, separators=(',', ':')).encode()
+
+    @classmethod
+    def from_bytes(cls, data):
+        state = json.loads(data)
+        return cls(k=state['k'], levels=state['levels'], n=state['n'])
+
+
+class CountMinSketch:
+
+    def __init__(self, width=4096, depth=5, counts=None, candidates=None, max_candidates=50):
+        self.width = width
+        self.depth = depth
+        self.counts = counts if counts is not None else array('d', bytes(8 * width * depth))
+        self.candidates = candidates or {}
+        self.max_candidates = max_candidates
+
+    def _cells(self, key):
+        for row in range(self.depth):
+            yield row * self.width + _hash64(key, salt=bytes([row])) % self.width
+
+    def estimate(self, key):
+        return min(self.counts[cell] for cell in self._cells(key))
+
+    def _offer(self, key):
+        self.candidates[key] = self.estimate(key)
+        if len(self.candidates) > self.max_candidates:
+            del self.candidates[min(self.candidates, key=self.candidates.get)]
+
+    def add(self, key, amount=1.0):
+        # Mise à jour conservatrice : seules les cellules sous la nouvelle
+        # estimation sont relevées (surestimation bien moindre, toujours fusionnable)
+        cells = list(self._cells(key))
+        target = min(self.counts[cell] for cell in cells) + amount
+        for cell in cells:
+            if self.counts[cell] < target:
+                self.counts[cell] = target
+        self._offer(key)
+
+    def merge(self, other):
+        for cell, value in enumerate(other.counts):
+            if value:
+                self.counts[cell] += value
+        for key in set(self.candidates) | set(other.candidates):
+            self._offer(key)
+
+    def top(self, limit):
+        return sorted(self.candidates.items(), key=lambda item: -item[1])[:limit]
+
+    def to_bytes(self):
+        header = struct.pack('<HHH', self.width, self.depth, self.max_candidates)
+        candidates = json.dumps(list(self.candidates), separators=(',', ':')).encode()
+        return header + struct.pack('<I', len(candidates)) + candidates + self.counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        width, depth, max_candidates = struct.unpack_from('<HHH', data)
+        (length,) = struct.unpack_from('<I', data, 6)
+        keys = json.loads(data[10:10 + length])
+        counts = array('d')
+        counts.frombytes(data[10 + length:])
+        sketch = cls(width, depth, counts=counts, max_candidates=max_candidates)
+        sketch.candidates = {key: sketch.estimate(key) for key in keys}
+        return sketch
@@ -0,0 +1,163 @@
+"""
+Statistiques de la plateforme tenues par résumés fusionnables.
+
+Chaque processus accumule les investissements réussis dans des résumés
+« delta » en mémoire, fusionnés dans la table `Sketch` (ligne verrouillée,
+puis réécrite) au plus toutes les `ANALYTICS_FLUSH_SECONDS`, et à l'arrêt
+du processus. La lecture charge les résumés persistés (une requête, taille
+fixe) et y fusionne le delta local : son coût ne dépend pas du volume
+d'investissements. Les investissements d'un processus arrêté brutalement
+depuis son dernier report sont perdus (`rebuild_sketches` recalcule tout).
+
+`rebuild_sketches` incrémente la génération des lignes `Sketch`. Chaque
+delta retient la génération lue à son premier enregistrement ; un delta
+commencé avant un recalcul est abandonné au report (et ignoré à la lecture),
+ses investissements étant déjà compris dans l'historique recalculé.
+
+Un report est appelé après la validation d'un paiement : en cas d'échec, le
+delta est réintégré au delta local (reporté au prochain essai) et l'erreur
+est journalisée, sans remonter jusqu'à la requête.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Sketch
+from .sketches import KLL, CountMinSketch, HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+SKETCHES = {
+    'investisseurs_distincts': HyperLogLog,
+    'montants_investis': KLL,
+    'montants_par_projet': CountMinSketch,
+}
+
+
+def empty():
+    return {name: cls() for name, cls in SKETCHES.items()}
+
+
+def update(sketches, investisseur_id, projet_id, montant):
+    sketches['investisseurs_distincts'].add(investisseur_id)
+    sketches['montants_investis'].add(float(montant))
+    sketches['montants_par_projet'].add(projet_id, float(montant))
+
+
+def _load():
+    """Résumés persistés et leur génération (celle des lignes, identique pour toutes)."""
+    sketches, generation = empty(), 0
+    rows = Sketch.objects.filter(nom__in=SKETCHES).values_list('nom', 'donnees', 'generation')
+    for nom, donnees, generation in rows:
+        sketches[nom] = SKETCHES[nom].from_bytes(bytes(donnees))
+    return sketches, generation
+
+
+def load():
+    return _load()[0]
+
+
+def current_generation():
+    return Sketch.objects.filter(nom__in=SKETCHES).values_list('generation', flat=True).first() or 0
+
+
+def save(sketches):
+    for nom, sketch in sketches.items():
+        Sketch.objects.update_or_create(nom=nom, defaults={'donnees': sketch.to_bytes()})
+
+
+class DeltaStore:
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._delta = empty()
+        self._pending = 0
+        self._generation = None
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, investisseur_id, projet_id, montant):
+        # Génération lue une fois par delta (au plus une requête par intervalle de report)
+        generation = self._generation
+        if generation is None:
+            generation = current_generation()
+        with self._lock:
+            if self._generation is None:
+                self._generation = generation
+            update(self._delta, investisseur_id, projet_id, montant)
+            self._pending += 1
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _take(self):
+        with self._lock:
+            delta, pending, generation = self._delta, self._pending, self._generation
+            self._delta, self._pending, self._generation = empty(), 0, None
+            self._last_flush = time.monotonic()
+        return delta, pending, generation
+
+    def _restore(self, delta, pending, generation):
+        """Réintègre un delta non reporté (avec ce qui a été enregistré entre-temps)."""
+        with self._lock:
+            for nom, sketch in delta.items():
+                sketch.merge(self._delta[nom])
+            self._delta = delta
+            self._pending += pending
+            # Le delta réintégré est le plus ancien : sa génération prévaut
+            self._generation = generation
+
+    def _merge_into_db(self, delta, generation):
+        """Fusionne le delta dans la table ; False s'il date d'avant un recalcul."""
+        with transaction.atomic():
+            # Verrouille les lignes (créées par la migration) : les reports concurrents sont sérialisés
+            generations = set(
+                Sketch.objects.select_for_update().filter(nom__in=SKETCHES).values_list('generation', flat=True)
+            )
+            if generations - {generation}:
+                return False
+            sketches = load()
+            for nom, sketch in sketches.items():
+                sketch.merge(delta[nom])
+            save(sketches)
+        return True
+
+    def flush(self):
+        delta, pending, generation = self._take()
+        if not pending:
+            return 0
+        try:
+            merged = self._merge_into_db(delta, generation)
+        except Exception:
+            logger.exception('Échec du report de %d investissement(s) dans les résumés statistiques', pending)
+            self._restore(delta, pending, generation)
+            return 0
+        if not merged:
+            logger.info('%d investissement(s) déjà compris dans les résumés recalculés, delta abandonné', pending)
+            return 0
+        return pending
+
+    def snapshot(self):
+        """Résumés persistés fusionnés avec le delta local (non reporté, et postérieur au dernier recalcul)."""
+        sketches, generation = _load()
+        with self._lock:
+            if self._generation == generation:
+                for nom, sketch in sketches.items():
+                    sketch.merge(self._delta[nom])
+        return sketches
+
+
+delta_store = DeltaStore(getattr(settings, 'ANALYTICS_FLUSH_SECONDS', 10))
+
+
+def _flush_at_exit():
+    try:
+        delta_store.flush()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
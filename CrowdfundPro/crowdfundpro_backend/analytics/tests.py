@@ -0,0 +1,73 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from investments.models import Investment
+from projects.models import Project
+from users.models import User
+from .store import DeltaStore, current_generation, load
+
+
+class RebuildSketchesTests(TestCase):
+    """
+    Un delta commencé avant `rebuild_sketches` n'est pas compté deux fois.
+    """
+
+    def setUp(self):
+        porteur = User.objects.create_user('porteur@example.com', 'secret', username='porteur', role='PORTEUR')
+        self.investisseurs = [
+            User.objects.create_user(f'inv{i}@example.com', 'secret', username=f'inv{i}', role='INVESTISSEUR')
+            for i in range(3)
+        ]
+        self.projet = Project.objects.create(
+            titre='Projet', description='d' * 60, objectif=Decimal('10000'), statut='EN_COURS',
+            date_limite=timezone.now() + timedelta(days=30), porteur=porteur,
+        )
+        # Delta d'un processus web, sans report automatique
+        self.store = DeltaStore(flush_interval=3600)
+        patcher = mock.patch('analytics.signals.delta_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _invest(self, investisseur, montant):
+        with self.captureOnCommitCallbacks(execute=True):
+            Investment.objects.create(
+                investisseur=investisseur, projet=self.projet, montant=Decimal(montant),
+                statut_paiement='REUSSI', methode_paiement='CARTE',
+            )
+
+    def _rebuild(self):
+        call_command('rebuild_sketches', stdout=StringIO())
+
+    def _total_investi(self, sketches):
+        return sketches['montants_investis'].n
+
+    def test_delta_taken_before_rebuild_is_dropped(self):
+        self._invest(self.investisseurs[0], 100)
+        self._invest(self.investisseurs[1], 50)
+        generation = current_generation()
+
+        self._rebuild()
+
+        self.assertEqual(current_generation(), generation + 1)
+        self.assertEqual(self._total_investi(self.store.snapshot()), 2)
+        self.assertEqual(self.store.flush(), 0)
+        self.assertEqual(self._total_investi(load()), 2)
+        self.assertAlmostEqual(load()['montants_par_projet'].estimate(self.projet.pk), 150)
+
+    def test_delta_started_after_rebuild_is_merged(self):
+        self._invest(self.investisseurs[0], 100)
+        self._rebuild()
+        self.store.flush()
+
+        self._invest(self.investisseurs[2], 25)
+
+        self.assertEqual(self._total_investi(self.store.snapshot()), 2)
+        self.assertEqual(self.store.flush(), 1)
+        self.assertEqual(self._total_investi(load()), 2)
+        self.assertAlmostEqual(load()['montants_par_projet'].estimate(self.projet.pk), 125)
@@ -0,0 +1,34 @@
+from django.contrib import admin
+from .models import ArchivedInvestment, ArchivedProject
+
+
+@admin.register(ArchivedProject)
+class ArchivedProjectAdmin(admin.ModelAdmin):
+    """
+    Administration pour les projets archivés (lecture seule)
+    """
+    list_display = ('titre', 'porteur', 'objectif', 'montant_actuel', 'statut', 'date_limite', 'date_archivage')
+    list_filter = ('statut', 'date_archivage')
+    search_fields = ('titre', 'porteur__email')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedInvestment)
+class ArchivedInvestmentAdmin(admin.ModelAdmin):
+    """
+    Administration pour les investissements archivés (lecture seule)
+    """
+    list_display = ('investisseur', 'projet', 'montant', 'statut_paiement', 'date_investissement')
+    list_filter = ('statut_paiement', 'methode_paiement')
+    search_fields = ('investisseur__email', 'projet__titre', 'stripe_payment_intent_id')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
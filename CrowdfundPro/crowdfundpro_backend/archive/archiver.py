@@ -0,0 +1,92 @@
+"""
+Déplacement des campagnes clôturées vers les tables d'archive.
+
+Chaque lot est une transaction : copie des projets (avec leurs agrégats) et
+de leurs investissements, puis suppression directe (sans signaux) des lignes
+chaudes et des données dérivées. Les fichiers ne bougent pas : les blobs
+restent référencés par le projet archivé, leurs compteurs sont donc
+inchangés. Le registre des financements, sans contrainte de clé étrangère,
+est conservé tel quel. Le flux de modifications reçoit une suppression par
+projet et investissement, pour que les clients les retirent de leur cache.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+from changefeed.models import ChangeLog
+from investments.models import Investment
+from projects.models import Project
+from rankings.leaderboard import invalidate_all
+from rankings.models import ProjectScore
+from .models import ArchivedInvestment, ArchivedProject
+
+CLOSED_STATUTS = ('FINANCE', 'ECHOUE')
+
+
+def candidates(days):
+    """Identifiants des projets clôturés dont la date limite date de plus de `days` jours."""
+    limite = timezone.now() - timedelta(days=days)
+    return Project.objects.filter(statut__in=CLOSED_STATUTS, date_limite__lt=limite).order_by('id').values_list(
+        'id', flat=True
+    )
+
+
+def _copy(instance, model):
+    values = {}
+    for field in model.COPIED_FIELDS:
+        value = getattr(instance, field)
+        values[field] = value.name if isinstance(value, FieldFile) else value
+    return model(**values)
+
+
+def archive_batch(ids, chunk_size=2000):
+    """Archive les projets `ids` (et leurs investissements) ; retourne (projets, investissements)."""
+    now = timezone.now()
+    with transaction.atomic():
+        projects = list(
+            Project.objects.select_for_update().filter(pk__in=ids, statut__in=CLOSED_STATUTS).annotate(
+                nb_investisseurs=Count('investissements__investisseur', distinct=True),
+                nb_investissements=Count('investissements'),
+            )
+        )
+        if not projects:
+            return 0, 0
+        ids = [project.pk for project in projects]
+        archived = []
+        for project in projects:
+            copy = _copy(project, ArchivedProject)
+            copy.nombre_investisseurs = project.nb_investisseurs
+            copy.nombre_investissements = project.nb_investissements
+            copy.date_archivage = now
+            archived.append(copy)
+        ArchivedProject.objects.bulk_create(archived)
+
+        investments = Investment.objects.filter(projet_id__in=ids)
+        journal = [
+            ChangeLog(entity='project', object_id=project.pk, action='delete', porteur_id=project.porteur_id, date=now)
+            for project in projects
+        ]
+        porteurs = {project.pk: project.porteur_id for project in projects}
+        batch = []
+        total = 0
+        for investment in investments.order_by('id').iterator(chunk_size=chunk_size):
+            batch.append(_copy(investment, ArchivedInvestment))
+            journal.append(ChangeLog(
+                entity='investment', object_id=investment.pk, action='delete',
+                porteur_id=porteurs[investment.projet_id], investisseur_id=investment.investisseur_id, date=now,
+            ))
+            if len(batch) >= chunk_size:
+                ArchivedInvestment.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        ArchivedInvestment.objects.bulk_create(batch)
+        total += len(batch)
+
+        for queryset in (investments, ProjectScore.objects.filter(projet_id__in=ids), Project.objects.filter(pk__in=ids)):
+            queryset._raw_delete(queryset.db)
+        ChangeLog.objects.bulk_create(journal, batch_size=chunk_size)
+        transaction.on_commit(invalidate_all)
+    return len(projects), total
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from archive.archiver import archive_batch, candidates
+
+
+class Command(BaseCommand):
+    help = "Déplace les projets clôturés depuis longtemps (et leurs investissements) vers les tables d'archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'ARCHIVE_AFTER_DAYS', 365))
+        parser.add_argument('--batch-size', type=int, default=100, help='Projets par transaction')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        ids = list(candidates(options['days']))
+        if options['dry_run']:
+            self.stdout.write(f'{len(ids)} projet(s) à archiver')
+            return
+
+        projets = investissements = 0
+        for start in range(0, len(ids), options['batch_size']):
+            archived_projects, archived_investments = archive_batch(ids[start:start + options['batch_size']])
+            projets += archived_projects
+            investissements += archived_investments
+        self.stdout.write(self.style.SUCCESS(
+            f'{projets} projet(s) et {investissements} investissement(s) archivé(s)'
+        ))
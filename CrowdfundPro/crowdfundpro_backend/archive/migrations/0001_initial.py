@@ -0,0 +1,70 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:46
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProject',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('titre', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('objectif', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('montant_actuel', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10)),
+                ('statut', models.CharField(choices=[('EN_ATTENTE_VALIDATION', 'En attente de validation'), ('EN_COURS', 'En cours'), ('FINANCE', 'Financé'), ('ECHOUE', 'Échoué')], max_length=25)),
+                ('date_limite', models.DateTimeField()),
+                ('date_creation', models.DateTimeField()),
+                ('date_modification', models.DateTimeField()),
+                ('image', models.ImageField(blank=True, null=True, storage=uploads.storage.content_storage, upload_to='projects/')),
+                ('image_variants', models.JSONField(blank=True, default=dict)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=12, max_digits=15, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=12, max_digits=15, null=True)),
+                ('adresse', models.CharField(blank=True, max_length=500, null=True)),
+                ('business_plan', models.FileField(blank=True, null=True, storage=uploads.storage.content_storage, upload_to='projects/documents/')),
+                ('plan_juridique', models.FileField(blank=True, null=True, storage=uploads.storage.content_storage, upload_to='projects/documents/')),
+                ('nombre_investisseurs', models.PositiveIntegerField(default=0)),
+                ('nombre_investissements', models.PositiveIntegerField(default=0)),
+                ('date_archivage', models.DateTimeField(default=django.utils.timezone.now)),
+                ('porteur', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='projets_archives', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Projet archivé',
+                'verbose_name_plural': 'Projets archivés',
+                'db_table': 'archived_projects',
+                'ordering': ['-date_creation'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedInvestment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('montant', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date_investissement', models.DateTimeField()),
+                ('statut_paiement', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('REUSSI', 'Réussi'), ('ECHOUE', 'Échoué')], max_length=20)),
+                ('methode_paiement', models.CharField(choices=[('CARTE', 'Carte bancaire'), ('VIREMENT', 'Virement bancaire')], max_length=20)),
+                ('stripe_payment_intent_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('investisseur', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='investissements_archives', to=settings.AUTH_USER_MODEL)),
+                ('projet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='investissements', to='archive.archivedproject')),
+            ],
+            options={
+                'verbose_name': 'Investissement archivé',
+                'verbose_name_plural': 'Investissements archivés',
+                'db_table': 'archived_investments',
+                'ordering': ['-date_investissement'],
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.db import models
+from django.utils import timezone
+
+from investments.models import Investment
+from projects.models import Project
+from uploads.storage import content_storage
+from users.models import User
+
+
+class ArchivedProject(models.Model):
+    """
+    Projet clôturé (FINANCE / ECHOUE) déplacé hors de la table `projects` par
+    `archive_projects`. Même identifiant et mêmes valeurs, en lecture seule ;
+    `nombre_investisseurs` et `nombre_investissements` sont figés à l'archivage.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    titre = models.CharField(max_length=200)
+    description = models.TextField()
+    objectif = models.DecimalField(max_digits=10, decimal_places=2)
+    montant_actuel = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    statut = models.CharField(max_length=25, choices=Project.STATUS_CHOICES)
+    date_limite = models.DateTimeField()
+    date_creation = models.DateTimeField()
+    date_modification = models.DateTimeField()
+    porteur = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='projets_archives',
+    )
+    image = models.ImageField(upload_to='projects/', storage=content_storage, blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True)
+    latitude = models.DecimalField(max_digits=15, decimal_places=12, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=15, decimal_places=12, blank=True, null=True)
+    adresse = models.CharField(max_length=500, blank=True, null=True)
+    business_plan = models.FileField(upload_to='projects/documents/', storage=content_storage, blank=True, null=True)
+    plan_juridique = models.FileField(upload_to='projects/documents/', storage=content_storage, blank=True, null=True)
+    nombre_investisseurs = models.PositiveIntegerField(default=0)
+    nombre_investissements = models.PositiveIntegerField(default=0)
+    date_archivage = models.DateTimeField(default=timezone.now)
+
+    FILE_FIELDS = Project.FILE_FIELDS
+    COPIED_FIELDS = (
+        'id', 'titre', 'description', 'objectif', 'montant_actuel', 'statut', 'date_limite',
+        'date_creation', 'date_modification', 'porteur_id', 'image', 'image_variants',
+        'latitude', 'longitude', 'adresse', 'business_plan', 'plan_juridique',
+    )
+
+    class Meta:
+        db_table = 'archived_projects'
+        verbose_name = 'Projet archivé'
+        verbose_name_plural = 'Projets archivés'
+        ordering = ['-date_creation']
+
+    def __str__(self):
+        return f"{self.titre} (archivé)"
+
+    pourcentage_finance = Project.pourcentage_finance
+    est_finance = Project.est_finance
+    est_expire = Project.est_expire
+    jours_restants = Project.jours_restants
+    a_localisation = Project.a_localisation
+
+
+class ArchivedInvestment(models.Model):
+    """
+    Investissement d'un projet archivé (même identifiant). Le secret client
+    Stripe, inutile une fois le paiement clos, n'est pas conservé.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    investisseur = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='investissements_archives',
+    )
+    projet = models.ForeignKey(
+        ArchivedProject,
+        on_delete=models.CASCADE,
+        related_name='investissements',
+    )
+    montant = models.DecimalField(max_digits=10, decimal_places=2)
+    date_investissement = models.DateTimeField()
+    statut_paiement = models.CharField(max_length=20, choices=Investment.STATUT_CHOICES)
+    methode_paiement = models.CharField(max_length=20, choices=Investment.METHODE_PAIEMENT_CHOICES)
+    stripe_payment_intent_id = models.CharField(max_length=100, blank=True, null=True)
+
+    COPIED_FIELDS = (
+        'id', 'investisseur_id', 'projet_id', 'montant', 'date_investissement',
+        'statut_paiement', 'methode_paiement', 'stripe_payment_intent_id',
+    )
+
+    class Meta:
+        db_table = 'archived_investments'
+        verbose_name = 'Investissement archivé'
+        verbose_name_plural = 'Investissements archivés'
+        ordering = ['-date_investissement']
+
+    def __str__(self):
+        return f"{self.investisseur_id} - {self.projet_id} - {self.montant}€ (archivé)"
+
+    is_successful = Investment.is_successful
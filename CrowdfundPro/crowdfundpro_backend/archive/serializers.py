@@ -0,0 +1,52 @@
+from rest_framework import serializers
+
+from investments.serializers import InvestmentDetailSerializer
+from projects.serializers import ProjectDetailSerializer, ProjectListSerializer
+from .models import ArchivedInvestment, ArchivedProject
+
+# Champs de prévision : sans objet pour un projet clôturé
+FORECAST_FIELDS = ('date_completion_prevue', 'probabilite_financement', 'date_prevision')
+
+
+class ArchivedProjectSerializer(ProjectDetailSerializer):
+    """
+    Sérialiseur pour les détails d'un projet archivé (mêmes champs que
+    ProjectDetailSerializer, plus la date d'archivage)
+    """
+    nombre_investisseurs = serializers.IntegerField(read_only=True)
+    archive = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedProject
+        fields = tuple(
+            field for field in ProjectDetailSerializer.Meta.fields if field not in FORECAST_FIELDS
+        ) + ('nombre_investissements', 'archive', 'date_archivage')
+
+    def get_archive(self, obj):
+        return True
+
+
+class ArchivedProjectListSerializer(ProjectListSerializer):
+    """
+    Sérialiseur pour un projet archivé imbriqué (investissements archivés)
+    """
+    nombre_investisseurs = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ArchivedProject
+        fields = ProjectListSerializer.Meta.fields
+
+
+class ArchivedInvestmentSerializer(InvestmentDetailSerializer):
+    """
+    Sérialiseur pour les détails d'un investissement archivé
+    """
+    projet = ArchivedProjectListSerializer(read_only=True)
+    archive = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedInvestment
+        fields = InvestmentDetailSerializer.Meta.fields + ('archive',)
+
+    def get_archive(self, obj):
+        return True
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from changefeed.models import ChangeLog
+from investments.models import Investment
+from ledger.models import LedgerEntry
+from projects.models import Project
+from users.authentication import user_cache
+from users.models import User
+from .models import ArchivedInvestment, ArchivedProject
+
+
+class ArchiveProjectsTests(APITestCase):
+    """
+    Déplacement des projets clôturés vers l'archive, puis lecture par les vues de détail.
+    """
+
+    def setUp(self):
+        user_cache.clear()
+        self.porteur = User.objects.create_user('porteur@example.com', 'secret', username='porteur', role='PORTEUR')
+        self.investisseur = User.objects.create_user('inv@example.com', 'secret', username='inv', role='INVESTISSEUR')
+        self.autre = User.objects.create_user('inv2@example.com', 'secret', username='inv2', role='INVESTISSEUR')
+
+        self.ancien = self._project('Projet clôturé', timezone.now() - timedelta(days=400))
+        self.recent = self._project('Projet récent', timezone.now() - timedelta(days=10))
+        self.en_cours = self._project('Projet en cours', timezone.now() + timedelta(days=30), statut='EN_COURS')
+        self.investissements = [
+            self._invest(self.investisseur, self.ancien, 80).pk,
+            self._invest(self.autre, self.ancien, 40).pk,
+        ]
+        self.ancien.refresh_from_db()
+
+    def _project(self, titre, date_limite, statut='FINANCE'):
+        return Project.objects.create(
+            titre=titre, description='d' * 60, objectif=Decimal('100'), statut=statut,
+            date_limite=date_limite, porteur=self.porteur,
+        )
+
+    def _invest(self, investisseur, projet, montant):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Investment.objects.create(
+                investisseur=investisseur, projet=projet, montant=Decimal(montant),
+                statut_paiement='REUSSI', methode_paiement='CARTE',
+            )
+
+    def _archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('archive_projects', days=365, stdout=StringIO())
+
+    def test_archive_moves_closed_projects_and_investments(self):
+        ledger = LedgerEntry.objects.filter(projet_id=self.ancien.pk).count()
+
+        self._archive()
+
+        self.assertFalse(Project.objects.filter(pk=self.ancien.pk).exists())
+        self.assertFalse(Investment.objects.filter(pk__in=self.investissements).exists())
+        self.assertEqual(Project.objects.filter(pk__in=[self.recent.pk, self.en_cours.pk]).count(), 2)
+
+        archived = ArchivedProject.objects.get(pk=self.ancien.pk)
+        self.assertEqual(archived.titre, 'Projet clôturé')
+        self.assertEqual(archived.montant_actuel, Decimal('120.00'))
+        self.assertEqual(archived.nombre_investisseurs, 2)
+        self.assertEqual(archived.nombre_investissements, 2)
+        self.assertEqual(
+            sorted(ArchivedInvestment.objects.values_list('id', flat=True)), sorted(self.investissements)
+        )
+        # Registre conservé tel quel ; suppressions publiées dans le flux de modifications
+        self.assertEqual(LedgerEntry.objects.filter(projet_id=self.ancien.pk).count(), ledger)
+        self.assertEqual(
+            set(ChangeLog.objects.filter(action='delete').values_list('entity', 'object_id')),
+            {('project', self.ancien.pk)} | {('investment', pk) for pk in self.investissements},
+        )
+
+        # Second passage : rien à archiver
+        self._archive()
+        self.assertEqual(ArchivedProject.objects.count(), 1)
+
+    def test_detail_views_fall_back_to_archive(self):
+        self._archive()
+        self.client.force_authenticate(self.investisseur)
+
+        response = self.client.get(f'/api/projects/{self.ancien.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['archive'])
+        self.assertEqual(response.data['titre'], 'Projet clôturé')
+        self.assertEqual(response.data['nombre_investissements'], 2)
+
+        response = self.client.get(f'/api/investments/{self.investissements[0]}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(response.data['montant']), Decimal('80'))
+
+        # Investissement archivé d'un autre investisseur : invisible
+        response = self.client.get(f'/api/investments/{self.investissements[1]}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get('/api/projects/999999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,224 @@
+"""
+Générateur de jeux de données synthétiques pour les benchmarks.
+
+Les données sont déterministes pour une graine donnée (mêmes utilisateurs,
+projets et investissements, dates relatives au jour courant) et insérées par
+`bulk_create`, sans passer par `save()` ni les signaux. Tous les comptes
+générés utilisent le domaine `BENCH_EMAIL_DOMAIN`, ce qui permet de les
+supprimer sans toucher aux autres données.
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from archive.models import ArchivedProject
+from investments.models import Investment
+from ledger.models import BalanceSnapshot, LedgerEntry
+from projects.models import Project
+from rankings.leaderboard import invalidate_all
+from rankings.models import ProjectScore
+from users.models import User
+
+
+BENCH_EMAIL_DOMAIN = 'bench.crowdfundpro.test'
+BENCH_PASSWORD = 'bench-password'
+
+PROJECT_STATUS_WEIGHTS = {
+    'EN_ATTENTE_VALIDATION': 10,
+    'EN_COURS': 60,
+    'FINANCE': 20,
+    'ECHOUE': 10,
+}
+PAYMENT_STATUS_WEIGHTS = {'REUSSI': 80, 'EN_ATTENTE': 12, 'ECHOUE': 8}
+PAYMENT_METHOD_WEIGHTS = {'CARTE': 85, 'VIREMENT': 15}
+
+OBJECTIFS = [1000, 2500, 5000, 10000, 20000, 50000, 100000]
+MONTANTS = [10, 20, 50, 100, 150, 200, 500, 1000, 2500]
+
+VILLES = [
+    ('Casablanca', 33.5731, -7.5898),
+    ('Rabat', 34.0209, -6.8416),
+    ('Marrakech', 31.6295, -7.9811),
+    ('Fès', 34.0181, -5.0078),
+    ('Tanger', 35.7595, -5.8340),
+    ('Agadir', 30.4278, -9.5981),
+    ('Paris', 48.8566, 2.3522),
+    ('Lyon', 45.7640, 4.8357),
+]
+
+SUJETS = ['Ferme', 'Atelier', 'Coopérative', 'Centrale', 'Serre', 'Station', 'Jardin', 'Réseau']
+THEMES = ['solaire', 'éolienne', 'hydroponique', 'de recyclage', 'de compostage', 'biologique', 'urbaine', 'partagée']
+MOTS = [
+    'énergie', 'durable', 'local', 'circuit', 'court', 'eau', 'irrigation', 'panneaux',
+    'batterie', 'communauté', 'emploi', 'formation', 'déchets', 'sol', 'carbone', 'mobilité',
+]
+
+# Termes de recherche présents dans les titres générés
+SEARCH_TERMS = [sujet.lower() for sujet in SUJETS] + [theme for theme in THEMES if ' ' not in theme]
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def bench_users():
+    return User.objects.filter(email__endswith=f'@{BENCH_EMAIL_DOMAIN}')
+
+
+def clear():
+    """Supprime les données générées (investissements et projets par DELETE direct)."""
+    users = bench_users()
+    with transaction.atomic():
+        investments = Investment.objects.filter(Q(investisseur__in=users) | Q(projet__porteur__in=users))
+        investments._raw_delete(investments.db)
+        projects = Project.objects.filter(porteur__in=users)
+        # Projets éventuellement archivés depuis (supprimés avec les utilisateurs)
+        ids = list(projects.values_list('pk', flat=True))
+        ids += ArchivedProject.objects.filter(porteur__in=users).values_list('pk', flat=True)
+        for model in (LedgerEntry, BalanceSnapshot, ProjectScore):
+            rows = model.objects.filter(projet_id__in=ids)
+            rows._raw_delete(rows.db)
+        projects._raw_delete(projects.db)
+        transaction.on_commit(invalidate_all)
+        count = users.count()
+        users.delete()
+    return count
+
+
+def _users(rng, count, password, now):
+    porteurs = max(1, count // 10)
+    users = [User(
+        email=f'admin@{BENCH_EMAIL_DOMAIN}', username='bench-admin', nom='Admin Bench',
+        role='ADMIN', is_staff=True, is_superuser=True, password=password, date_inscription=now,
+    )]
+    for i in range(count - 1):
+        role = 'PORTEUR' if i < porteurs else 'INVESTISSEUR'
+        users.append(User(
+            email=f'{role.lower()}-{i:06d}@{BENCH_EMAIL_DOMAIN}',
+            username=f'bench-{role[0].lower()}{i}',
+            nom=f'{role.title()} {i}',
+            role=role,
+            password=password,
+            date_inscription=now - timedelta(days=rng.randint(0, 365)),
+        ))
+    return users
+
+
+def _project(rng, porteur, now):
+    statut = _weighted(rng, PROJECT_STATUS_WEIGHTS)
+    titre = f'{rng.choice(SUJETS)} {rng.choice(THEMES)} {rng.randint(1, 999)}'
+    description = ' '.join(rng.choices(MOTS, k=rng.randint(12, 40))).capitalize() + '.'
+    cree_le = now - timedelta(days=rng.randint(0, 180), minutes=rng.randint(0, 1439))
+    if statut == 'ECHOUE':
+        date_limite = now - timedelta(days=rng.randint(1, 60))
+    elif statut == 'FINANCE':
+        date_limite = now + timedelta(days=rng.randint(-60, 60))
+    else:
+        date_limite = now + timedelta(days=rng.randint(1, 120))
+    project = Project(
+        titre=titre,
+        description=description,
+        objectif=Decimal(rng.choice(OBJECTIFS)),
+        statut=statut,
+        date_limite=date_limite,
+        porteur=porteur,
+    )
+    project.date_creation = cree_le
+    if rng.random() < 0.7:
+        ville, lat, lng = rng.choice(VILLES)
+        project.latitude = Decimal(f'{lat + rng.uniform(-0.2, 0.2):.6f}')
+        project.longitude = Decimal(f'{lng + rng.uniform(-0.2, 0.2):.6f}')
+        project.adresse = f'{rng.randint(1, 200)} rue {rng.choice(MOTS)}, {ville}'
+    return project
+
+
+def _investment(rng, investisseur, projet, now):
+    debut = max(projet.date_creation, now - timedelta(days=180))
+    fenetre = max(1, int((min(now, projet.date_limite) - debut).total_seconds()))
+    return Investment(
+        investisseur=investisseur,
+        projet=projet,
+        montant=Decimal(rng.choice(MONTANTS)),
+        date_investissement=debut + timedelta(seconds=rng.randint(0, fenetre)),
+        statut_paiement=_weighted(rng, PAYMENT_STATUS_WEIGHTS),
+        methode_paiement=_weighted(rng, PAYMENT_METHOD_WEIGHTS),
+    )
+
+
+def _record_ledger(projects, batch_size):
+    """Ouvre le registre des financements avec les investissements réussis générés."""
+    rows = Investment.objects.filter(projet__in=[p.pk for p in projects], statut_paiement='REUSSI').order_by(
+        'date_investissement', 'id'
+    ).values_list('id', 'projet_id', 'montant', 'date_investissement')
+    LedgerEntry.objects.bulk_create(
+        (
+            LedgerEntry(projet_id=projet_id, investissement_id=pk, type='SUCCES', montant=montant, date=date)
+            for pk, projet_id, montant, date in rows.iterator(chunk_size=batch_size)
+        ),
+        batch_size=batch_size,
+    )
+
+
+def _recompute_amounts(projects, batch_size):
+    """Recalcule montant_actuel en une agrégation, puis ajuste les projets financés."""
+    totals = dict(
+        Investment.objects.filter(projet__in=[p.pk for p in projects], statut_paiement='REUSSI')
+        .values_list('projet').annotate(total=Sum('montant')).order_by()
+    )
+    for project in projects:
+        project.montant_actuel = totals.get(project.pk, Decimal('0.00'))
+        if project.statut == 'FINANCE':
+            if project.montant_actuel > 0:
+                project.objectif = min(project.objectif, project.montant_actuel)
+            else:
+                project.statut = 'ECHOUE'
+    Project.objects.bulk_update(
+        projects, ['montant_actuel', 'objectif', 'statut', 'date_creation'], batch_size=batch_size
+    )
+
+
+def generate(users, projects, investments, seed=42, batch_size=1000):
+    """
+    Insère `users` utilisateurs (dont un admin et ~10 % de porteurs),
+    `projects` projets et `investments` investissements. Retourne les effectifs créés.
+    """
+    rng = random.Random(seed)
+    now = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    password = make_password(BENCH_PASSWORD)
+
+    with transaction.atomic():
+        created_users = User.objects.bulk_create(_users(rng, users, password, now), batch_size=batch_size)
+        porteurs = [u for u in created_users if u.role == 'PORTEUR']
+        investisseurs = [u for u in created_users if u.role == 'INVESTISSEUR']
+
+        project_objs = [_project(rng, rng.choice(porteurs), now) for _ in range(projects)]
+        # date_creation (auto_now_add) est écrasée à l'insertion : elle est rétablie au recalcul
+        dates_creation = [p.date_creation for p in project_objs]
+        created_projects = Project.objects.bulk_create(project_objs, batch_size=batch_size)
+        for project, cree_le in zip(created_projects, dates_creation):
+            project.date_creation = cree_le
+
+        investables = [p for p in created_projects if p.statut != 'EN_ATTENTE_VALIDATION']
+        created_investments = 0
+        if investables and investisseurs:
+            for start in range(0, investments, batch_size):
+                batch = [
+                    _investment(rng, rng.choice(investisseurs), rng.choice(investables), now)
+                    for _ in range(min(batch_size, investments - start))
+                ]
+                Investment.objects.bulk_create(batch, batch_size=batch_size)
+                created_investments += len(batch)
+
+        _record_ledger(created_projects, batch_size)
+        _recompute_amounts(created_projects, batch_size)
+
+    return {
+        'users': len(created_users),
+        'projects': len(created_projects),
+        'investments': created_investments,
+    }
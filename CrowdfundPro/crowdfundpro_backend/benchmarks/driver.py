@@ -0,0 +1,76 @@
+"""
+Générateur de charge local : plusieurs threads rejouent un scénario jusqu'à
+atteindre le nombre d'itérations demandé, puis les latences sont agrégées
+par endpoint.
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+from monitoring.stats import percentile
+
+from .scenarios import Session
+
+
+class Recorder:
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, status_code, elapsed):
+        with self._lock:
+            self._samples[endpoint].append(elapsed)
+            if status_code >= 400:
+                self._errors[endpoint] += 1
+
+    def summary(self, duration):
+        """Débit (req/s) et percentiles (ms) par endpoint sur la durée du scénario."""
+        with self._lock:
+            samples = {endpoint: sorted(values) for endpoint, values in self._samples.items()}
+            errors = dict(self._errors)
+        return {
+            endpoint: {
+                'count': len(values),
+                'errors': errors.get(endpoint, 0),
+                'throughput': round(len(values) / duration, 2) if duration else 0.0,
+                'p50_ms': round(percentile(values, 0.50) * 1000, 3),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 3),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 3),
+            }
+            for endpoint, values in sorted(samples.items())
+        }
+
+
+def run_scenario(scenario, users, pools, iterations, concurrency, seed=42):
+    """
+    Exécute `iterations` fois `scenario` réparti sur `concurrency` threads.
+    Chaque thread simule un utilisateur différent de `users`.
+    """
+    recorder = Recorder()
+    remaining = iter(range(iterations))
+    remaining_lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        session = Session(users[index % len(users)], recorder)
+        try:
+            while True:
+                with remaining_lock:
+                    if next(remaining, None) is None:
+                        return
+                scenario(session, pools, rng)
+        finally:
+            # Chaque thread ouvre ses propres connexions
+            connections.close_all()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, index) for index in range(concurrency)]:
+            future.result()
+    return recorder.summary(time.perf_counter() - start)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import data
+from benchmarks.query_budget import growth, measure
+
+
+def _size(value):
+    users, projects, investments = (int(part) for part in value.split(','))
+    return {'users': users, 'projects': projects, 'investments': investments}
+
+
+class Command(BaseCommand):
+    help = (
+        "Vérifie que le nombre de requêtes SQL de chaque endpoint GET ne croît pas "
+        "avec le volume de données (par rôle)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--small', type=_size, default='20,6,30',
+            help='Petit jeu de données : utilisateurs,projets,investissements',
+        )
+        parser.add_argument(
+            '--large', type=_size, default='100,60,600',
+            help='Grand jeu de données : utilisateurs,projets,investissements',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if data.bench_users().exists():
+            raise CommandError(
+                'Des données de benchmark existent déjà : les supprimer avec '
+                'seed_benchmark_data --clear avant le contrôle.'
+            )
+
+        results = measure([options['small'], options['large']], seed=options['seed'])
+
+        offenders = 0
+        for (role, name), ((path, status_small, small), (_, status_large, large)) in sorted(results.items()):
+            line = f'{role:<13} {name:<28} {len(small):>4} -> {len(large):<4} ({status_large}) {path}'
+            if len(large) <= len(small):
+                self.stdout.write(line)
+                continue
+            offenders += 1
+            self.stdout.write(self.style.ERROR(line + '  CROISSANCE'))
+            for sql, before, after in growth(small, large):
+                self.stdout.write(f'    {before} -> {after} x {sql[:300]}')
+
+        if offenders:
+            raise CommandError(f'{offenders} endpoint(s) dont le nombre de requêtes croît avec les données')
+        self.stdout.write(self.style.SUCCESS('Budget de requêtes respecté pour tous les endpoints'))
@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.driver import run_scenario
+from benchmarks.scenarios import SCENARIOS, Pools
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = "Rejoue les scénarios de charge et compare les latences à une référence"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', choices=sorted(SCENARIOS),
+            help='Scénario à exécuter (répétable, tous par défaut)',
+        )
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Enregistre les résultats comme nouvelle référence',
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Dégradation tolérée du p95 et du débit (0.2 = 20 %%)',
+        )
+        parser.add_argument('--fail-on-regression', action='store_true')
+        parser.add_argument('--output', help='Écrit les résultats bruts (JSON) dans ce fichier')
+
+    def handle(self, *args, **options):
+        pools = Pools()
+        if not all(pools.users.values()):
+            raise CommandError("Pas de données de benchmark : lancer d'abord seed_benchmark_data.")
+
+        baseline_path = Path(options['baseline'])
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+        results = {}
+        regressions = []
+        for name in options['scenario'] or sorted(SCENARIOS):
+            role, scenario = SCENARIOS[name]
+            results[name] = run_scenario(
+                scenario, pools.users[role], pools,
+                iterations=options['iterations'],
+                concurrency=options['concurrency'],
+                seed=options['seed'],
+            )
+            regressions += self._report(name, results[name], baseline.get(name, {}), options['tolerance'])
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2, sort_keys=True))
+
+        if options['save_baseline']:
+            baseline.update(results)
+            baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Référence enregistrée dans {baseline_path}'))
+
+        if regressions:
+            message = f'{len(regressions)} régression(s) : ' + ', '.join(regressions)
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+
+    def _report(self, name, summary, reference, tolerance):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}'))
+        self.stdout.write(
+            f"  {'endpoint':<40} {'n':>6} {'err':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  référence p95"
+        )
+        regressions = []
+        for endpoint, stats in summary.items():
+            line = (
+                f"  {endpoint:<40} {stats['count']:>6} {stats['errors']:>5} {stats['throughput']:>8} "
+                f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}"
+            )
+            base = reference.get(endpoint)
+            if base:
+                slower = stats['p95_ms'] > base['p95_ms'] * (1 + tolerance)
+                fewer = stats['throughput'] < base['throughput'] * (1 - tolerance)
+                delta = (stats['p95_ms'] / base['p95_ms'] - 1) * 100 if base['p95_ms'] else 0
+                line += f"  {base['p95_ms']} ({delta:+.0f} %)"
+                if slower or fewer:
+                    regressions.append(f'{name}:{endpoint}')
+                    self.stdout.write(self.style.ERROR(line + '  RÉGRESSION'))
+                    continue
+            self.stdout.write(line)
+        return regressions
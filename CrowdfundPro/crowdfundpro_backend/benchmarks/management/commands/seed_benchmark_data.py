@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import data
+
+
+class Command(BaseCommand):
+    help = "Génère un jeu de données synthétique et déterministe pour les benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=2000)
+        parser.add_argument('--investments', type=int, default=20000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--reset', action='store_true',
+            help="Supprime d'abord les données de benchmark existantes",
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Supprime les données de benchmark sans en générer de nouvelles',
+        )
+
+    def handle(self, *args, **options):
+        if options['users'] < 3:
+            raise CommandError('Il faut au moins 3 utilisateurs (admin, porteur, investisseur).')
+
+        if options['clear']:
+            deleted = data.clear()
+            self.stdout.write(self.style.SUCCESS(f'{deleted} utilisateur(s) de benchmark supprimé(s)'))
+            return
+
+        if options['reset']:
+            deleted = data.clear()
+            self.stdout.write(f'{deleted} utilisateur(s) de benchmark supprimé(s)')
+        elif data.bench_users().exists():
+            raise CommandError('Des données de benchmark existent déjà : relancer avec --reset.')
+
+        counts = data.generate(
+            users=options['users'],
+            projects=options['projects'],
+            investments=options['investments'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            '{users} utilisateurs, {projects} projets, {investments} investissements créés'.format(**counts)
+        ))
+        self.stdout.write(f'Mot de passe des comptes générés : {data.BENCH_PASSWORD}')
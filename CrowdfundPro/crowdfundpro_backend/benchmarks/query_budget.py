@@ -0,0 +1,168 @@
+"""
+Contrôle du budget de requêtes SQL par endpoint.
+
+Chaque route GET de l'API est appelée pour chaque rôle (ADMIN, PORTEUR,
+INVESTISSEUR, anonyme) sur deux jeux de données de tailles différentes. Le
+nombre de requêtes ne doit pas dépendre du volume de données : une
+augmentation signale une requête exécutée par ligne (propriété de modèle ou
+relation non préchargée dans un sérialiseur).
+"""
+import logging
+import re
+from collections import Counter
+
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from investments.models import Investment
+from projects.models import Project
+from users.models import User
+from users.revocation import disabled_users
+from users.tokens import ClaimsRefreshToken
+
+from . import data
+
+
+ROLES = ('ADMIN', 'PORTEUR', 'INVESTISSEUR', None)
+EXCLUDED_PREFIXES = ('admin/', 'api/users/password_reset/')
+_LITERAL = re.compile(r"'[^']*'|\b\d+(\.\d+)?\b")
+
+
+class _Rollback(Exception):
+    pass
+
+
+def api_routes():
+    """
+    Routes de l'API acceptant GET : liste de (nom, motif, vue, paramètres).
+    """
+    routes = []
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if route.startswith(EXCLUDED_PREFIXES):
+                continue
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern):
+                view_class = getattr(pattern.callback, 'cls', None) or getattr(pattern.callback, 'view_class', None)
+                if view_class is not None and hasattr(view_class, 'get'):
+                    routes.append((pattern.name or route, route, view_class, list(pattern.pattern.converters)))
+
+    walk(get_resolver().url_patterns, '')
+    return routes
+
+
+def _model_for(view_class):
+    queryset = getattr(view_class, 'queryset', None)
+    if queryset is not None:
+        return queryset.model
+    serializer_class = getattr(view_class, 'serializer_class', None)
+    meta = getattr(serializer_class, 'Meta', None)
+    return getattr(meta, 'model', Project)
+
+
+def _object_pk(model, user):
+    """Un objet visible par `user` pour les routes de détail."""
+    if model is Investment:
+        queryset = Investment.objects.all()
+        if user is not None and user.role == 'INVESTISSEUR':
+            queryset = queryset.filter(investisseur=user)
+        elif user is not None and user.role == 'PORTEUR':
+            queryset = queryset.filter(projet__porteur=user)
+    elif model is Project:
+        queryset = Project.objects.filter(statut='EN_COURS')
+    else:
+        queryset = model.objects.all()
+        if user is not None and model is User:
+            return user.pk
+    return queryset.order_by('pk').values_list('pk', flat=True).first()
+
+
+def _path(route, params, view_class, user):
+    if not params:
+        return '/' + route
+    pk = _object_pk(_model_for(view_class), user)
+    if pk is None:
+        return None
+    path = route
+    for name in params:
+        path = re.sub(rf'<(\w+:)?{name}>', str(pk), path)
+    return '/' + path
+
+
+def _role_user(role):
+    """Utilisateur de référence d'un rôle : celui qui a le plus de données liées."""
+    if role is None:
+        return None
+    users = data.bench_users().filter(role=role)
+    if role == 'PORTEUR':
+        return max(users, key=lambda u: u.projets_portes.count())
+    if role == 'INVESTISSEUR':
+        return max(users, key=lambda u: u.investissements.count())
+    return users.order_by('pk').first()
+
+
+def _client(user):
+    client = Client(SERVER_NAME='localhost')
+    if user is not None:
+        token = ClaimsRefreshToken.for_user(user).access_token
+        client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+
+def normalize(sql):
+    return _LITERAL.sub('?', sql)
+
+
+def measure(sizes, seed=42):
+    """
+    Mesure chaque (rôle, route) pour chaque taille de jeu de données.
+
+    Chaque jeu est généré dans une transaction annulée à la fin : la base
+    n'est pas modifiée. Retourne {(rôle, route): [(statut, [sql, ...]), ...]}.
+    """
+    results = {}
+    # Les 401/403 attendus et les alertes de PerformanceMiddleware noieraient le rapport
+    logging.disable(logging.WARNING)
+    # Comme TestCase : les signaux de requête fermeraient la connexion en pleine transaction
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    data.generate(seed=seed, **size)
+                    for role in ROLES:
+                        user = _role_user(role)
+                        client = _client(user)
+                        for name, route, view_class, params in api_routes():
+                            path = _path(route, params, view_class, user)
+                            if path is None:
+                                continue
+                            # Resynchronisée hors mesure : sa requête périodique n'est pas liée au volume
+                            disabled_users.sync(force=True)
+                            with CaptureQueriesContext(connection) as captured:
+                                response = client.get(path)
+                            sql = [query['sql'] for query in captured.captured_queries]
+                            results.setdefault((role or 'anonyme', name), []).append(
+                                (path, response.status_code, sql)
+                            )
+                    raise _Rollback
+            except _Rollback:
+                pass
+    finally:
+        logging.disable(logging.NOTSET)
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+    return results
+
+
+def growth(small_sql, large_sql):
+    """Requêtes (normalisées) plus nombreuses sur le grand jeu de données."""
+    small, large = Counter(map(normalize, small_sql)), Counter(map(normalize, large_sql))
+    return [(sql, small[sql], count) for sql, count in large.items() if count > small[sql]]
@@ -0,0 +1,108 @@
+"""
+Scénarios de charge, exécutés en processus avec le client de test Django.
+
+Un scénario est une fonction `(session, pools, rng)` qui enchaîne quelques
+requêtes représentatives d'un parcours utilisateur. Chaque requête est
+chronométrée par la session et étiquetée par le nom de la route résolue.
+"""
+import time
+
+from django.test import Client
+
+from projects.models import Project
+from users.tokens import ClaimsRefreshToken
+
+from .data import SEARCH_TERMS, bench_users
+
+
+class Session:
+    """
+    Client de test authentifié (jeton JWT) pour un utilisateur du jeu de données.
+    """
+
+    def __init__(self, user, recorder):
+        self.user = user
+        self.recorder = recorder
+        self.client = Client(SERVER_NAME='localhost')
+        token = ClaimsRefreshToken.for_user(user).access_token
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+
+    def request(self, method, path, **kwargs):
+        start = time.perf_counter()
+        response = getattr(self.client, method)(path, **kwargs)
+        elapsed = time.perf_counter() - start
+        match = response.resolver_match
+        endpoint = f'{method.upper()} {match.url_name if match else path}'
+        self.recorder.record(endpoint, response.status_code, elapsed)
+        return response
+
+
+class Pools:
+    """
+    Identifiants utilisés par les scénarios, chargés une fois avant la charge.
+    """
+
+    def __init__(self):
+        users = bench_users()
+        self.users = {
+            role: list(users.filter(role=role).order_by('pk'))
+            for role in ('ADMIN', 'PORTEUR', 'INVESTISSEUR')
+        }
+        visible = Project.objects.filter(porteur__in=users).exclude(statut='EN_ATTENTE_VALIDATION')
+        self.projects = list(visible.values_list('pk', flat=True))
+        self.open_projects = list(visible.filter(statut='EN_COURS').values_list('pk', flat=True))
+
+
+def browse_list(session, pools, rng):
+    page = rng.randint(1, 5)
+    response = session.request('get', f'/api/projects/?page={page}')
+    if response.status_code == 200:
+        results = response.json().get('results') or []
+        if results:
+            session.request('get', f"/api/projects/{rng.choice(results)['id']}/")
+
+
+def search(session, pools, rng):
+    term = rng.choice(SEARCH_TERMS)
+    session.request('get', f'/api/projects/?search={term}&statut=EN_COURS&ordering=-montant_actuel')
+
+
+def invest(session, pools, rng):
+    if not pools.open_projects:
+        return
+    projet = rng.choice(pools.open_projects)
+    session.request('get', f'/api/projects/{projet}/')
+    session.request(
+        'post', '/api/investments/',
+        data={'projet': projet, 'montant': rng.choice([10, 20, 50])},
+        content_type='application/json',
+    )
+
+
+def investisseur_dashboard(session, pools, rng):
+    session.request('get', '/api/investments/dashboard/')
+    session.request('get', '/api/projects/stats/investisseur/')
+    session.request('get', '/api/investments/list/')
+
+
+def porteur_dashboard(session, pools, rng):
+    session.request('get', '/api/projects/stats/porteur/')
+    session.request('get', '/api/investments/dashboard/')
+    session.request('get', '/api/projects/user/')
+
+
+def admin_dashboard(session, pools, rng):
+    session.request('get', '/api/projects/stats/')
+    session.request('get', '/api/projects/?statut=EN_ATTENTE_VALIDATION')
+    session.request('get', '/api/users/list/')
+
+
+# nom -> (rôle des utilisateurs simulés, fonction)
+SCENARIOS = {
+    'browse_list': ('INVESTISSEUR', browse_list),
+    'search': ('INVESTISSEUR', search),
+    'invest': ('INVESTISSEUR', invest),
+    'investisseur_dashboard': ('INVESTISSEUR', investisseur_dashboard),
+    'porteur_dashboard': ('PORTEUR', porteur_dashboard),
+    'admin_dashboard': ('ADMIN', admin_dashboard),
+}
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import ChangeLog
+
+
+@admin.register(ChangeLog)
+class ChangeLogAdmin(admin.ModelAdmin):
+    """
+    Administration pour le journal des modifications
+    """
+    list_display = ('id', 'entity', 'object_id', 'action', 'ancien_statut', 'nouveau_statut', 'date')
+    list_filter = ('entity', 'action')
+    search_fields = ('object_id',)
+    readonly_fields = [field.name for field in ChangeLog._meta.fields]
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ChangefeedConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'changefeed'
+    verbose_name = 'Journal des modifications'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
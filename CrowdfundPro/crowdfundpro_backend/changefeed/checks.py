@@ -0,0 +1,19 @@
+"""
+Vérifications de configuration du flux de modifications.
+"""
+from django.core.checks import Error, Tags, register
+from django.db import connection
+
+# Bases dont l'ordre de lecture du journal est garanti (voir ChangeLog)
+SUPPORTED_VENDORS = ('sqlite', 'postgresql')
+
+
+@register(Tags.compatibility)
+def check_changefeed_database(app_configs, **kwargs):
+    if connection.vendor in SUPPORTED_VENDORS:
+        return []
+    return [Error(
+        f'Le flux de modifications ne garantit pas son curseur sur {connection.vendor}.',
+        hint='Utilisez SQLite ou PostgreSQL (DATABASE_URL).',
+        id='changefeed.E001',
+    )]
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from changefeed.models import ChangeLog
+
+
+class Command(BaseCommand):
+    help = "Supprime les entrées anciennes du journal des modifications"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(days=options['days'])
+        total = 0
+        while True:
+            ids = list(
+                ChangeLog.objects.filter(date__lt=limite).order_by('id')
+                .values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            batch = ChangeLog.objects.filter(id__in=ids)
+            total += batch._raw_delete(batch.db)
+        self.stdout.write(self.style.SUCCESS(f'{total} entrée(s) du journal supprimée(s)'))
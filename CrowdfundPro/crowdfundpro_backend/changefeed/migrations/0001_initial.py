@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(choices=[('project', 'Projet'), ('investment', 'Investissement')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('save', 'Création / modification'), ('delete', 'Suppression')], default='save', max_length=6)),
+                ('porteur_id', models.BigIntegerField(blank=True, null=True)),
+                ('investisseur_id', models.BigIntegerField(blank=True, null=True)),
+                ('ancien_statut', models.CharField(blank=True, max_length=25)),
+                ('nouveau_statut', models.CharField(blank=True, max_length=25)),
+                ('date', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Modification',
+                'verbose_name_plural': 'Journal des modifications',
+                'db_table': 'changelog',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['porteur_id', 'id'], name='changelog_porteur_idx'), models.Index(fields=['investisseur_id', 'id'], name='changelog_investisseur_idx')],
+            },
+        ),
+    ]
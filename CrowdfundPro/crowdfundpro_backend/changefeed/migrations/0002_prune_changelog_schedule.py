@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='prune_changelog',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'prune_changelog'",
+            'schedule_type': 'D',
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='prune_changelog').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changefeed', '0001_initial'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changefeed', '0002_prune_changelog_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelog',
+            name='txid',
+            field=models.BigIntegerField(blank=True, editable=False, help_text="Transaction d'écriture (PostgreSQL)", null=True),
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['txid', 'id'], name='changelog_txid_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# PostgreSQL uniquement : SQLite sérialise les écritures (la position est l'id)
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION changelog_set_txid() RETURNS trigger AS $$
+BEGIN
+    NEW.txid := txid_current();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS changelog_txid ON changelog;
+CREATE TRIGGER changelog_txid BEFORE INSERT ON changelog
+    FOR EACH ROW EXECUTE PROCEDURE changelog_set_txid();
+
+-- Entrées existantes : toutes validées, servies avant les suivantes
+UPDATE changelog SET txid = 0 WHERE txid IS NULL;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS changelog_txid ON changelog;
+DROP FUNCTION IF EXISTS changelog_set_txid();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changefeed', '0003_changelog_txid'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
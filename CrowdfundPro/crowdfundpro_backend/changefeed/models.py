@@ -0,0 +1,58 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeLog(models.Model):
+    """
+    Journal des créations, modifications et suppressions de projets et
+    d'investissements, lu par position croissante (curseur de synchronisation).
+
+    Le curseur ne doit jamais dépasser une entrée encore invisible (transaction
+    en cours) : sous SQLite, les écritures sont sérialisées et les ids sont
+    attribués dans l'ordre des validations, la position est l'id. Sous
+    PostgreSQL, une transaction peut valider après une autre ayant obtenu un id
+    plus grand : la position est l'identifiant de transaction `txid`
+    (renseigné par trigger) et seules les transactions antérieures à la plus
+    ancienne transaction en cours sont servies (voir `views`).
+
+    `porteur_id` / `investisseur_id` sont recopiés (sans clé étrangère, ils
+    doivent survivre aux suppressions) pour filtrer le journal par destinataire.
+    """
+    ENTITY_CHOICES = (
+        ('project', 'Projet'),
+        ('investment', 'Investissement'),
+    )
+    ACTION_CHOICES = (
+        ('save', 'Création / modification'),
+        ('delete', 'Suppression'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES, default='save')
+    porteur_id = models.BigIntegerField(null=True, blank=True)
+    investisseur_id = models.BigIntegerField(null=True, blank=True)
+    ancien_statut = models.CharField(max_length=25, blank=True)
+    nouveau_statut = models.CharField(max_length=25, blank=True)
+    date = models.DateTimeField(default=timezone.now, db_index=True)
+    txid = models.BigIntegerField(null=True, blank=True, editable=False, help_text="Transaction d'écriture (PostgreSQL)")
+
+    class Meta:
+        db_table = 'changelog'
+        verbose_name = 'Modification'
+        verbose_name_plural = 'Journal des modifications'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['porteur_id', 'id'], name='changelog_porteur_idx'),
+            models.Index(fields=['investisseur_id', 'id'], name='changelog_investisseur_idx'),
+            models.Index(fields=['txid', 'id'], name='changelog_txid_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.entity} {self.object_id}"
+
+
+def record_project_change(project_id, porteur_id):
+    """Pour les modifications faites par `update()` (sans signal post_save)."""
+    ChangeLog.objects.create(entity='project', object_id=project_id, porteur_id=porteur_id)
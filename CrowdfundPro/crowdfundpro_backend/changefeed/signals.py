@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from investments.models import Investment
+from projects.models import Project
+from .models import ChangeLog
+
+
+@receiver(post_save, sender=Project)
+def log_project_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    ancien = '' if created else (getattr(instance, '_statut_initial', None) or '')
+    transition = ancien != instance.statut and not created
+    ChangeLog.objects.create(
+        entity='project',
+        object_id=instance.pk,
+        porteur_id=instance.porteur_id,
+        ancien_statut=ancien if transition else '',
+        nouveau_statut=instance.statut if transition else '',
+    )
+
+
+@receiver(post_delete, sender=Project)
+def log_project_delete(sender, instance, **kwargs):
+    ChangeLog.objects.create(
+        entity='project', object_id=instance.pk, action='delete', porteur_id=instance.porteur_id,
+    )
+
+
+def _investment_audience(instance):
+    if Investment.projet.is_cached(instance):
+        porteur_id = instance.projet.porteur_id
+    else:
+        porteur_id = Project.objects.filter(pk=instance.projet_id).values_list('porteur_id', flat=True).first()
+    return {'investisseur_id': instance.investisseur_id, 'porteur_id': porteur_id}
+
+
+@receiver(post_save, sender=Investment)
+def log_investment_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    ChangeLog.objects.create(entity='investment', object_id=instance.pk, **_investment_audience(instance))
+
+
+@receiver(post_delete, sender=Investment)
+def log_investment_delete(sender, instance, **kwargs):
+    ChangeLog.objects.create(
+        entity='investment', object_id=instance.pk, action='delete', **_investment_audience(instance),
+    )
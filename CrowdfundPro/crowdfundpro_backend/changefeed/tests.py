@@ -0,0 +1,125 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from investments.models import Investment
+from projects.models import Project
+from users.models import User
+from .models import ChangeLog
+from .views import page
+
+
+class ChangesTests(APITestCase):
+    """
+    Flux de modifications : curseur, suppressions, transitions, purge.
+    """
+
+    def setUp(self):
+        self.porteur = User.objects.create_user('p@example.com', 'secret', username='porteur', role='PORTEUR')
+        self.investisseur = User.objects.create_user('i@example.com', 'secret', username='inv', role='INVESTISSEUR')
+        self.autre = User.objects.create_user('a@example.com', 'secret', username='autre', role='INVESTISSEUR')
+        self.projet = self._project('Projet suivi')
+        self.client.force_authenticate(self.investisseur)
+
+    def _project(self, titre, statut='EN_COURS'):
+        return Project.objects.create(
+            titre=titre, description='d' * 60, objectif=Decimal('1000'), statut=statut,
+            date_limite=timezone.now() + timedelta(days=30), porteur=self.porteur,
+        )
+
+    def _invest(self, investisseur):
+        return Investment.objects.create(
+            investisseur=investisseur, projet=self.projet, montant=Decimal('10'),
+            statut_paiement='EN_ATTENTE', methode_paiement='CARTE',
+        )
+
+    def _changes(self, **params):
+        response = self.client.get('/api/changes/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_curseur_et_modifications(self):
+        cursor = self._changes()['cursor']
+        self.assertEqual(cursor, ChangeLog.objects.latest('id').id)
+        self.assertEqual(self._changes(since=cursor)['projects'], [])
+
+        mien = self._invest(self.investisseur)
+        self._invest(self.autre)  # invisible pour cet investisseur
+        self.projet.statut = 'FINANCE'
+        self.projet.save()
+
+        data = self._changes(since=cursor)
+        self.assertFalse(data['has_more'])
+        self.assertEqual([p['id'] for p in data['projects']], [self.projet.pk])
+        self.assertEqual([i['id'] for i in data['investments']], [mien.pk])
+        self.assertEqual(
+            [(t['project'], t['from'], t['to']) for t in data['status_changes']],
+            [(self.projet.pk, 'EN_COURS', 'FINANCE')],
+        )
+        # Rien de nouveau depuis le curseur retourné
+        self.assertEqual(self._changes(since=data['cursor'])['cursor'], data['cursor'])
+
+    def test_suppressions(self):
+        investissement = self._invest(self.investisseur)
+        autre_projet = self._project('Projet supprimé')
+        ids = {'projects': [autre_projet.pk], 'investments': [investissement.pk]}
+        cursor = self._changes()['cursor']
+
+        investissement.delete()
+        autre_projet.delete()
+
+        data = self._changes(since=cursor)
+        self.assertEqual(data['deleted'], ids)
+        self.assertEqual(data['investments'], [])
+
+    def test_pagination(self):
+        cursor = self._changes()['cursor']
+        projets = [self._project(f'Projet {i}') for i in range(5)]
+        seen = []
+        while True:
+            data = self._changes(since=cursor, limit=2)
+            seen += [p['id'] for p in data['projects']]
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(sorted(seen), sorted(p.pk for p in projets))
+
+    def test_page_par_transactions_completes(self):
+        entries = [
+            ChangeLog.objects.create(entity='project', object_id=i, txid=txid)
+            for i, txid in enumerate((10, 10, 11, 11, 11, 12), start=1)
+        ]
+        journal = ChangeLog.objects.filter(pk__in=[e.pk for e in entries])
+        # La transaction 11 ne tient pas dans la page : elle n'est pas coupée
+        served, has_more = page(journal, 'txid', 0, 3)
+        self.assertEqual([e.txid for e in served], [10, 10])
+        self.assertTrue(has_more)
+        # Transaction plus grande qu'une page : servie en entier
+        served, has_more = page(journal, 'txid', 10, 2)
+        self.assertEqual([e.txid for e in served], [11, 11, 11])
+        self.assertTrue(has_more)
+        served, has_more = page(journal, 'txid', 11, 2)
+        self.assertEqual(([e.txid for e in served], has_more), ([12], False))
+
+    def test_curseur_expire(self):
+        cursor = self._changes()['cursor']
+        for i in range(3):
+            self._project(f'Projet {i}')
+        ChangeLog.objects.update(date=timezone.now() - timedelta(days=40))
+        self._project('Projet récent')
+        call_command('prune_changelog', days=30, stdout=StringIO())
+
+        response = self.client.get('/api/changes/', {'since': cursor})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        # Un curseur frais reste valide
+        self._changes(since=self._changes()['cursor'])
+
+    def test_parametres_invalides(self):
+        for params in ({'since': 'abc'}, {'since': -1}, {'since': 0, 'limit': 0}):
+            response = self.client.get('/api/changes/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
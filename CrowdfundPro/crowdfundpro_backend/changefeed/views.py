@@ -0,0 +1,119 @@
+from django.db import connection
+from django.db.models import Max, Q
+from django.db.models.expressions import RawSQL
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from investments.serializers import InvestmentListSerializer
+from investments.views import investissements_visibles
+from projects.serializers import ProjectListSerializer
+from projects.views import projets_visibles
+from .models import ChangeLog
+
+MAX_LIMIT = 1000
+
+
+def journal_for(user, journal):
+    """Entrées de `journal` pouvant concerner l'utilisateur."""
+    if user.is_superuser:
+        return journal
+    if user.role == 'PORTEUR':
+        return journal.filter(Q(entity='project') | Q(entity='investment', porteur_id=user.pk))
+    if user.role == 'INVESTISSEUR':
+        return journal.filter(Q(entity='project') | Q(entity='investment', investisseur_id=user.pk))
+    return journal.filter(entity='project')
+
+
+def settled_journal():
+    """
+    Entrées servables et nom du champ de position (voir `ChangeLog`). Sous
+    PostgreSQL, seules les transactions antérieures à la plus ancienne
+    transaction en cours : celles-ci ne recevront plus de nouvelle entrée.
+    """
+    if connection.vendor == 'postgresql':
+        xmin = RawSQL('txid_snapshot_xmin(txid_current_snapshot())', [])
+        return ChangeLog.objects.filter(txid__lt=xmin), 'txid'
+    return ChangeLog.objects.all(), 'id'
+
+
+def page(journal, position, since, limit):
+    """
+    Entrées de position > `since`, par transactions complètes (une position
+    est partagée par toutes les entrées d'une transaction sous PostgreSQL) ;
+    retourne (entrées, has_more).
+    """
+    entries = list(journal.filter(**{f'{position}__gt': since}).order_by(position, 'id')[:limit + 1])
+    if len(entries) <= limit:
+        return entries, False
+    boundary = getattr(entries[limit], position)
+    complete = [entry for entry in entries[:limit] if getattr(entry, position) != boundary]
+    if not complete:
+        # Transaction plus grande qu'une page : servie en entier
+        complete = list(journal.filter(**{position: boundary}).order_by('id'))
+    return complete, True
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def changes(request):
+    """
+    Flux de modifications pour la synchronisation incrémentale.
+
+    Sans `since` : retourne seulement le curseur courant (à demander avant un
+    chargement complet). Avec `since=<curseur>` : projets et investissements
+    modifiés depuis, identifiants supprimés et transitions de statut, plus le
+    nouveau curseur. Si `has_more` est vrai, rappeler avec ce curseur.
+    """
+    journal, position = settled_journal()
+
+    if 'since' not in request.query_params:
+        return Response({'cursor': journal.aggregate(cursor=Max(position))['cursor'] or 0})
+
+    try:
+        since = int(request.query_params['since'])
+        limit = min(int(request.query_params.get('limit', 500)), MAX_LIMIT)
+    except ValueError:
+        return Response({'error': 'Paramètres since et limit entiers attendus'}, status=status.HTTP_400_BAD_REQUEST)
+    if since < 0 or limit < 1:
+        return Response({'error': 'Paramètres since et limit invalides'}, status=status.HTTP_400_BAD_REQUEST)
+
+    oldest = ChangeLog.objects.order_by(position).values_list(position, flat=True).first()
+    if since and oldest is not None and since < oldest - 1:
+        # Entrées peut-être déjà purgées : le client doit tout recharger
+        return Response({'error': 'Curseur expiré, resynchronisation complète nécessaire'}, status=status.HTTP_410_GONE)
+
+    entries, has_more = page(journal_for(request.user, journal), position, since, limit)
+
+    # Seul le dernier état de chaque objet compte
+    latest = {}
+    transitions = []
+    for entry in entries:
+        latest[(entry.entity, entry.object_id)] = entry.action
+        if entry.nouveau_statut:
+            transitions.append({
+                'project': entry.object_id,
+                'from': entry.ancien_statut,
+                'to': entry.nouveau_statut,
+                'date': entry.date,
+            })
+
+    def ids(entity, action):
+        return [pk for (kind, pk), last in latest.items() if kind == entity and last == action]
+
+    projects = projets_visibles(request.user).filter(pk__in=ids('project', 'save')).for_listing()
+    investments = investissements_visibles(request.user).filter(pk__in=ids('investment', 'save')).for_listing()
+    projects_data = ProjectListSerializer(projects, many=True, context={'request': request}).data
+    visible = {project['id'] for project in projects_data}
+
+    return Response({
+        'cursor': getattr(entries[-1], position) if entries else since,
+        'has_more': has_more,
+        'projects': projects_data,
+        'investments': InvestmentListSerializer(investments, many=True, context={'request': request}).data,
+        'deleted': {
+            'projects': ids('project', 'delete'),
+            'investments': ids('investment', 'delete'),
+        },
+        'status_changes': [t for t in transitions if t['project'] in visible],
+    })
@@ -0,0 +1,190 @@
+"""
+Multiplexage de requêtes : `POST /api/batch/` exécute plusieurs
+sous-requêtes de l'API dans le même processus et renvoie leurs réponses
+ensemble.
+
+L'utilisateur est authentifié une seule fois (sur la requête englobante) puis
+transmis aux vues via l'authentification forcée de DRF : les sous-requêtes ne
+revalident pas le JWT. Les GET consécutifs s'exécutent en parallèle, dans
+un pool de threads partagé, avec le contexte de la requête englobante
+(mesures de performance, routage vers les réplicas) ; une requête
+d'écriture fait barrière (elle s'exécute seule, dans l'ordre).
+"""
+import contextvars
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections, connections
+from django.http import Http404
+from django.urls import Resolver404, resolve
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from monitoring.instrumentation import current_metrics
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD')
+ALLOWED_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE')
+# En-têtes de sous-requête transmis aux vues
+FORWARDED_HEADERS = ('if-none-match', 'if-modified-since', 'accept-language')
+# En-têtes de réponse renvoyés au client
+RETURNED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Location')
+
+# Partagé entre les lots : les threads (et leurs connexions) sont réutilisés
+executor = ThreadPoolExecutor(max_workers=getattr(settings, 'BATCH_MAX_WORKERS', 4), thread_name_prefix='batch')
+
+
+def _sub_request(request, spec):
+    """WSGIRequest d'une sous-requête, héritant de l'environnement de la requête englobante."""
+    url = urlsplit(spec['path'])
+    body = b''
+    if 'body' in spec:
+        body = json.dumps(spec['body']).encode()
+    environ = {
+        key: value for key, value in request.META.items()
+        if not key.startswith(('CONTENT_', 'HTTP_IF_', 'wsgi.input'))
+    }
+    environ.update({
+        'REQUEST_METHOD': spec['method'],
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+    })
+    for name, value in (spec.get('headers') or {}).items():
+        if name.lower() in FORWARDED_HEADERS:
+            environ['HTTP_' + name.upper().replace('-', '_')] = str(value)
+    sub = WSGIRequest(environ)
+    # Authentification forcée (cf. Request.__init__ de DRF) : pas de nouvelle validation du jeton
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def _execute(request, spec):
+    try:
+        match = resolve(urlsplit(spec['path']).path)
+    except Resolver404:
+        return {'id': spec.get('id'), 'status': status.HTTP_404_NOT_FOUND, 'body': {'error': 'URL inconnue'}}
+
+    sub = _sub_request(request, spec)
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    except Http404:
+        return {'id': spec.get('id'), 'status': status.HTTP_404_NOT_FOUND, 'body': {'error': 'Non trouvé'}}
+    except Exception:
+        logger.exception('Erreur dans la sous-requête %s %s', spec['method'], spec['path'])
+        return {'id': spec.get('id'), 'status': status.HTTP_500_INTERNAL_SERVER_ERROR, 'body': {'error': 'Erreur interne'}}
+
+    body = None
+    if getattr(response, 'streaming', False):
+        body = {'error': 'Réponse en flux non prise en charge dans un lot'}
+    elif response.content:
+        if response.get('Content-Type', '').startswith('application/json'):
+            body = json.loads(response.content)
+        else:
+            body = response.content.decode(response.charset, errors='replace')
+    return {
+        'id': spec.get('id'),
+        'status': response.status_code,
+        'headers': {name: response[name] for name in RETURNED_HEADERS if response.has_header(name)},
+        'body': body,
+    }
+
+
+def _execute_in_thread(request, spec):
+    """
+    Sous-requête dans un thread du pool, exécutée dans une copie du contexte
+    de la requête englobante. Les connexions du thread sont gérées comme
+    celles d'une requête (`CONN_MAX_AGE`) et instrumentées à leur tour.
+    """
+    close_old_connections()
+    try:
+        with ExitStack() as stack:
+            metrics = current_metrics.get()
+            if metrics is not None:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+            return _execute(request, spec)
+    finally:
+        close_old_connections()
+
+
+def _validate(specs, max_requests):
+    if not isinstance(specs, list) or not specs:
+        return 'Liste "requests" non vide attendue'
+    if len(specs) > max_requests:
+        return f'Au plus {max_requests} sous-requêtes par lot'
+    for spec in specs:
+        if not isinstance(spec, dict) or not isinstance(spec.get('path'), str):
+            return 'Chaque sous-requête doit avoir un "path"'
+        spec['method'] = str(spec.get('method', 'GET')).upper()
+        if spec['method'] not in ALLOWED_METHODS:
+            return f'Méthode non autorisée : {spec["method"]}'
+        path = urlsplit(spec['path']).path
+        if not path.startswith('/api/') or path.startswith('/api/batch/'):
+            return f'Chemin non autorisé : {spec["path"]}'
+    return None
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def batch(request):
+    """
+    Exécute un lot de sous-requêtes :
+    {"requests": [{"id": "profil", "method": "GET", "path": "/api/users/profile/"}, ...]}
+    Réponse : {"responses": [{"id", "status", "headers", "body"}, ...]} dans le même ordre.
+    """
+    specs = request.data.get('requests') if isinstance(request.data, dict) else None
+    max_requests = getattr(settings, 'BATCH_MAX_REQUESTS', 10)
+    error = _validate(specs, max_requests)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+    django_request = request._request
+    django_request.user = request.user
+    django_request.auth = request.auth
+
+    # Fenêtre "sticky" de ReplicaRoutingMiddleware : seulement après une écriture réussie
+    django_request.db_write = False
+
+    results = [None] * len(specs)
+    group = []
+
+    def flush():
+        # Sous-requêtes GET consécutives : en parallèle
+        if len(group) == 1:
+            index = group[0]
+            results[index] = _execute(django_request, specs[index])
+        elif group:
+            futures = {
+                index: executor.submit(contextvars.copy_context().run, _execute_in_thread, django_request, specs[index])
+                for index in group
+            }
+            for index, future in futures.items():
+                results[index] = future.result()
+        group.clear()
+
+    for index, spec in enumerate(specs):
+        if spec['method'] in SAFE_METHODS:
+            group.append(index)
+            continue
+        flush()
+        results[index] = _execute(django_request, spec)
+        if results[index]['status'] < 400:
+            django_request.db_write = True
+    flush()
+
+    return Response({'responses': results})
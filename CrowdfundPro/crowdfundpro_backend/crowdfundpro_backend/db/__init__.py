@@ -0,0 +1 @@
+# Backends de base de données du projet
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class DbConfig(AppConfig):
+    name = 'crowdfundpro_backend.db'
+    label = 'replica_routing'
+    verbose_name = 'Routage principal / réplicas'
+
+    def ready(self):
+        from . import checks  # noqa: F401
@@ -0,0 +1,29 @@
+"""
+Vérifications de configuration du routage principal / réplicas.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .routers import replica_aliases
+
+# Caches propres à chaque processus : la fenêtre "sticky" ne serait pas vue
+# par les autres workers
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_sticky_cache(app_configs, **kwargs):
+    if not replica_aliases():
+        return []
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Error(
+            f'Le cache par défaut ({backend}) n\'est pas partagé entre les processus.',
+            hint='Configurez un cache partagé (REDIS_URL) pour la fenêtre "sticky" '
+                 'de ReplicaRoutingMiddleware, ou retirez DATABASE_REPLICAS.',
+            id='replica_routing.E001',
+        )]
+    return []
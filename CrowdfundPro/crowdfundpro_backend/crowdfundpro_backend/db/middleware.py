@@ -0,0 +1,68 @@
+"""
+Middleware de sélection principal/réplica par requête.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .routers import _use_replica, replica_aliases
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _client_key(request):
+    """
+    Clé identifiant le client pour la fenêtre "sticky" : son jeton JWT (ou sa
+    session). L'adresse IP n'est pas utilisée (derrière le proxy, tous les
+    clients partagent la même) ; les requêtes anonymes n'ont pas de fenêtre.
+    """
+    credential = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return 'db-sticky:' + hashlib.sha1(credential.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Envoie les vues en lecture seule (`DATABASE_REPLICA_VIEWS`) vers les
+    réplicas. Après une écriture réussie, le client reste sur la base
+    principale pendant `DATABASE_STICKY_PRIMARY_SECONDS` pour lire ses
+    propres écritures malgré le retard de réplication. La fenêtre est
+    conservée dans le cache par défaut, partagé entre les processus
+    (vérification `replica_routing.E001`). Une vue peut
+    indiquer elle-même si elle a écrit en positionnant `request.db_write`
+    (lot de sous-requêtes envoyé en POST, par exemple).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request._replica_token is not None:
+                _use_replica.reset(request._replica_token)
+
+        wrote = getattr(request, 'db_write', None)
+        if wrote is None:
+            wrote = request.method not in SAFE_METHODS and response.status_code < 400
+        key = _client_key(request) if replica_aliases() and wrote else None
+        if key:
+            cache.set(key, True, timeout=settings.DATABASE_STICKY_PRIMARY_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not replica_aliases() or request.method not in SAFE_METHODS:
+            return None
+        match = request.resolver_match
+        if match is None or match.url_name not in settings.DATABASE_REPLICA_VIEWS:
+            return None
+        key = _client_key(request)
+        if key and cache.get(key):
+            return None
+        request._replica_token = _use_replica.set(True)
+        return None
@@ -0,0 +1,55 @@
+"""
+Routage des lectures vers les réplicas.
+
+Les lectures ne partent vers un réplica que pendant une requête marquée par
+`ReplicaRoutingMiddleware` (vue en lecture seule, pas de fenêtre "sticky"
+active). Toutes les écritures vont sur la base principale.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICA_ALIASES', [])
+
+
+@contextmanager
+def read_from_replica():
+    """Envoie les lectures du bloc vers un réplica (si configuré)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Routeur principal/réplicas.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _use_replica.get():
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicite : sinon Django réutiliserait l'alias d'une instance lue sur un réplica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1 @@
+# Backend SQLite avec réglages de performance
@@ -0,0 +1,32 @@
+"""
+Backend SQLite avec réglages de performance appliqués à chaque connexion.
+
+Le mode WAL permet aux lectures de continuer pendant une écriture, au lieu
+d'être sérialisées derrière le verrou du writer. Les PRAGMAs sont fournis via
+`OPTIONS['pragmas']` dans `DATABASES`.
+"""
+from django.db.backends.sqlite3 import base
+
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 134217728,  # 128 Mo
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        # Les PRAGMAs ne sont pas des arguments de sqlite3.connect()
+        params.pop('pragmas', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        pragmas = {**DEFAULT_PRAGMAS, **self.settings_dict['OPTIONS'].get('pragmas', {})}
+        for name, value in pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
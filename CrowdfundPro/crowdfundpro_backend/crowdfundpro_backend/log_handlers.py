@@ -0,0 +1,88 @@
+"""
+Journalisation non bloquante.
+
+Les threads de requête se contentent de formater et de mettre en file les
+enregistrements ; un thread d'écoute (`QueueListener`) fait les écritures
+console / fichier. La file est bornée : si elle est pleine, l'enregistrement
+est abandonné plutôt que de bloquer la requête.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Handler qui délègue les écritures à `handlers` via une file bornée.
+
+    Dans LOGGING, `handlers` référence les handlers cibles avec `cfg://`
+    (ils doivent être configurés avant celui-ci, i.e. trier avant lui par nom).
+    """
+
+    def __init__(self, handlers, maxsize=10000, max_message_length=2000):
+        super().__init__(queue.Queue(maxsize))
+        # ConvertingList : l'accès par index résout les références cfg://
+        self.handlers = [handlers[i] for i in range(len(handlers))]
+        self.max_message_length = max_message_length
+        self.dropped = 0
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            # Le thread d'écoute ne survit pas à un fork (workers gunicorn)
+            os.register_at_fork(after_in_child=self._start_listener)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        if len(record.msg) > self.max_message_length:
+            record.msg = record.msg[:self.max_message_length] + ' [tronqué]'
+            record.message = record.msg
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Ne conserve qu'une fraction `rate` des enregistrements DEBUG ; les niveaux
+    supérieurs passent toujours. Appliqué avant la mise en file, un
+    enregistrement écarté ne coûte pas de formatage.
+    """
+
+    def __init__(self, rate=0.01):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        return random.random() < self.rate
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Une ligne JSON par enregistrement.
+    """
+
+    def format(self, record):
+        return json.dumps({
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }, ensure_ascii=False)
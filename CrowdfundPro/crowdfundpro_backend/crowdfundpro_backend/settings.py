@@ -4,7 +4,8 @@ Django settings for crowdfundpro_backend project.
 
 import os
 from pathlib import Path
-from decouple import config
+import dj_database_url
+from decouple import config, Csv
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -36,21 +37,35 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
+    'django_q',
     
     # Local apps
+    'crowdfundpro_backend.db',
     'users',
     'projects',
     'investments',
+    'monitoring',
+    'benchmarks',
+    'uploads',
+    'changefeed',
+    'rankings',
+    'recommendations',
+    'ledger',
+    'analytics',
+    'archive',
     'django_rest_passwordreset',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'crowdfundpro_backend.db.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -76,12 +91,97 @@ TEMPLATES = [
 WSGI_APPLICATION = 'crowdfundpro_backend.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Connexions persistantes (vérifiées avant réutilisation) pour éviter
+# d'ouvrir une connexion par requête.
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
+DATABASE_URL = config('DATABASE_URL', default='')
+
+if DATABASE_URL:
+    # PostgreSQL (ou autre) via DATABASE_URL. Derrière PgBouncer en mode
+    # transaction, activer DB_PGBOUNCER pour désactiver les curseurs serveur.
+    DATABASES = {
+        'default': dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=True,
+            disable_server_side_cursors=config('DB_PGBOUNCER', default=False, cast=bool),
+        )
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'crowdfundpro_backend.db.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pragmas': {
+                    'journal_mode': 'WAL',
+                    'synchronous': 'NORMAL',
+                    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+                    'mmap_size': config('SQLITE_MMAP_SIZE', default=134217728, cast=int),
+                },
+            },
+        }
+    }
+
+# Réplicas en lecture (URLs séparées par des virgules), utilisés par les vues
+# de lecture seule listées dans DATABASE_REPLICA_VIEWS. En local, des fichiers
+# SQLite suffisent : sqlite:////chemin/vers/replica1.sqlite3
+DATABASE_REPLICA_ALIASES = []
+for index, replica_url in enumerate(config('DATABASE_REPLICAS', default='', cast=Csv()), start=1):
+    alias = f'replica_{index}'
+    replica = dj_database_url.parse(replica_url, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True)
+    if replica['ENGINE'] == 'django.db.backends.sqlite3':
+        replica['ENGINE'] = 'crowdfundpro_backend.db.sqlite3'
+    replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[alias] = replica
+    DATABASE_REPLICA_ALIASES.append(alias)
+
+DATABASE_ROUTERS = ['crowdfundpro_backend.db.routers.ReplicaRouter']
+
+DATABASE_REPLICA_VIEWS = [
+    'project-list',
+    'project-detail',
+    'project-stats',
+    'user-projects',
+    'porteur-stats',
+    'investisseur-stats',
+    'investment-list',
+    'investment-dashboard',
+]
+
+# Après une écriture, le client lit sur la base principale pendant ce délai
+DATABASE_STICKY_PRIMARY_SECONDS = config('DATABASE_STICKY_PRIMARY_SECONDS', default=15, cast=int)
+
+# Cache partagé entre les processus, nécessaire à la fenêtre "sticky" des
+# réplicas (vérification replica_routing.E001) ; cache local sinon
+REDIS_URL = config('REDIS_URL', default='redis://127.0.0.1:6379/1' if DATABASE_REPLICA_ALIASES else '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Instrumentation des performances (monitoring.middleware)
+PERFORMANCE_SAMPLE_SIZE = 1024  # requêtes conservées par vue pour les percentiles
+PERFORMANCE_QUERY_WARNING = 50  # avertit au-delà de ce nombre de requêtes SQL
+
+# Journal des requêtes lentes avec EXPLAIN (0 : désactivé)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=0, cast=float)
+SLOW_QUERY_LOG_SIZE = 200
+
+# Endpoint Prometheus /metrics
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -119,7 +219,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -153,8 +253,22 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 
     'JTI_CLAIM': 'jti',
+
+    # Ajoute role / is_superuser aux jetons (voir users.authentication)
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.ClaimsTokenObtainPairSerializer',
+    # Contrôle de révocation via filtre de Bloom (voir users.revocation)
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.ClaimsTokenRefreshSerializer',
 }
 
+# Cache des utilisateurs complets pour ClaimsJWTAuthentication
+JWT_USER_CACHE_SIZE = config('JWT_USER_CACHE_SIZE', default=1024, cast=int)
+JWT_USER_CACHE_TTL = config('JWT_USER_CACHE_TTL', default=300, cast=int)
+
+# Filtre de révocation des jetons de rafraîchissement
+TOKEN_REVOCATION_FILTER_CAPACITY = config('TOKEN_REVOCATION_FILTER_CAPACITY', default=100000, cast=int)
+TOKEN_REVOCATION_FILTER_ERROR_RATE = 0.001
+TOKEN_REVOCATION_SYNC_SECONDS = config('TOKEN_REVOCATION_SYNC_SECONDS', default=5, cast=int)
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
 CORS_ALLOW_CREDENTIALS = True
@@ -178,11 +292,22 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
+    'if-modified-since',
+    'x-upload-offset',
+    'x-chunk-sha256',
+    'range',
+    'if-range',
 ]
 
 CORS_EXPOSE_HEADERS = [
     'content-type',
     'content-length',
+    'content-range',
+    'content-disposition',
+    'accept-ranges',
+    'etag',
+    'last-modified',
 ]
 
 # Session settings
@@ -195,6 +320,55 @@ CSRF_TRUSTED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 
+# Téléversements par morceaux (documents de projet)
+CHUNKED_UPLOAD_DIR = config('CHUNKED_UPLOAD_DIR', default=os.path.join(BASE_DIR, 'uploads_tmp'))
+CHUNKED_UPLOAD_CHUNK_SIZE = config('CHUNKED_UPLOAD_CHUNK_SIZE', default=1024 * 1024, cast=int)
+CHUNKED_UPLOAD_EXPIRATION_HOURS = 24
+
+# Téléchargement des documents de projet : transfert délégué au serveur frontal
+# 'nginx' (X-Accel-Redirect), 'apache' (X-Sendfile) ou vide (FileResponse avec Range).
+# Avec nginx : location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+PROTECTED_MEDIA_SERVER = config('PROTECTED_MEDIA_SERVER', default='')
+PROTECTED_MEDIA_INTERNAL_URL = '/protected-media/'
+
+# Classements (/api/projects/trending/) : taille du top-k en mémoire et
+# délai avant rechargement depuis la base
+RANKING_TOP_K = 100
+RANKING_REFRESH_SECONDS = 30
+
+# Recommandations (compute_recommendations, quotidien) : nombre de projets
+# stockés par investisseur, poids des composantes, échelle de proximité (km)
+RECOMMENDATION_TOP_N = 20
+RECOMMENDATION_WEIGHTS = {'collaboratif': 0.6, 'contenu': 0.3, 'proximite': 0.1}
+RECOMMENDATION_DISTANCE_KM = 50
+
+# Prévisions de financement (forecast_funding, quotidien) : historique
+# considéré et demi-vie de la pondération des jours récents
+FORECAST_WINDOW_DAYS = 30
+FORECAST_HALF_LIFE_DAYS = 7
+
+# Registre des financements : délai avant qu'un mouvement soit intégré à un
+# instantané de solde (snapshot_balances, horaire)
+LEDGER_SNAPSHOT_SETTLE_SECONDS = 60
+
+# Statistiques approchées (/api/projects/stats/platform/) : délai maximal
+# avant report en base des résumés accumulés par un processus
+ANALYTICS_FLUSH_SECONDS = 10
+
+# Archivage (archive_projects, quotidien) : ancienneté minimale de la date
+# limite d'un projet clôturé (FINANCE / ECHOUE) avant son archivage
+ARCHIVE_AFTER_DAYS = 365
+
+# Suppression des comptes et des projets en tâche de fond (users.deletion,
+# projects.deletion) : lignes par lot
+# (une transaction chacun) et durée d'une tâche avant sa replanification
+USER_DELETION_CHUNK_SIZE = 2000
+USER_DELETION_TIME_BUDGET = 45
+
+# Multiplexage /api/batch/
+BATCH_MAX_REQUESTS = 10
+BATCH_MAX_WORKERS = 4
+
 # Stripe Settings
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default='')
 STRIPE_PUBLISHABLE_KEY = config('STRIPE_PUBLISHABLE_KEY', default='')
@@ -210,6 +384,8 @@ Q_CLUSTER = {
     'queue_limit': 500,
     'cpu_affinity': 1,
     'label': 'Django Q',
+    # Exécute les tâches dans le processus courant (développement sans Redis)
+    'sync': config('Q_CLUSTER_SYNC', default=False, cast=bool),
     'redis': {
         'host': '127.0.0.1',
         'port': 6379,
@@ -228,9 +404,22 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 # Logging
+# Les threads de requête ne font que mettre les enregistrements en file ;
+# les écritures console / fichier sont faites par un thread d'écoute.
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'structured': {
+            '()': 'crowdfundpro_backend.log_handlers.StructuredFormatter',
+        },
+    },
+    'filters': {
+        'sample_debug': {
+            '()': 'crowdfundpro_backend.log_handlers.SamplingFilter',
+            'rate': config('LOG_DEBUG_SAMPLE_RATE', default=0.01, cast=float),
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
@@ -238,17 +427,30 @@ LOGGING = {
         'file': {
             'class': 'logging.FileHandler',
             'filename': 'crowdfundpro.log',
+            'formatter': 'structured',
+        },
+        # Doit trier après 'console' et 'file' (références cfg://)
+        'queue': {
+            '()': 'crowdfundpro_backend.log_handlers.AsyncQueueHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
+            'maxsize': 10000,
+            'max_message_length': 2000,
+            'filters': ['sample_debug'],
         },
     },
     'root': {
-        'handlers': ['console', 'file'],
+        'handlers': ['queue'],
         'level': 'INFO',
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': False,
         },
+        # Chemins de debug fréquents, échantillonnés par 'sample_debug'
+        'projects': {
+            'level': 'DEBUG',
+        },
     },
-} 
\ No newline at end of file
+}
@@ -5,6 +5,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from monitoring import views as monitoring_views
+from . import batch
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -19,8 +21,16 @@ urlpatterns = [
     
     # App endpoints
     path('api/users/', include('users.urls')),
+    path('api/projects/trending/', include('rankings.urls')),
     path('api/projects/', include('projects.urls')),
     path('api/investments/', include('investments.urls')),
+    path('api/uploads/', include('uploads.urls')),
+    path('api/recommendations/', include('recommendations.urls')),
+    path('api/ledger/', include('ledger.urls')),
+    path('api/changes/', include('changefeed.urls')),
+    path('api/batch/', batch.batch, name='batch'),
+    path('api/monitoring/', include('monitoring.urls')),
+    path('metrics', monitoring_views.metrics, name='metrics'),
 ]
 
 # Serve media files in development
@@ -4,6 +4,19 @@ from django.utils import timezone
 from decimal import Decimal
 from users.models import User
 from projects.models import Project
+from changefeed.models import record_project_change
+
+
+class InvestmentQuerySet(models.QuerySet):
+
+    def for_listing(self):
+        """
+        Précharge l'investisseur et le projet (avec ses propres données
+        d'affichage) utilisés par les sérialiseurs d'investissement.
+        """
+        return self.select_related('investisseur').prefetch_related(
+            models.Prefetch('projet', queryset=Project.objects.for_listing())
+        )
 
 
 class Investment(models.Model):
@@ -62,14 +75,32 @@ class Investment(models.Model):
         verbose_name_plural = 'Investissements'
         ordering = ['-date_investissement']
     
+    objects = InvestmentQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.investisseur.email} - {self.projet.titre} - {self.montant}€"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Statut et montant tels que chargés, pour détecter les transitions dans post_save
+        instance._statut_paiement_initial = instance.__dict__.get('statut_paiement')
+        instance._montant_initial = instance.__dict__.get('montant')
+        return instance
+    
     def save(self, *args, **kwargs):
+        etait_reussi = getattr(self, '_statut_paiement_initial', None) == 'REUSSI'
         super().save(*args, **kwargs)
-        # Update project amount when investment status changes to 'REUSSI'
-        if self.statut_paiement == 'REUSSI':
+        self._statut_paiement_initial = self.statut_paiement
+        self._montant_initial = self.montant
+        # Update project amount when investment status changes to or from 'REUSSI'
+        if self.statut_paiement == 'REUSSI' or etait_reussi:
             self.projet.update_montant_actuel()
+        else:
+            # nombre_investisseurs compte aussi les investissements non réussis :
+            # invalide les ETags du projet sans recalculer le montant
+            Project.objects.filter(pk=self.projet_id).update(date_modification=timezone.now())
+            record_project_change(self.projet_id, self.projet.porteur_id)
     
     @property
     def is_successful(self):
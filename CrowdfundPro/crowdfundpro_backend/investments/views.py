@@ -1,9 +1,15 @@
 import stripe
 from decimal import Decimal
 from django.conf import settings
+from django.db.models import Count, Q, Sum
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from archive.models import ArchivedInvestment
+from archive.serializers import ArchivedInvestmentSerializer
+from monitoring.metrics import stripe_request_duration
 from .models import Investment
 from .serializers import (
     InvestmentCreateSerializer,
@@ -17,6 +23,21 @@ from .serializers import (
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
 
+def investissements_visibles(user, model=Investment):
+    """
+    Investissements visibles selon le rôle de l'utilisateur
+    (`model=ArchivedInvestment` pour les investissements archivés)
+    """
+    if user.is_superuser:
+        return model.objects.all()
+    elif user.role == 'INVESTISSEUR':
+        return model.objects.filter(investisseur=user)
+    elif user.role == 'PORTEUR':
+        # Porteurs can see investments in their projects
+        return model.objects.filter(projet__porteur=user)
+    return model.objects.none()
+
+
 class IsInvestisseurOrReadOnly(permissions.BasePermission):
     """
     Permission personnalisée pour les investisseurs
@@ -40,15 +61,7 @@ class InvestmentCreateView(generics.CreateAPIView, generics.ListAPIView):
         return InvestmentCreateSerializer
     
     def get_queryset(self):
-        user = self.request.user
-        if user.is_superuser:
-            return Investment.objects.all()
-        elif user.role == 'INVESTISSEUR':
-            return Investment.objects.filter(investisseur=user)
-        elif user.role == 'PORTEUR':
-            # Porteurs can see investments in their projects
-            return Investment.objects.filter(projet__porteur=user)
-        return Investment.objects.none()
+        return investissements_visibles(self.request.user).for_listing()
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -79,15 +92,7 @@ class InvestmentListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        user = self.request.user
-        if user.is_superuser:
-            return Investment.objects.all()
-        elif user.role == 'INVESTISSEUR':
-            return Investment.objects.filter(investisseur=user)
-        elif user.role == 'PORTEUR':
-            # Porteurs can see investments in their projects
-            return Investment.objects.filter(projet__porteur=user)
-        return Investment.objects.none()
+        return investissements_visibles(self.request.user).for_listing()
 
 
 class InvestmentDetailView(generics.RetrieveAPIView):
@@ -98,14 +103,18 @@ class InvestmentDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        user = self.request.user
-        if user.is_superuser:
-            return Investment.objects.all()
-        elif user.role == 'INVESTISSEUR':
-            return Investment.objects.filter(investisseur=user)
-        elif user.role == 'PORTEUR':
-            return Investment.objects.filter(projet__porteur=user)
-        return Investment.objects.none()
+        return investissements_visibles(self.request.user).for_listing()
+    
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # Investissement d'un projet archivé
+            archived = get_object_or_404(
+                investissements_visibles(request.user, ArchivedInvestment).select_related('investisseur', 'projet__porteur'),
+                pk=self.kwargs['pk'],
+            )
+            return Response(ArchivedInvestmentSerializer(archived, context=self.get_serializer_context()).data)
 
 
 @api_view(['POST'])
@@ -129,15 +138,16 @@ def create_payment_intent(request):
             )
         
         # Create Stripe payment intent
-        intent = stripe.PaymentIntent.create(
-            amount=int(investment.montant * 100),  # Stripe uses cents
-            currency='eur',
-            metadata={
-                'investment_id': investment.id,
-                'project_title': investment.projet.titre,
-                'investor_email': investment.investisseur.email
-            }
-        )
+        with stripe_request_duration.time(operation='create_payment_intent'):
+            intent = stripe.PaymentIntent.create(
+                amount=int(investment.montant * 100),  # Stripe uses cents
+                currency='eur',
+                metadata={
+                    'investment_id': investment.id,
+                    'project_title': investment.projet.titre,
+                    'investor_email': investment.investisseur.email
+                }
+            )
         
         # Save payment intent details to investment
         investment.stripe_payment_intent_id = intent.id
@@ -182,9 +192,10 @@ def confirm_payment(request):
             )
         
         # Retrieve payment intent from Stripe
-        intent = stripe.PaymentIntent.retrieve(
-            serializer.validated_data['payment_intent_id']
-        )
+        with stripe_request_duration.time(operation='confirm_payment'):
+            intent = stripe.PaymentIntent.retrieve(
+                serializer.validated_data['payment_intent_id']
+            )
         
         if intent.status == 'succeeded':
             investment.statut_paiement = 'REUSSI'
@@ -214,6 +225,17 @@ def confirm_payment(request):
         )
 
 
+def archived_totals(queryset):
+    """Effectifs par statut de paiement et montant réussi d'investissements archivés, en une requête."""
+    return queryset.aggregate(
+        total=Count('id'),
+        reussi=Count('id', filter=Q(statut_paiement='REUSSI')),
+        echoue=Count('id', filter=Q(statut_paiement='ECHOUE')),
+        en_attente=Count('id', filter=Q(statut_paiement='EN_ATTENTE')),
+        montant=Sum('montant', filter=Q(statut_paiement='REUSSI'), default=Decimal('0.00')),
+    )
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def investment_dashboard(request):
@@ -232,9 +254,17 @@ def investment_dashboard(request):
         pending_investments = investments.filter(statut_paiement='EN_ATTENTE').count()
         
         total_amount = sum(inv.montant for inv in investments.filter(statut_paiement='REUSSI'))
+
+        # Investissements des projets archivés
+        archives = archived_totals(ArchivedInvestment.objects.filter(investisseur=user))
+        total_investments += archives['total']
+        successful_investments += archives['reussi']
+        failed_investments += archives['echoue']
+        pending_investments += archives['en_attente']
+        total_amount += archives['montant']
         avg_amount = total_amount / successful_investments if successful_investments > 0 else 0
         
-        recent_investments = investments.order_by('-date_investissement')[:5]
+        recent_investments = investments.for_listing().order_by('-date_investissement')[:5]
         
         return Response({
             'stats': {
@@ -255,8 +285,13 @@ def investment_dashboard(request):
         total_investments = investments.count()
         successful_investments = investments.filter(statut_paiement='REUSSI').count()
         total_amount = sum(inv.montant for inv in investments.filter(statut_paiement='REUSSI'))
+
+        archives = archived_totals(ArchivedInvestment.objects.filter(projet__porteur=user))
+        total_investments += archives['total']
+        successful_investments += archives['reussi']
+        total_amount += archives['montant']
         
-        recent_investments = investments.order_by('-date_investissement')[:5]
+        recent_investments = investments.for_listing().order_by('-date_investissement')[:5]
         
         return Response({
             'stats': {
@@ -0,0 +1,39 @@
+from django.contrib import admin
+from .models import BalanceSnapshot, LedgerEntry
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    """
+    Administration pour le registre des financements (lecture seule)
+    """
+    list_display = ('id', 'projet_id', 'investissement_id', 'type', 'montant', 'date')
+    list_filter = ('type', 'date')
+    search_fields = ('projet_id', 'investissement_id')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BalanceSnapshot)
+class BalanceSnapshotAdmin(admin.ModelAdmin):
+    """
+    Administration pour les instantanés de solde (lecture seule)
+    """
+    list_display = ('projet_id', 'solde', 'dernier_mouvement', 'date')
+    search_fields = ('projet_id',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
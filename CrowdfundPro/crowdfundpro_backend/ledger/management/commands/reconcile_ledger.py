@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, OuterRef, Subquery, Sum
+
+from investments.models import Investment
+from ledger.models import BalanceSnapshot, LedgerEntry
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare montant_actuel au solde du registre (dernier instantané + mouvements suivants) "
+        "et signale les écarts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Aligne montant_actuel sur le registre')
+        parser.add_argument(
+            '--investments', action='store_true',
+            help='Compare aussi le registre à la somme des investissements réussis (parcours complet)',
+        )
+
+    def handle(self, *args, **options):
+        watermark = BalanceSnapshot.objects.aggregate(last=Max('dernier_mouvement'))['last'] or 0
+        latest = BalanceSnapshot.objects.filter(projet_id=OuterRef('pk')).order_by('-dernier_mouvement')
+        projects = Project.objects.annotate(instantane=Subquery(latest.values('solde')[:1])).values_list(
+            'pk', 'montant_actuel', 'instantane'
+        )
+        tails = dict(
+            LedgerEntry.objects.filter(id__gt=watermark).order_by().values_list('projet_id')
+            .annotate(total=Sum('montant'))
+        )
+        totals = {}
+        if options['investments']:
+            totals = dict(
+                Investment.objects.filter(statut_paiement='REUSSI').order_by().values_list('projet_id')
+                .annotate(total=Sum('montant'))
+            )
+
+        ecarts = 0
+        for pk, montant_actuel, instantane in projects.iterator(chunk_size=2000):
+            solde = (instantane or Decimal('0.00')) + tails.get(pk, Decimal('0.00'))
+            if options['investments'] and totals.get(pk, Decimal('0.00')) != solde:
+                self.stdout.write(self.style.WARNING(
+                    f'Projet {pk} : registre {solde}€, investissements réussis {totals.get(pk, Decimal("0.00"))}€'
+                ))
+            if montant_actuel != solde:
+                ecarts += 1
+                self.stdout.write(self.style.WARNING(
+                    f'Projet {pk} : montant_actuel {montant_actuel}€, registre {solde}€'
+                ))
+                if options['fix']:
+                    Project.objects.get(pk=pk).update_montant_actuel()
+
+        self.stdout.write(self.style.SUCCESS(f'{ecarts} écart(s) détecté(s)'))
@@ -0,0 +1,50 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from ledger.models import BalanceSnapshot, LedgerEntry
+
+
+class Command(BaseCommand):
+    help = "Enregistre un instantané du solde des projets ayant eu des mouvements depuis le précédent"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        # Les mouvements très récents sont laissés au prochain passage : une
+        # transaction plus ancienne (id plus petit) peut encore être en cours
+        settled = now - timedelta(seconds=getattr(settings, 'LEDGER_SNAPSHOT_SETTLE_SECONDS', 60))
+        cut = LedgerEntry.objects.filter(date__lte=settled).aggregate(last=Max('id'))['last'] or 0
+        previous = BalanceSnapshot.objects.aggregate(last=Max('dernier_mouvement'))['last'] or 0
+        if cut <= previous:
+            self.stdout.write(self.style.SUCCESS('Aucun mouvement depuis le dernier instantané'))
+            return
+
+        latest = BalanceSnapshot.objects.filter(projet_id=OuterRef('projet_id')).order_by('-dernier_mouvement')
+        deltas = (
+            LedgerEntry.objects.filter(id__gt=previous, id__lte=cut)
+            .order_by()
+            .values('projet_id')
+            .annotate(total=Sum('montant'), precedent=Subquery(latest.values('solde')[:1]))
+        )
+        snapshots = [
+            BalanceSnapshot(
+                projet_id=row['projet_id'],
+                solde=(row['precedent'] or Decimal('0.00')) + row['total'],
+                dernier_mouvement=cut,
+                date=now,
+            )
+            for row in deltas.iterator(chunk_size=options['batch_size'])
+        ]
+        with transaction.atomic():
+            BalanceSnapshot.objects.bulk_create(snapshots, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(snapshots)} instantané(s) enregistré(s) jusqu\'au mouvement {cut}'
+        ))
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('investments', '0002_alter_investment_investisseur_and_more'),
+        ('projects', '0010_forecast_funding_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('type', models.CharField(choices=[('SUCCES', 'Investissement réussi'), ('REMBOURSEMENT', 'Remboursement'), ('ANNULATION', 'Annulation après échec du paiement'), ('AJUSTEMENT', 'Ajustement du montant')], max_length=15)),
+                ('montant', models.DecimalField(decimal_places=2, help_text='Montant signé (négatif pour un retrait)', max_digits=12)),
+                ('date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('investissement', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='investments.investment')),
+                ('projet', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='projects.project')),
+            ],
+            options={
+                'verbose_name': 'Mouvement de financement',
+                'verbose_name_plural': 'Mouvements de financement',
+                'db_table': 'ledger_entries',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['projet', 'id'], name='ledger_entr_projet__2115f8_idx'), models.Index(fields=['projet', 'date'], name='ledger_entr_projet__2f2ac7_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('solde', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('dernier_mouvement', models.BigIntegerField()),
+                ('date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('projet', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='projects.project')),
+            ],
+            options={
+                'verbose_name': 'Instantané de solde',
+                'verbose_name_plural': 'Instantanés de solde',
+                'db_table': 'ledger_balance_snapshots',
+                'indexes': [models.Index(fields=['projet', 'dernier_mouvement'], name='ledger_bala_projet__c7874b_idx'), models.Index(fields=['projet', 'date'], name='ledger_bala_projet__0a7621_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    """Ouvre le registre avec un mouvement SUCCES par investissement déjà réussi."""
+    Investment = apps.get_model('investments', 'Investment')
+    LedgerEntry = apps.get_model('ledger', 'LedgerEntry')
+    rows = Investment.objects.filter(statut_paiement='REUSSI').order_by('date_investissement', 'id').values_list(
+        'id', 'projet_id', 'montant', 'date_investissement'
+    )
+    batch = []
+    for pk, projet_id, montant, date in rows.iterator(chunk_size=2000):
+        batch.append(LedgerEntry(
+            projet_id=projet_id, investissement_id=pk, type='SUCCES', montant=montant, date=date,
+        ))
+        if len(batch) >= 2000:
+            LedgerEntry.objects.bulk_create(batch)
+            batch = []
+    LedgerEntry.objects.bulk_create(batch)
+
+
+def clear(apps, schema_editor):
+    apps.get_model('ledger', 'LedgerEntry').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledger', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='snapshot_balances',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'snapshot_balances'",
+            'schedule_type': 'H',
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='snapshot_balances').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledger', '0002_backfill_ledger'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,107 @@
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+
+class LedgerEntry(models.Model):
+    """
+    Mouvement de financement d'un projet, en ajout seul : une entrée n'est
+    jamais modifiée ni supprimée, une correction est un nouveau mouvement.
+
+    Les clés étrangères sont sans contrainte en base (le registre survit à la
+    suppression du projet ou de l'investissement).
+    """
+    TYPE_CHOICES = (
+        ('SUCCES', 'Investissement réussi'),
+        ('REMBOURSEMENT', 'Remboursement'),
+        ('ANNULATION', 'Annulation après échec du paiement'),
+        ('AJUSTEMENT', 'Ajustement du montant'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    projet = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+    )
+    investissement = models.ForeignKey(
+        'investments.Investment',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    type = models.CharField(max_length=15, choices=TYPE_CHOICES)
+    montant = models.DecimalField(max_digits=12, decimal_places=2, help_text="Montant signé (négatif pour un retrait)")
+    date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'ledger_entries'
+        verbose_name = 'Mouvement de financement'
+        verbose_name_plural = 'Mouvements de financement'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['projet', 'id']),
+            models.Index(fields=['projet', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.projet_id} - {self.get_type_display()} - {self.montant}€"
+
+
+class BalanceSnapshot(models.Model):
+    """
+    Solde d'un projet après application de tous les mouvements d'id
+    inférieur ou égal à `dernier_mouvement` (pris par `snapshot_balances`).
+    """
+    projet = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+    )
+    solde = models.DecimalField(max_digits=12, decimal_places=2)
+    dernier_mouvement = models.BigIntegerField()
+    date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'ledger_balance_snapshots'
+        verbose_name = 'Instantané de solde'
+        verbose_name_plural = 'Instantanés de solde'
+        indexes = [
+            models.Index(fields=['projet', 'dernier_mouvement']),
+            models.Index(fields=['projet', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.projet_id} - {self.solde}€ ({self.date:%Y-%m-%d %H:%M})"
+
+
+def record(projet_id, type, montant, investissement_id=None):
+    return LedgerEntry.objects.create(
+        projet_id=projet_id, investissement_id=investissement_id, type=type, montant=montant,
+    )
+
+
+def balance(projet_id, at=None):
+    """
+    Solde d'un projet (à la date `at` si fournie) : dernier instantané
+    antérieur plus les mouvements suivants.
+    """
+    snapshots = BalanceSnapshot.objects.filter(projet_id=projet_id)
+    entries = LedgerEntry.objects.filter(projet_id=projet_id)
+    if at is not None:
+        snapshots = snapshots.filter(date__lte=at)
+        entries = entries.filter(date__lte=at)
+    snapshot = snapshots.order_by('-dernier_mouvement').values_list('solde', 'dernier_mouvement').first()
+    solde, dernier = snapshot or (Decimal('0.00'), 0)
+    tail = entries.filter(id__gt=dernier).aggregate(total=Sum('montant'))['total'] or Decimal('0.00')
+    return solde + tail
+
+
+def last_entry_id():
+    return LedgerEntry.objects.aggregate(last=Max('id'))['last'] or 0
@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from investments.models import Investment
+from projects.models import Project
+from .models import record
+
+
+@receiver(post_save, sender=Investment)
+def record_investment_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_statut_paiement_initial', None)
+    current = instance.statut_paiement
+    montant = Decimal(instance.montant)
+    if current == 'REUSSI' and previous != 'REUSSI':
+        record(instance.projet_id, 'SUCCES', montant, instance.pk)
+    elif previous == 'REUSSI' and current == 'ECHOUE':
+        record(instance.projet_id, 'ANNULATION', -montant, instance.pk)
+    elif previous == 'REUSSI' and current != 'REUSSI':
+        record(instance.projet_id, 'REMBOURSEMENT', -montant, instance.pk)
+    elif previous == current == 'REUSSI':
+        initial = getattr(instance, '_montant_initial', None)
+        if initial is not None and initial != montant:
+            record(instance.projet_id, 'AJUSTEMENT', montant - initial, instance.pk)
+
+
+@receiver(post_delete, sender=Investment)
+def record_investment_deleted(sender, instance, **kwargs):
+    if getattr(instance, '_statut_paiement_initial', instance.statut_paiement) == 'REUSSI':
+        record(instance.projet_id, 'REMBOURSEMENT', -Decimal(instance.montant), instance.pk)
+        projet_id = instance.projet_id
+        transaction.on_commit(lambda: _refresh_amount(projet_id))
+
+
+def _refresh_amount(projet_id):
+    # Le projet a pu être supprimé avec l'investissement (suppression en cascade)
+    project = Project.objects.filter(pk=projet_id).first()
+    if project is not None:
+        project.update_montant_actuel()
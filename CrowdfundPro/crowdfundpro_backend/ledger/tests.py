@@ -0,0 +1,141 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from investments.models import Investment
+from projects.models import Project
+from users.models import User
+from .models import BalanceSnapshot, LedgerEntry, balance
+
+
+@override_settings(LEDGER_SNAPSHOT_SETTLE_SECONDS=0)
+class BalanceTests(TestCase):
+    """
+    Solde d'un projet tiré du registre, avec et sans instantanés.
+    """
+
+    def setUp(self):
+        porteur = User.objects.create_user('porteur@example.com', 'secret', username='porteur', role='PORTEUR')
+        self.investisseur = User.objects.create_user('inv@example.com', 'secret', username='inv', role='INVESTISSEUR')
+        self.projet = Project.objects.create(
+            titre='Projet', description='d' * 60, objectif=Decimal('10000'), statut='EN_COURS',
+            date_limite=timezone.now() + timedelta(days=30), porteur=porteur,
+        )
+
+    def _invest(self, montant, statut='REUSSI'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Investment.objects.create(
+                investisseur=self.investisseur, projet=self.projet, montant=Decimal(montant),
+                statut_paiement=statut, methode_paiement='CARTE',
+            )
+
+    def _save(self, investment, **changes):
+        # Instance rechargée : statut et montant initiaux connus des signaux
+        investment = Investment.objects.get(pk=investment.pk)
+        for field, value in changes.items():
+            setattr(investment, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            investment.save()
+
+    def _direct_sum(self, at=None):
+        entries = LedgerEntry.objects.filter(projet=self.projet)
+        if at is not None:
+            entries = entries.filter(date__lte=at)
+        return entries.aggregate(total=Sum('montant'))['total'] or Decimal('0.00')
+
+    def _snapshot(self):
+        call_command('snapshot_balances', stdout=StringIO())
+
+    def _make_entries(self):
+        """Succès, remboursement, ajustement, annulation et suppression."""
+        self._invest(500)
+        rembourse = self._invest(200)
+        ajuste = self._invest(100)
+        annule = self._invest(80)
+        supprime = self._invest(40)
+        self._invest(60, statut='ECHOUE')
+        self._save(rembourse, statut_paiement='EN_ATTENTE')
+        self._save(ajuste, montant=Decimal('150'))
+        self._save(annule, statut_paiement='ECHOUE')
+        with self.captureOnCommitCallbacks(execute=True):
+            Investment.objects.get(pk=supprime.pk).delete()
+
+    def test_balance_applies_every_entry_type(self):
+        self._make_entries()
+
+        types = list(LedgerEntry.objects.filter(projet=self.projet).values_list('type', 'montant'))
+        self.assertEqual(types, [
+            ('SUCCES', Decimal('500.00')),
+            ('SUCCES', Decimal('200.00')),
+            ('SUCCES', Decimal('100.00')),
+            ('SUCCES', Decimal('80.00')),
+            ('SUCCES', Decimal('40.00')),
+            ('REMBOURSEMENT', Decimal('-200.00')),
+            ('AJUSTEMENT', Decimal('50.00')),
+            ('ANNULATION', Decimal('-80.00')),
+            ('REMBOURSEMENT', Decimal('-40.00')),
+        ])
+        self.assertEqual(balance(self.projet.pk), Decimal('650.00'))
+        self.assertEqual(balance(self.projet.pk), self._direct_sum())
+        self.projet.refresh_from_db()
+        self.assertEqual(self.projet.montant_actuel, Decimal('650.00'))
+
+    def test_snapshot_cut_keeps_balance(self):
+        self._invest(500)
+        rembourse = self._invest(200)
+        self._snapshot()
+        snapshot = BalanceSnapshot.objects.get(projet=self.projet)
+        self.assertEqual(snapshot.solde, Decimal('700.00'))
+        self.assertEqual(snapshot.dernier_mouvement, LedgerEntry.objects.latest('id').pk)
+
+        # Mouvements après l'instantané : ajoutés au solde de l'instantané
+        self._save(rembourse, statut_paiement='EN_ATTENTE')
+        self._invest(30)
+        self.assertEqual(balance(self.projet.pk), Decimal('530.00'))
+        self.assertEqual(balance(self.projet.pk), self._direct_sum())
+
+        # Second instantané : repart du précédent
+        self._snapshot()
+        latest = BalanceSnapshot.objects.filter(projet=self.projet).order_by('-dernier_mouvement').first()
+        self.assertEqual(latest.solde, Decimal('530.00'))
+        self.assertEqual(BalanceSnapshot.objects.filter(projet=self.projet).count(), 2)
+        self.assertEqual(balance(self.projet.pk), self._direct_sum())
+
+    def _backdate(self, after, debut, day):
+        """Un jour par mouvement d'id > `after`, à partir de `debut + day` ; retourne le jour suivant."""
+        ids = LedgerEntry.objects.filter(projet=self.projet, id__gt=after).order_by('id').values_list('id', flat=True)
+        for pk in list(ids):
+            LedgerEntry.objects.filter(pk=pk).update(date=debut + timedelta(days=day))
+            day += 1
+        return day
+
+    def test_balance_at_matches_direct_sum(self):
+        debut = timezone.now() - timedelta(days=10)
+        premier = self._invest(500)
+        second = self._invest(200)
+        self._save(premier, montant=Decimal('450'))
+        day = self._backdate(0, debut, 0)
+        # Instantané au milieu de l'historique : ignoré pour les dates antérieures
+        self._snapshot()
+        cut = BalanceSnapshot.objects.get(projet=self.projet).dernier_mouvement
+        BalanceSnapshot.objects.update(date=debut + timedelta(days=day - 1, hours=12))
+
+        self._save(second, statut_paiement='EN_ATTENTE')
+        troisieme = self._invest(80)
+        self._save(troisieme, statut_paiement='ECHOUE')
+        with self.captureOnCommitCallbacks(execute=True):
+            Investment.objects.get(pk=premier.pk).delete()
+        day = self._backdate(cut, debut, day)
+
+        for jour in range(-1, day + 1):
+            at = debut + timedelta(days=jour, hours=1)
+            with self.subTest(at=at):
+                self.assertEqual(balance(self.projet.pk, at=at), self._direct_sum(at=at))
+        self.assertEqual(balance(self.projet.pk, at=debut - timedelta(hours=1)), Decimal('0.00'))
+        self.assertEqual(balance(self.projet.pk, at=debut + timedelta(days=2, hours=1)), Decimal('650.00'))
+        self.assertEqual(balance(self.projet.pk), Decimal('0.00'))
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('projects/<int:pk>/', views.project_funding, name='ledger-project-funding'),
+]
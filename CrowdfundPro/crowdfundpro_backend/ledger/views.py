@@ -0,0 +1,62 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from projects.views import projets_visibles
+from .models import LedgerEntry, balance
+
+MAX_MOUVEMENTS = 100
+
+
+def _parse_instant(value):
+    """Date (fin de journée) ou date-heure ISO 8601 ; None si invalide."""
+    try:
+        jour = parse_date(value)
+        instant = datetime.combine(jour, time.max) if jour is not None else parse_datetime(value)
+    except ValueError:
+        return None
+    if instant is None:
+        return None
+    if timezone.is_naive(instant):
+        instant = timezone.make_aware(instant)
+    return instant
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def project_funding(request, pk):
+    """
+    Financement d'un projet d'après le registre, à la date `date` (ISO 8601)
+    si fournie. Le porteur du projet et les admins voient aussi les
+    derniers mouvements.
+    """
+    project = projets_visibles(request.user).filter(pk=pk).only('pk', 'porteur_id').first()
+    if project is None:
+        return Response({'error': 'Projet non trouvé'}, status=status.HTTP_404_NOT_FOUND)
+
+    at = None
+    if 'date' in request.query_params:
+        at = _parse_instant(request.query_params['date'])
+        if at is None:
+            return Response({'error': 'date invalide (format ISO 8601 attendu)'}, status=status.HTTP_400_BAD_REQUEST)
+
+    data = {'projet': project.pk, 'date': at or timezone.now(), 'solde': balance(project.pk, at)}
+    if request.user.is_superuser or project.porteur_id == request.user.pk:
+        mouvements = LedgerEntry.objects.filter(projet_id=project.pk)
+        if at is not None:
+            mouvements = mouvements.filter(date__lte=at)
+        data['mouvements'] = [
+            {
+                'id': entry.id,
+                'type': entry.type,
+                'montant': entry.montant,
+                'investissement': entry.investissement_id,
+                'date': entry.date,
+            }
+            for entry in mouvements.order_by('-id')[:MAX_MOUVEMENTS]
+        ]
+    return Response(data)
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoring'
+    verbose_name = 'Monitoring'
+
+    def ready(self):
+        from .instrumentation import instrument_serializers
+        from . import business
+        instrument_serializers()
+        business.connect()
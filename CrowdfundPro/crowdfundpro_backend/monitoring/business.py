@@ -0,0 +1,50 @@
+"""
+Métriques métier, sans COUNT au moment du scrape.
+
+Les compteurs d'investissements réussis sont incrémentés par signal dans le
+processus qui traite le paiement (des compteurs : Prometheus les somme entre
+processus). La jauge des projets par statut est un état global : elle est
+recalculée par un COUNT groupé dans une tâche planifiée
+(`refresh_business_metrics`), stockée dans `ProjectStatusCount`, et le scrape
+lit ces quelques lignes. Tous les processus exportent donc la même valeur,
+y compris après des modifications en masse (archivage, suppressions).
+"""
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_save
+
+from investments.models import Investment
+from projects.models import Project
+
+from .metrics import registry, projects_by_status, investments_succeeded, investments_succeeded_amount
+from .models import ProjectStatusCount
+
+
+def refresh_project_counts():
+    """Recalcule `ProjectStatusCount` (tâche planifiée)."""
+    counts = {code: 0 for code, _ in Project.STATUS_CHOICES}
+    for row in Project.objects.order_by().values('statut').annotate(total=Count('id')):
+        counts[row['statut']] = row['total']
+    with transaction.atomic():
+        for statut, total in counts.items():
+            ProjectStatusCount.objects.update_or_create(statut=statut, defaults={'total': total})
+    return counts
+
+
+def collect_project_gauge():
+    """Collecteur du scrape : lecture des nombres stockés (une requête, quelques lignes)."""
+    projects_by_status.replace_all({
+        (statut,): total for statut, total in ProjectStatusCount.objects.values_list('statut', 'total')
+    })
+
+
+def investment_saved(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_statut_paiement_initial', None)
+    if instance.statut_paiement == 'REUSSI' and previous != 'REUSSI':
+        investments_succeeded.inc()
+        investments_succeeded_amount.inc(float(instance.montant))
+
+
+def connect():
+    post_save.connect(investment_saved, sender=Investment, dispatch_uid='monitoring_investment_saved')
+    registry.add_collector(collect_project_gauge)
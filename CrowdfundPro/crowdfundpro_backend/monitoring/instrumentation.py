@@ -0,0 +1,74 @@
+"""
+Mesures par requête : requêtes SQL, temps base de données et temps de
+sérialisation, accumulés dans le contexte de la requête en cours.
+"""
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.serializers import BaseSerializer
+
+from .slow_queries import slow_query_log
+
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('request', 'queries', 'db_time', 'serializer_time', 'slow_threshold', '_in_serializer', '_explaining')
+
+    def __init__(self, request):
+        self.request = request
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        threshold_ms = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 0)
+        self.slow_threshold = threshold_ms / 1000 if threshold_ms else None
+        self._in_serializer = False
+        self._explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """`execute_wrapper` : compte et chronomètre chaque requête SQL."""
+        if self._explaining:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        self.db_time += duration
+        self.queries += 1
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            self._record_slow_query(context['connection'], sql, params, many, duration)
+        return result
+
+    def _record_slow_query(self, connection, sql, params, many, duration):
+        from .middleware import view_name_for
+        self._explaining = True
+        try:
+            slow_query_log.record(connection, sql, params, many, duration, view_name_for(self.request))
+        finally:
+            self._explaining = False
+
+
+def instrument_serializers():
+    """
+    Chronomètre `serializer.data` (sérialiseur de plus haut niveau uniquement :
+    les sérialiseurs imbriqués passent par `to_representation`).
+    """
+    original = BaseSerializer.data
+    if getattr(original.fget, 'instrumented', False):
+        return
+
+    def data(self):
+        metrics = current_metrics.get()
+        if metrics is None or metrics._in_serializer:
+            return original.fget(self)
+        metrics._in_serializer = True
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics._in_serializer = False
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from monitoring.business import refresh_project_counts
+
+
+class Command(BaseCommand):
+    help = "Recalcule les métriques métier partagées (nombre de projets par statut)"
+
+    def handle(self, *args, **options):
+        counts = refresh_project_counts()
+        self.stdout.write(self.style.SUCCESS(f'{sum(counts.values())} projet(s) comptés'))
@@ -0,0 +1,203 @@
+"""
+Métriques au format d'exposition texte Prometheus.
+
+Registre minimal (compteurs, jauges, histogrammes) alimenté de façon
+incrémentale par le code applicatif ; le rendu ne fait aucune requête SQL.
+Les valeurs sont propres à chaque processus : avec plusieurs workers, chaque
+worker doit être scrapé (ou un seul worker par conteneur).
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames, labelvalues, extra=()):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self):
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self.header()
+        for key, value in values:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def replace_all(self, values):
+        """Remplace toutes les séries : `values` associe des tuples de labels à une valeur."""
+        with self._lock:
+            self._values = {tuple(str(v) for v in key): value for key, value in values.items()}
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += 1
+            state[2] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        with self._lock:
+            values = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        lines = self.header()
+        for key, (bucket_counts, count, total) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key, [('le', '+Inf')])
+            lines.append(f'{self.name}_bucket{labels} {count}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_count{labels} {count}')
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        return lines
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """`collector()` est appelé avant chaque rendu (mise à jour de jauges bon marché)."""
+        self._collectors.append(collector)
+
+    def render(self):
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    'crowdfundpro_http_request_duration_seconds',
+    'Durée des requêtes HTTP par vue.',
+    ('view', 'method'),
+))
+http_requests = registry.register(Counter(
+    'crowdfundpro_http_requests_total',
+    'Requêtes HTTP par vue et code de statut.',
+    ('view', 'method', 'status'),
+))
+db_queries = registry.register(Counter(
+    'crowdfundpro_db_queries_total',
+    'Requêtes SQL exécutées, par vue.',
+    ('view',),
+))
+db_query_duration = registry.register(Counter(
+    'crowdfundpro_db_query_seconds_total',
+    'Temps passé dans les requêtes SQL, par vue.',
+    ('view',),
+))
+cache_requests = registry.register(Counter(
+    'crowdfundpro_cache_requests_total',
+    'Consultations des caches applicatifs (hit / miss).',
+    ('cache', 'result'),
+))
+stripe_request_duration = registry.register(Histogram(
+    'crowdfundpro_stripe_request_duration_seconds',
+    'Latence des appels à l\'API Stripe.',
+    ('operation',),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
+))
+projects_by_status = registry.register(Gauge(
+    'crowdfundpro_projects',
+    'Nombre de projets par statut.',
+    ('statut',),
+))
+investments_succeeded = registry.register(Counter(
+    'crowdfundpro_investments_succeeded_total',
+    'Investissements passés au statut REUSSI (utiliser rate() pour un débit par minute).',
+))
+investments_succeeded_amount = registry.register(Counter(
+    'crowdfundpro_investments_succeeded_amount_total',
+    'Montant cumulé des investissements réussis.',
+))
@@ -0,0 +1,69 @@
+"""
+Middleware d'instrumentation des performances par requête.
+"""
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics as prometheus
+from .instrumentation import RequestMetrics, current_metrics
+from .stats import performance_registry
+
+logger = logging.getLogger(__name__)
+
+
+def view_name_for(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<non résolue>'
+    return match.view_name
+
+
+class PerformanceMiddleware:
+    """
+    Mesure pour chaque requête le temps total, le nombre et la durée des
+    requêtes SQL, le temps de sérialisation et la taille de la réponse, par
+    nom de vue (`project-list`, `investment-dashboard`, ...).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_warning = getattr(settings, 'PERFORMANCE_QUERY_WARNING', 50)
+
+    def __call__(self, request):
+        metrics = RequestMetrics(request)
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        wall_time = time.perf_counter() - start
+
+        if response.streaming:
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+
+        view_name = view_name_for(request)
+        performance_registry.record(
+            view_name,
+            wall_ms=wall_time * 1000,
+            queries=metrics.queries,
+            db_ms=metrics.db_time * 1000,
+            serializer_ms=metrics.serializer_time * 1000,
+            response_bytes=size,
+        )
+        prometheus.http_request_duration.observe(wall_time, view=view_name, method=request.method)
+        prometheus.http_requests.inc(view=view_name, method=request.method, status=response.status_code)
+        prometheus.db_queries.inc(metrics.queries, view=view_name)
+        prometheus.db_query_duration.inc(metrics.db_time, view=view_name)
+        if metrics.queries > self.query_warning:
+            logger.warning("%s : %d requêtes SQL pour %s", view_name, metrics.queries, request.path)
+        return response
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStatusCount',
+            fields=[
+                ('statut', models.CharField(max_length=25, primary_key=True, serialize=False)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('date_maj', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Nombre de projets par statut',
+                'verbose_name_plural': 'Nombres de projets par statut',
+                'db_table': 'monitoring_project_status_counts',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='refresh_business_metrics',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'refresh_business_metrics'",
+            'schedule_type': 'I',
+            'minutes': 1,
+        },
+    )
+    # Valeurs initiales, sans attendre la première exécution
+    Project = apps.get_model('projects', 'Project')
+    ProjectStatusCount = apps.get_model('monitoring', 'ProjectStatusCount')
+    for row in Project.objects.order_by().values('statut').annotate(total=Count('id')):
+        ProjectStatusCount.objects.update_or_create(statut=row['statut'], defaults={'total': row['total']})
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='refresh_business_metrics').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+        ('projects', '0013_resume_project_deletions_schedule'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
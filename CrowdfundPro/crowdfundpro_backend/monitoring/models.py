@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class ProjectStatusCount(models.Model):
+    """
+    Nombre de projets par statut, recalculé par `refresh_business_metrics`
+    (planifiée chaque minute) : une seule valeur pour tous les processus,
+    lue par le scrape `/metrics` sans COUNT.
+    """
+    statut = models.CharField(max_length=25, primary_key=True)
+    total = models.PositiveIntegerField(default=0)
+    date_maj = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'monitoring_project_status_counts'
+        verbose_name = 'Nombre de projets par statut'
+        verbose_name_plural = 'Nombres de projets par statut'
+
+    def __str__(self):
+        return f"{self.statut} : {self.total}"
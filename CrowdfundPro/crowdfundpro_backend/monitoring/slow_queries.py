@@ -0,0 +1,69 @@
+"""
+Journal des requêtes SQL lentes, avec plan d'exécution.
+
+Activé par `SLOW_QUERY_THRESHOLD_MS` (0 : désactivé). Les requêtes plus lentes
+que le seuil sont conservées dans un tampon circulaire borné avec la vue
+appelante, la forme des paramètres (types, pas les valeurs) et la sortie de
+`EXPLAIN QUERY PLAN` (SQLite) / `EXPLAIN` (PostgreSQL).
+"""
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+
+def params_shape(params, many):
+    if params is None:
+        return None
+    if many:
+        params = list(params)
+        return {'executions': len(params), 'params': params_shape(params[0], False) if params else []}
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+
+class SlowQueryLog:
+
+    def __init__(self, size):
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, connection, sql, params, many, duration, view_name):
+        plan = None
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            plan = self.explain(connection, sql, params)
+        entry = {
+            'time': timezone.now().isoformat(),
+            'view': view_name,
+            'database': connection.alias,
+            'duration_ms': round(duration * 1000, 3),
+            'sql': sql,
+            'params_shape': params_shape(params, many),
+            'plan': plan,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    @staticmethod
+    def explain(connection, sql, params):
+        prefix = connection.ops.explain_query_prefix()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'{prefix} {sql}', params)
+                return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+        except DatabaseError as exc:
+            return [f'EXPLAIN impossible : {exc}']
+
+    def entries(self):
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(getattr(settings, 'SLOW_QUERY_LOG_SIZE', 200))
@@ -0,0 +1,68 @@
+"""
+Statistiques glissantes par vue, gardées en mémoire (par processus).
+"""
+import threading
+from collections import deque
+
+from django.conf import settings
+
+METRIC_NAMES = ('wall_ms', 'queries', 'db_ms', 'serializer_ms', 'response_bytes')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ViewStats:
+    """
+    Fenêtre des `sample_size` dernières requêtes d'une vue.
+    """
+
+    def __init__(self, sample_size):
+        self.samples = deque(maxlen=sample_size)
+        self.count = 0
+
+    @staticmethod
+    def summarize(samples, count):
+        columns = list(zip(*samples)) if samples else [()] * len(METRIC_NAMES)
+        summary = {'count': count, 'window': len(samples)}
+        for name, values in zip(METRIC_NAMES, columns):
+            ordered = sorted(values)
+            summary[name] = {
+                'p50': round(percentile(ordered, 0.50), 3),
+                'p95': round(percentile(ordered, 0.95), 3),
+                'p99': round(percentile(ordered, 0.99), 3),
+                'max': round(ordered[-1], 3) if ordered else 0,
+            }
+        return summary
+
+
+class PerformanceRegistry:
+
+    def __init__(self, sample_size=1024):
+        self.sample_size = sample_size
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, wall_ms, queries, db_ms, serializer_ms, response_bytes):
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = ViewStats(self.sample_size)
+            stats.samples.append((wall_ms, queries, db_ms, serializer_ms, response_bytes))
+            stats.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            views = [(name, list(stats.samples), stats.count) for name, stats in self._views.items()]
+        return {name: ViewStats.summarize(samples, count) for name, samples, count in sorted(views)}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+performance_registry = PerformanceRegistry(getattr(settings, 'PERFORMANCE_SAMPLE_SIZE', 1024))
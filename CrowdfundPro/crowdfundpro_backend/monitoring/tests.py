@@ -0,0 +1,40 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from projects.models import Project
+from users.models import User
+
+
+@override_settings(DEBUG=True, METRICS_TOKEN='')
+class ProjectGaugeTests(TestCase):
+    """
+    Jauge des projets par statut : valeur partagée, recalculée par la tâche planifiée.
+    """
+
+    def _gauge(self):
+        content = self.client.get('/metrics').content.decode()
+        return {
+            line.split('"')[1]: float(line.rsplit(' ', 1)[1])
+            for line in content.splitlines() if line.startswith('crowdfundpro_projects{')
+        }
+
+    def test_scrape_sans_count(self):
+        porteur = User.objects.create_user('p@example.com', 'secret', username='porteur', role='PORTEUR')
+        for statut in ('EN_COURS', 'EN_COURS', 'FINANCE'):
+            Project.objects.create(
+                titre='Projet', description='d' * 60, objectif=Decimal('100'), statut=statut,
+                date_limite=timezone.now() + timedelta(days=30), porteur=porteur,
+            )
+        # Modification en masse (sans signaux), comme l'archivage
+        Project.objects.filter(statut='FINANCE').update(statut='ECHOUE')
+        call_command('refresh_business_metrics', stdout=StringIO())
+        self.client.get('/metrics')  # premier scrape du processus (filtres de révocation)
+
+        with self.assertNumQueries(1):
+            gauge = self._gauge()
+        self.assertEqual(gauge, {'EN_ATTENTE_VALIDATION': 0, 'EN_COURS': 2, 'FINANCE': 0, 'ECHOUE': 1})
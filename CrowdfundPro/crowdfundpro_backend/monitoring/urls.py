@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('performance/', views.performance_stats, name='monitoring-performance'),
+    path('slow-queries/', views.slow_queries, name='monitoring-slow-queries'),
+]
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .metrics import registry
+from .slow_queries import slow_query_log
+from .stats import performance_registry
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def performance_stats(request):
+    """
+    Percentiles glissants par vue (admin seulement). DELETE remet à zéro.
+    """
+    if not request.user.is_superuser:
+        return Response(
+            {'error': 'Permission non accordée'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    if request.method == 'DELETE':
+        performance_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    return Response({'views': performance_registry.snapshot()})
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def slow_queries(request):
+    """
+    Dernières requêtes SQL lentes avec leur plan (admin seulement). DELETE vide le journal.
+    """
+    if not request.user.is_superuser:
+        return Response(
+            {'error': 'Permission non accordée'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    if request.method == 'DELETE':
+        slow_query_log.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    return Response({
+        'threshold_ms': getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 0),
+        'queries': slow_query_log.entries(),
+    })
+
+
+def metrics(request):
+    """
+    Endpoint Prometheus. Protégé par `METRICS_TOKEN` (en-tête
+    `Authorization: Bearer <jeton>`) ; sans jeton configuré, accessible
+    seulement en DEBUG.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        if not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'):
+            return HttpResponse(status=403)
+    elif not settings.DEBUG:
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Project
+from .deletion import schedule_project_deletion
+from .models import Project, ProjectDeletion
 
 
 @admin.register(Project)
@@ -42,4 +43,28 @@ class ProjectAdmin(admin.ModelAdmin):
     
     def a_localisation(self, obj):
         return "Oui" if obj.a_localisation else "Non"
-    a_localisation.short_description = "A une localisation" 
\ No newline at end of file
+    a_localisation.short_description = "A une localisation"
+    
+    def delete_model(self, request, obj):
+        # Investissements et fichiers supprimés en tâche de fond
+        schedule_project_deletion(obj, demandee_par=request.user)
+    
+    def delete_queryset(self, request, queryset):
+        for project in queryset:
+            schedule_project_deletion(project, demandee_par=request.user)
+    
+    def get_deleted_objects(self, objs, request):
+        # Données supprimées en tâche de fond : pas de parcours des objets liés (Collector)
+        objs = list(objs)
+        return [str(obj) for obj in objs], {self.model._meta.verbose_name_plural: len(objs)}, set(), []
+
+
+@admin.register(ProjectDeletion)
+class ProjectDeletionAdmin(admin.ModelAdmin):
+    """
+    Administration pour les suppressions de projets en tâche de fond
+    """
+    list_display = ('titre', 'projet_id', 'statut', 'date_demande', 'date_fin')
+    list_filter = ('statut',)
+    search_fields = ('titre',)
+    readonly_fields = ('projet_id', 'titre', 'demandee_par', 'compteurs', 'erreur', 'date_demande', 'date_fin') 
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Requêtes conditionnelles (ETag / Last-Modified) pour les ressources projet.
+
+Les validateurs sont dérivés de marqueurs de version peu coûteux
+(`date_modification` par projet, agrégat Max/Count pour les listes), calculés
+en une seule requête sans sérialiser les projets. Une réponse 304 est donc
+renvoyée avant qu'aucun sérialiseur ne soit exécuté.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from monitoring.metrics import cache_requests
+
+
+def _heure_courante():
+    """
+    Début de l'heure courante.
+
+    `jours_restants` et `est_expire` évoluent avec le temps sans que le projet
+    soit modifié : les validateurs sont donc renouvelés au moins une fois par heure.
+    """
+    return timezone.now().replace(minute=0, second=0, microsecond=0)
+
+
+def _etag(*parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+class ConditionalGetMixin:
+    """
+    Ajoute la gestion de If-None-Match / If-Modified-Since aux vues GET.
+
+    Les vues fournissent `get_version_marker()` qui retourne un tuple
+    (marqueur, date de dernière modification) ou None si la ressource
+    n'existe pas (la vue gère alors elle-même le 404).
+    """
+
+    def get_version_marker(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        version = self.get_version_marker()
+        if version is None:
+            return super().get(request, *args, **kwargs)
+
+        marker, derniere_modification = version
+        heure = _heure_courante()
+        if derniere_modification is None or derniere_modification < heure:
+            derniere_modification = heure
+
+        etag = _etag(marker, heure.isoformat(), request.get_full_path())
+        last_modified = int(derniere_modification.timestamp())
+
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            cache_requests.inc(cache='http_conditional', result='hit')
+            response = not_modified
+        else:
+            cache_requests.inc(cache='http_conditional', result='miss')
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+
+        # Les clients revalident à chaque fois, mais ne retéléchargent que si besoin
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+def list_version(request, queryset):
+    """
+    Marqueur de version d'une liste de projets visibles par l'utilisateur.
+
+    Count détecte les suppressions, Max(date_modification) les créations et
+    modifications. L'identifiant de l'utilisateur est inclus car la visibilité
+    dépend du rôle (projets en attente d'un porteur).
+    """
+    version = queryset.order_by().aggregate(
+        derniere=Max('date_modification'),
+        total=Count('id'),
+    )
+    derniere = version['derniere']
+    marker = (
+        'list',
+        request.user.pk,
+        version['total'],
+        derniere.isoformat() if derniere else '',
+    )
+    return marker, derniere
+
+
+def detail_version(queryset, pk):
+    """
+    Marqueur de version d'un projet, ou None s'il n'est pas visible.
+    """
+    derniere = queryset.filter(pk=pk).values_list('date_modification', flat=True).first()
+    if derniere is None:
+        return None
+    return ('detail', pk, derniere.isoformat()), derniere
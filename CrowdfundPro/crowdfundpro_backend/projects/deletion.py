@@ -0,0 +1,82 @@
+"""
+Suppression des projets en tâche de fond.
+
+`schedule_project_deletion` enregistre une `ProjectDeletion` : l'appel est
+immédiat. La tâche `run` supprime ensuite les investissements du projet par
+lots, puis le projet, comme la suppression des comptes (`users.deletion`,
+dont elle reprend les étapes) : DELETE direct sans Collector ni signaux,
+flux de modifications, références aux blobs et variantes d'images traités
+en masse. Le registre des financements du projet est conservé tel quel.
+
+Jusqu'à l'exécution de la tâche, le projet reste visible. Une tâche
+interrompue (ou jamais mise en file) est reprise par `resume_project_deletions`.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from users.deletion import PENDING_STATUTS, delete_project_investments, delete_projects, enqueue as enqueue_task
+from .models import Project, ProjectDeletion
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(deletion_id):
+    enqueue_task(deletion_id, 'projects.deletion.run')
+
+
+def schedule_project_deletion(project, demandee_par=None):
+    """Planifie la suppression de `project` ; retourne la demande."""
+    with transaction.atomic():
+        deletion = ProjectDeletion.objects.filter(projet_id=project.pk, statut__in=PENDING_STATUTS).first()
+        if deletion is not None:
+            return deletion
+        deletion = ProjectDeletion.objects.create(projet_id=project.pk, titre=project.titre, demandee_par=demandee_par)
+        transaction.on_commit(lambda: enqueue(deletion.pk))
+    return deletion
+
+
+STEPS = (
+    ('investissements', delete_project_investments),
+    ('projets', delete_projects),
+)
+
+
+def _chunk(deletion_id, step, chunk_size):
+    """Un lot d'une étape, sous verrou de la demande ; retourne le nombre de lignes supprimées."""
+    with transaction.atomic():
+        deletion = ProjectDeletion.objects.select_for_update().get(pk=deletion_id)
+        name, delete = step
+        count = delete(Project.objects.filter(pk=deletion.projet_id), chunk_size)
+        if count:
+            deletion.compteurs[name] = deletion.compteurs.get(name, 0) + count
+            deletion.save(update_fields=['compteurs', 'date_maj'])
+    return count
+
+
+def run(deletion_id):
+    """Tâche de suppression : reprend là où la précédente s'est arrêtée."""
+    deletion = ProjectDeletion.objects.filter(pk=deletion_id, statut__in=PENDING_STATUTS).first()
+    if deletion is None:
+        return
+    ProjectDeletion.objects.filter(pk=deletion_id).update(statut='EN_COURS', erreur='', date_maj=timezone.now())
+    deadline = time.monotonic() + getattr(settings, 'USER_DELETION_TIME_BUDGET', 45)
+    chunk_size = getattr(settings, 'USER_DELETION_CHUNK_SIZE', 2000)
+
+    try:
+        for step in STEPS:
+            while _chunk(deletion_id, step, chunk_size):
+                if time.monotonic() > deadline:
+                    enqueue(deletion_id)
+                    return
+    except Exception as exc:
+        logger.exception('Échec de la suppression du projet %s', deletion.projet_id)
+        ProjectDeletion.objects.filter(pk=deletion_id).update(statut='ECHEC', erreur=str(exc), date_maj=timezone.now())
+        raise
+
+    ProjectDeletion.objects.filter(pk=deletion_id).update(
+        statut='TERMINE', date_fin=timezone.now(), date_maj=timezone.now()
+    )
@@ -0,0 +1,119 @@
+"""
+Service des documents de projet (business plan, plan juridique).
+
+Les droits sont vérifiés par Django ; le transfert des octets est ensuite
+délégué au serveur frontal selon `PROTECTED_MEDIA_SERVER` :
+
+- 'nginx' : en-tête X-Accel-Redirect vers `PROTECTED_MEDIA_INTERNAL_URL`
+  (location `internal` pointant sur MEDIA_ROOT) ;
+- 'apache' : en-tête X-Sendfile avec le chemin du fichier (mod_xsendfile) ;
+- sinon : `FileResponse` (sendfile via `wsgi.file_wrapper` pour un fichier
+  complet), avec prise en charge d'une plage `Range: bytes=...`.
+
+Dans tous les cas, un `If-None-Match` correspondant à l'ETag reçoit un 304.
+"""
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """Fichier limité à `length` octets à partir de `start`."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    (début, fin incluse) pour un en-tête Range à plage unique, None si l'en-tête
+    est absent ou non géré (le fichier est alors servi en entier), ou
+    'unsatisfiable'.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    start, end = match.groups()
+    if start == '':
+        if end == '' or int(end) == 0:
+            return 'unsatisfiable'
+        return max(0, size - int(end)), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return 'unsatisfiable'
+    return start, end
+
+
+def _etag(fieldfile):
+    # Les blobs sont nommés par leur empreinte : le nom suffit comme validateur
+    return quote_etag(os.path.splitext(os.path.basename(fieldfile.name))[0])
+
+
+def _content_disposition(filename):
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
+
+
+def serve_document(request, fieldfile, filename):
+    server = getattr(settings, 'PROTECTED_MEDIA_SERVER', '')
+    etag = _etag(fieldfile)
+
+    # Contenu immuable pour un ETag donné : 304 sans toucher au fichier
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+
+    if server in ('nginx', 'apache'):
+        response = HttpResponse()
+        if server == 'nginx':
+            response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_INTERNAL_URL + quote(fieldfile.name)
+        else:
+            response['X-Sendfile'] = fieldfile.path
+        # Le serveur frontal gère Range et Content-Length ; le type vient de l'extension
+        del response['Content-Type']
+        response['Content-Disposition'] = _content_disposition(filename)
+        response['ETag'] = etag
+        return response
+
+    size = fieldfile.size
+    requested = parse_range(request.headers.get('Range'), size)
+    if requested is not None and request.headers.get('If-Range', etag) != etag:
+        requested = None  # Le document a changé depuis le premier morceau
+    if requested == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    source = fieldfile.open('rb')
+    if requested is None:
+        response = FileResponse(source, as_attachment=True, filename=filename)
+    else:
+        start, end = requested
+        response = FileResponse(RangeFile(source, start, end - start + 1), as_attachment=True, filename=filename, status=206)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,137 @@
+"""
+Prévision de l'atteinte de l'objectif des projets en cours.
+
+Toutes les campagnes sont traitées en une passe vectorisée : les montants
+réussis des `FORECAST_WINDOW_DAYS` derniers jours sont agrégés par projet et
+par jour (une requête groupée) dans une matrice projets × jours. Pour chaque
+projet, le débit journalier et sa variance sont estimés par moyenne pondérée
+à décroissance exponentielle (les jours récents comptent davantage) sur les
+jours où la campagne existait.
+
+Le montant restant à collecter d'ici `date_limite` est modélisé par une loi
+normale de moyenne `débit × jours restants` et de variance
+`variance × jours restants` : on en déduit la probabilité d'atteindre
+l'objectif et la date prévue au débit estimé.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from scipy.special import ndtr
+
+from investments.models import Investment
+from .models import Project
+
+DAY_SECONDS = 86400.0
+# Écart-type journalier minimal (en fraction de l'objectif) : évite une
+# certitude artificielle pour les séries trop régulières ou trop courtes
+MIN_DAILY_STD = 0.01
+
+
+def load_campaigns(now):
+    """Tableaux des projets en cours : ids, objectifs, montants, âges et jours restants (en jours)."""
+    rows = list(Project.objects.filter(statut='EN_COURS').order_by('id').values_list(
+        'id', 'objectif', 'montant_actuel', 'date_creation', 'date_limite'
+    ))
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    objectifs = np.array([float(row[1]) for row in rows])
+    montants = np.array([float(row[2]) for row in rows])
+    ages = np.array([(now - row[3]).total_seconds() / DAY_SECONDS for row in rows])
+    restants = np.array([(row[4] - now).total_seconds() / DAY_SECONDS for row in rows])
+    return ids, objectifs, montants, ages, restants
+
+
+def daily_amounts(ids, now, window):
+    """Matrice (projets × jours) des montants réussis ; colonne 0 = aujourd'hui."""
+    matrix = np.zeros((len(ids), window))
+    if not len(ids):
+        return matrix
+    today = timezone.localdate(now)
+    rows = (
+        Investment.objects.filter(
+            statut_paiement='REUSSI',
+            projet__statut='EN_COURS',
+            date_investissement__gte=now - timedelta(days=window),
+        )
+        .annotate(jour=TruncDate('date_investissement'))
+        .order_by()
+        .values_list('projet_id', 'jour')
+        .annotate(total=Sum('montant'))
+    )
+    projets, jours, totaux = [], [], []
+    for projet_id, jour, total in rows.iterator(chunk_size=10000):
+        projets.append(projet_id)
+        jours.append((today - jour).days)
+        totaux.append(float(total))
+    projets, jours, totaux = np.array(projets, dtype=np.int64), np.array(jours, dtype=np.int64), np.array(totaux)
+    lignes = np.searchsorted(ids, projets)
+    valides = (jours >= 0) & (jours < window) & (lignes < len(ids))
+    valides[valides] &= ids[lignes[valides]] == projets[valides]
+    np.add.at(matrix, (lignes[valides], jours[valides]), totaux[valides])
+    return matrix
+
+
+def forecast(objectifs, montants, ages, restants, matrix, half_life):
+    """
+    Probabilité d'atteindre l'objectif avant la date limite et nombre de jours
+    prévus avant de l'atteindre (inf si le débit estimé est nul).
+    """
+    window = matrix.shape[1]
+    jours = np.arange(window)
+    # Jours où la campagne existait (au moins le jour courant)
+    observes = jours[None, :] < np.maximum(np.ceil(ages), 1)[:, None]
+    poids = np.where(observes, 0.5 ** (jours / half_life)[None, :], 0.0)
+    total_poids = poids.sum(axis=1)
+
+    debit = (poids * matrix).sum(axis=1) / total_poids
+    variance = (poids * (matrix - debit[:, None]) ** 2).sum(axis=1) / total_poids
+    ecart_type = np.maximum(np.sqrt(variance), MIN_DAILY_STD * objectifs)
+
+    reste = np.maximum(objectifs - montants, 0.0)
+    horizon = np.maximum(restants, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (reste - debit * horizon) / (ecart_type * np.sqrt(horizon))
+        probabilite = np.where(horizon > 0, 1 - ndtr(z), 0.0)
+        jours_prevus = np.where(debit > 0, reste / debit, np.inf)
+    atteint = reste <= 0
+    probabilite = np.where(atteint, 1.0, probabilite)
+    jours_prevus = np.where(atteint, 0.0, jours_prevus)
+    return np.clip(probabilite, 0.0, 1.0), jours_prevus
+
+
+def update_forecasts(window=30, half_life=7.0, batch_size=1000):
+    """Calcule et enregistre les prévisions de tous les projets en cours ; retourne leur nombre."""
+    now = timezone.now()
+    ids, objectifs, montants, ages, restants = load_campaigns(now)
+    probabilites, jours_prevus = forecast(objectifs, montants, ages, restants, daily_amounts(ids, now, window), half_life)
+
+    # Au-delà de dix ans, la date prévue n'a plus de sens
+    dates = [
+        now + timedelta(days=float(jours)) if np.isfinite(jours) and jours < 3650 else None
+        for jours in jours_prevus
+    ]
+    # UPDATE paramétré exécuté en lot : bulk_update construirait un CASE par
+    # champ et par projet, bien plus coûteux à compiler qu'à exécuter
+    adapt = connection.ops.adapt_datetimefield_value
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} = %s, {} = %s, {} = %s, {} = %s WHERE {} = %s'.format(
+        quote(Project._meta.db_table),
+        *(quote(Project._meta.get_field(name).column) for name in (
+            'date_completion_prevue', 'probabilite_financement', 'date_prevision', 'date_modification', 'id',
+        )),
+    )
+    params = [
+        (adapt(date), round(float(probabilite), 4), adapt(now), adapt(now), int(pk))
+        for pk, date, probabilite in zip(ids, dates, probabilites)
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(params), batch_size):
+            cursor.executemany(sql, params[start:start + batch_size])
+    # Les projets qui ne sont plus en cours ne gardent pas de prévision
+    Project.objects.exclude(statut='EN_COURS').exclude(date_prevision=None).update(
+        date_completion_prevue=None, probabilite_financement=None, date_prevision=None, date_modification=now,
+    )
+    return len(params)
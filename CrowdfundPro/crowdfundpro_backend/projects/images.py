@@ -0,0 +1,135 @@
+"""
+Variantes redimensionnées des images de projet.
+
+À chaque nouvelle image, une tâche django-q génère les variantes de `VARIANTS`
+en JPEG et en WebP. Les chemins sont enregistrés dans `Project.image_variants`
+avec le nom de l'image source : des variantes d'une image remplacée entre-temps
+ne sont jamais exposées. Si la tâche ne peut pas être mise en file (broker
+indisponible), le projet reste enregistré : la commande planifiée
+`generate_image_variants` reprend les projets dont les variantes ne
+correspondent pas à l'image. Les fichiers des variantes sont supprimés avec
+le projet (voir `signals`).
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# nom -> (largeur, hauteur, recadrage au format exact)
+VARIANTS = {
+    'thumbnail': (160, 120, True),
+    'card': (480, 320, True),
+    'hero': (1600, 900, False),
+}
+
+FORMATS = {
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+}
+
+VARIANTS_DIR = 'projects/variants'
+
+
+def _enqueue_variants(project_id, source):
+    from django_q.tasks import async_task
+
+    try:
+        async_task('projects.images.generate_variants', project_id, source)
+    except Exception:
+        # Le projet est déjà validé : generate_image_variants rattrapera les variantes
+        logger.exception("Impossible de planifier les variantes de l'image %s", source)
+
+
+def schedule_variants(project):
+    """Planifie la génération des variantes après la validation de la transaction."""
+    from django.db import transaction
+
+    project_id, source = project.pk, project.image.name
+    transaction.on_commit(lambda: _enqueue_variants(project_id, source))
+
+
+def _render(source, width, height, crop):
+    if crop:
+        return ImageOps.fit(source, (width, height), Image.LANCZOS)
+    image = source.copy()
+    image.thumbnail((width, height), Image.LANCZOS)
+    return image
+
+
+def build_variants(image_file, basename):
+    """
+    Génère et enregistre les variantes ; retourne le dictionnaire stocké
+    dans `image_variants` (sans la clé `source`).
+    """
+    with Image.open(image_file) as source:
+        # Décodage JPEG directement à l'échelle réduite (pas de décodage pleine taille)
+        source.draft('RGB', (max(v[0] for v in VARIANTS.values()), max(v[1] for v in VARIANTS.values())))
+        source = ImageOps.exif_transpose(source).convert('RGB')
+
+        variants = {}
+        for name, (width, height, crop) in VARIANTS.items():
+            image = _render(source, width, height, crop)
+            entry = {'width': image.width, 'height': image.height}
+            for extension, (fmt, options) in FORMATS.items():
+                buffer = BytesIO()
+                image.save(buffer, fmt, **options)
+                path = default_storage.save(
+                    f'{VARIANTS_DIR}/{basename}-{name}.{extension}', ContentFile(buffer.getvalue())
+                )
+                entry[extension] = path
+            variants[name] = entry
+    return variants
+
+
+def _paths(variants):
+    return {
+        value
+        for entry in variants.values() if isinstance(entry, dict)
+        for key, value in entry.items() if key in FORMATS
+    }
+
+
+def delete_variants(variants):
+    """Supprime les fichiers des variantes décrites par `variants` (valeur de `image_variants`)."""
+    for path in _paths(variants or {}):
+        default_storage.delete(path)
+
+
+def generate_variants(project_id, source):
+    """
+    Tâche django-q : génère les variantes de l'image `source` du projet.
+    """
+    from .models import Project
+
+    project = Project.objects.filter(pk=project_id, image=source).only('image', 'image_variants', 'porteur').first()
+    if project is None:
+        # Projet supprimé ou image déjà remplacée : une autre tâche s'en charge
+        return
+
+    basename = f'{project_id}-{os.path.splitext(os.path.basename(source))[0]}'
+    try:
+        with project.image.open('rb') as image_file:
+            variants = build_variants(image_file, basename)
+    except (OSError, Image.DecompressionBombError):
+        logger.exception("Impossible de générer les variantes de l'image %s", source)
+        return
+
+    previous = project.image_variants or {}
+    updated = Project.objects.filter(pk=project_id, image=source).update(
+        image_variants={'source': source, **variants},
+        # Les réponses sérialisées changent : invalide les ETags
+        date_modification=timezone.now(),
+    )
+    if updated:
+        from changefeed.models import record_project_change
+        record_project_change(project_id, project.porteur_id)
+    # Supprime les variantes devenues inutiles (ou celles-ci si l'image a changé entre-temps)
+    obsolete = _paths(previous) - _paths(variants) if updated else _paths(variants)
+    for path in obsolete:
+        default_storage.delete(path)
@@ -0,0 +1,22 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from projects.forecasting import update_forecasts
+
+
+class Command(BaseCommand):
+    help = "Prévoit, pour chaque projet en cours, la date et la probabilité d'atteinte de l'objectif"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=getattr(settings, 'FORECAST_WINDOW_DAYS', 30))
+        parser.add_argument('--half-life', type=float, default=getattr(settings, 'FORECAST_HALF_LIFE_DAYS', 7))
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        debut = time.perf_counter()
+        total = update_forecasts(options['window'], options['half_life'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Prévisions mises à jour pour {total} projet(s) en {time.perf_counter() - debut:.1f}s'
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.db.models.fields.json import KeyTextTransform
+
+from projects.images import generate_variants
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Génère les variantes manquantes (ou obsolètes) des images de projet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Régénère aussi les variantes à jour')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.exclude(image='').exclude(image__isnull=True).only('image', 'image_variants')
+        if not options['force']:
+            # Variantes absentes ou d'une autre image (tâche jamais mise en file, par exemple)
+            projects = projects.annotate(source=KeyTextTransform('source', 'image_variants')).filter(
+                Q(source__isnull=True) | ~Q(source=F('image'))
+            )
+        total = 0
+        for project in projects.iterator(chunk_size=500):
+            generate_variants(project.pk, project.image.name)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f'Variantes générées pour {total} projet(s)'))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_alter_project_latitude_alter_project_longitude'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='date_modification',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_date_modification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text="Variantes redimensionnées de l'image (générées en tâche de fond)"),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:27
+
+from django.db import migrations, models
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='business_plan',
+            field=models.FileField(blank=True, help_text='Business plan du projet', null=True, storage=uploads.storage.content_storage, upload_to='projects/documents/'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=uploads.storage.content_storage, upload_to='projects/'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='plan_juridique',
+            field=models.FileField(blank=True, help_text='Plan juridique et réglementaire du projet', null=True, storage=uploads.storage.content_storage, upload_to='projects/documents/'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_project_content_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='date_completion_prevue',
+            field=models.DateTimeField(blank=True, editable=False, help_text="Date prévue d'atteinte de l'objectif au rythme actuel", null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='date_prevision',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='probabilite_financement',
+            field=models.FloatField(blank=True, editable=False, help_text="Probabilité d'atteindre l'objectif avant la date limite", null=True),
+        ),
+    ]
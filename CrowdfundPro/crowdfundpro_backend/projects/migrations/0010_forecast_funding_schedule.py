@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='forecast_funding',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'forecast_funding'",
+            'schedule_type': 'D',
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='forecast_funding').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_project_forecast'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='generate_image_variants',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'generate_image_variants'",
+            'schedule_type': 'H',
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='generate_image_variants').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_forecast_funding_schedule'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0011_generate_image_variants_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('projet_id', models.BigIntegerField(db_index=True)),
+                ('titre', models.CharField(max_length=200)),
+                ('statut', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('TERMINE', 'Terminé'), ('ECHEC', 'Échec')], default='EN_ATTENTE', max_length=10)),
+                ('compteurs', models.JSONField(blank=True, default=dict, help_text='Lignes supprimées par type')),
+                ('erreur', models.TextField(blank=True)),
+                ('date_demande', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('date_maj', models.DateTimeField(auto_now=True)),
+                ('date_fin', models.DateTimeField(blank=True, null=True)),
+                ('demandee_par', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='suppressions_projets_demandees', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Suppression de projet',
+                'verbose_name_plural': 'Suppressions de projets',
+                'db_table': 'project_deletions',
+                'ordering': ['-date_demande'],
+            },
+        ),
+    ]
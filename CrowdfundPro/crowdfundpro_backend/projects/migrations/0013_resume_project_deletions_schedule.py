@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='resume_project_deletions',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'resume_project_deletions'",
+            'schedule_type': 'H',
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='resume_project_deletions').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_projectdeletion'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
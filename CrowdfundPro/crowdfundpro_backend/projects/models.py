@@ -2,6 +2,25 @@ from django.db import models
 from django.utils import timezone
 from django.conf import settings
 from decimal import Decimal
+from uploads.storage import content_storage
+
+
+class ProjectQuerySet(models.QuerySet):
+
+    def for_listing(self):
+        """
+        Précharge ce qu'affichent les sérialiseurs de projet (porteur, nombre
+        d'investisseurs) pour éviter des requêtes par ligne.
+
+        L'agrégat ajoute un GROUP BY, pour lequel Django ignore `Meta.ordering` :
+        l'ordre par défaut est donc rétabli explicitement (pagination stable).
+        """
+        queryset = self.select_related('porteur').annotate(
+            nb_investisseurs=models.Count('investissements__investisseur', distinct=True)
+        )
+        if not queryset.query.order_by:
+            queryset = queryset.order_by(*self.model._meta.ordering)
+        return queryset
 
 
 class Project(models.Model):
@@ -19,13 +38,15 @@ class Project(models.Model):
     statut = models.CharField(max_length=25, choices=STATUS_CHOICES, default='EN_ATTENTE_VALIDATION')
     date_limite = models.DateTimeField()
     date_creation = models.DateTimeField(auto_now_add=True)
+    date_modification = models.DateTimeField(auto_now=True, db_index=True)
     porteur = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='projets_portes',
         limit_choices_to={'role': 'PORTEUR'}
     )
-    image = models.ImageField(upload_to='projects/', blank=True, null=True)
+    image = models.ImageField(upload_to='projects/', storage=content_storage, blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Variantes redimensionnées de l'image (générées en tâche de fond)")
     
     # Nouveaux champs pour la localisation
     latitude = models.DecimalField(max_digits=15, decimal_places=12, blank=True, null=True, help_text="Latitude du projet")
@@ -33,8 +54,15 @@ class Project(models.Model):
     adresse = models.CharField(max_length=500, blank=True, null=True, help_text="Adresse complète du projet")
     
     # Nouveaux champs pour les documents
-    business_plan = models.FileField(upload_to='projects/documents/', blank=True, null=True, help_text="Business plan du projet")
-    plan_juridique = models.FileField(upload_to='projects/documents/', blank=True, null=True, help_text="Plan juridique et réglementaire du projet")
+    business_plan = models.FileField(upload_to='projects/documents/', storage=content_storage, blank=True, null=True, help_text="Business plan du projet")
+    plan_juridique = models.FileField(upload_to='projects/documents/', storage=content_storage, blank=True, null=True, help_text="Plan juridique et réglementaire du projet")
+    
+    # Prévision d'atteinte de l'objectif (forecast_funding, chaque nuit)
+    date_completion_prevue = models.DateTimeField(blank=True, null=True, editable=False, help_text="Date prévue d'atteinte de l'objectif au rythme actuel")
+    probabilite_financement = models.FloatField(blank=True, null=True, editable=False, help_text="Probabilité d'atteindre l'objectif avant la date limite")
+    date_prevision = models.DateTimeField(blank=True, null=True, editable=False)
+    
+    FILE_FIELDS = ('image', 'business_plan', 'plan_juridique')
     
     class Meta:
         db_table = 'projects'
@@ -42,14 +70,49 @@ class Project(models.Model):
         verbose_name_plural = 'Projets'
         ordering = ['-date_creation']
     
+    objects = ProjectQuerySet.as_manager()
+    
     def __str__(self):
         return self.titre
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Statut tel que chargé, pour détecter les transitions dans post_save
+        instance._statut_initial = instance.__dict__.get('statut')
+        # Noms des fichiers tels que chargés (références des blobs, variantes d'image)
+        instance._fichiers_initiaux = {
+            name: instance.__dict__[name] for name in cls.FILE_FIELDS if name in instance.__dict__
+        }
+        return instance
+    
     def save(self, *args, **kwargs):
         # Ensure date_limite is timezone-aware
         if self.date_limite and timezone.is_naive(self.date_limite):
             self.date_limite = timezone.make_aware(self.date_limite)
         super().save(*args, **kwargs)
+        self._statut_initial = self.statut
+        modifies = self.fichiers_modifies()
+        self._fichiers_initiaux = {
+            **getattr(self, '_fichiers_initiaux', {}),
+            **{name: nouveau for name, (ancien, nouveau) in modifies.items()},
+        }
+        if 'image' in modifies and self.image:
+            from .images import schedule_variants
+            schedule_variants(self)
+    
+    def fichiers_modifies(self):
+        """Champs fichier modifiés depuis le chargement : {champ: (ancien nom, nouveau nom)}"""
+        initiaux = getattr(self, '_fichiers_initiaux', {})
+        modifies = {}
+        for name in self.FILE_FIELDS:
+            if name not in self.__dict__:
+                continue  # champ différé, non chargé
+            ancien = initiaux.get(name) or None
+            nouveau = getattr(self, name).name or None
+            if ancien != nouveau:
+                modifies[name] = (ancien, nouveau)
+        return modifies
     
     @property
     def pourcentage_finance(self):
@@ -79,6 +142,9 @@ class Project(models.Model):
     @property
     def nombre_investisseurs(self):
         """Retourne le nombre d'investisseurs uniques"""
+        if 'nb_investisseurs' in self.__dict__:
+            # Annoté par ProjectQuerySet.for_listing()
+            return self.nb_investisseurs
         return self.investissements.values('investisseur').distinct().count()
     
     @property
@@ -101,14 +167,9 @@ class Project(models.Model):
         self.save()
     
     def update_montant_actuel(self):
-        """Met à jour le montant actuel basé sur les investissements réussis"""
-        from investments.models import Investment
-        total = Investment.objects.filter(
-            projet=self,
-            statut_paiement='REUSSI'
-        ).aggregate(total=models.Sum('montant'))['total'] or Decimal('0.00')
-        
-        self.montant_actuel = total
+        """Met à jour le montant actuel à partir du registre des financements"""
+        from ledger.models import balance
+        self.montant_actuel = balance(self.pk)
         self.save()
         self.update_status()
     
@@ -118,4 +179,43 @@ class Project(models.Model):
             self.statut = 'EN_COURS'
             self.save()
             return True
-        return False 
\ No newline at end of file
+        return False 
+
+class ProjectDeletion(models.Model):
+    """
+    Suppression d'un projet exécutée en tâche de fond (voir `projects.deletion`).
+
+    Ses investissements sont supprimés par lots, puis le projet. `projet_id`
+    n'est pas une clé étrangère : la ligne survit au projet et sert de trace.
+    """
+    STATUT_CHOICES = (
+        ('EN_ATTENTE', 'En attente'),
+        ('EN_COURS', 'En cours'),
+        ('TERMINE', 'Terminé'),
+        ('ECHEC', 'Échec'),
+    )
+
+    projet_id = models.BigIntegerField(db_index=True)
+    titre = models.CharField(max_length=200)
+    demandee_par = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='suppressions_projets_demandees'
+    )
+    statut = models.CharField(max_length=10, choices=STATUT_CHOICES, default='EN_ATTENTE')
+    compteurs = models.JSONField(default=dict, blank=True, help_text="Lignes supprimées par type")
+    erreur = models.TextField(blank=True)
+    date_demande = models.DateTimeField(auto_now_add=True, db_index=True)
+    date_maj = models.DateTimeField(auto_now=True)
+    date_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'project_deletions'
+        verbose_name = 'Suppression de projet'
+        verbose_name_plural = 'Suppressions de projets'
+        ordering = ['-date_demande']
+
+    def __str__(self):
+        return f"{self.titre} ({self.statut})"
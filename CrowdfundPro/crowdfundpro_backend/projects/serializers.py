@@ -1,9 +1,67 @@
 from rest_framework import serializers
+from django.core.files.storage import default_storage
+from django.urls import reverse
 from django.utils import timezone
+from .images import FORMATS, VARIANTS
 from .models import Project
 from users.serializers import UserProfileSerializer
 
 
+class ImageVariantsField(serializers.Field):
+    """
+    URLs des variantes de l'image (par taille et par format), ou None tant
+    qu'elles n'ont pas été générées pour l'image courante.
+    """
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, project):
+        variants = project.image_variants or {}
+        if not project.image or variants.get('source') != project.image.name:
+            return None
+        request = self.context.get('request')
+        
+        def url(path):
+            url = default_storage.url(path)
+            return request.build_absolute_uri(url) if request is not None else url
+        
+        return {
+            name: {key: url(value) if key in FORMATS else value for key, value in variants[name].items()}
+            for name in VARIANTS if name in variants
+        }
+
+
+class DocumentsField(serializers.Field):
+    """
+    URLs de téléchargement contrôlé des documents (None si absent). Les
+    chemins des fichiers ne sont jamais exposés : l'accès passe par la vue
+    de téléchargement, qui vérifie les droits.
+    """
+    DOCUMENTS = ('business_plan', 'plan_juridique')
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, project):
+        request = self.context.get('request')
+        documents = {}
+        for kind in self.DOCUMENTS:
+            if not getattr(project, kind):
+                documents[kind] = None
+                continue
+            url = reverse('project-document', kwargs={'pk': project.pk, 'kind': kind})
+            documents[kind] = request.build_absolute_uri(url) if request is not None else url
+        return documents
+
+
+# Documents acceptés en écriture, jamais renvoyés (voir DocumentsField)
+DOCUMENT_WRITE_ONLY = {'business_plan': {'write_only': True}, 'plan_juridique': {'write_only': True}}
+
+
 class ProjectCreateSerializer(serializers.ModelSerializer):
     """
     Sérialiseur pour la création de projets
@@ -11,6 +69,7 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ('titre', 'description', 'objectif', 'date_limite', 'image', 'latitude', 'longitude', 'adresse', 'business_plan', 'plan_juridique')
+        extra_kwargs = DOCUMENT_WRITE_ONLY
     
     def validate_date_limite(self, value):
         """Valide la date limite"""
@@ -79,15 +138,17 @@ class ProjectListSerializer(serializers.ModelSerializer):
     nombre_investisseurs = serializers.ReadOnlyField()
     statut_display = serializers.CharField(source='get_statut_display', read_only=True)
     a_localisation = serializers.ReadOnlyField()
+    image_variants = ImageVariantsField()
+    documents = DocumentsField()
     
     class Meta:
         model = Project
         fields = (
             'id', 'titre', 'description', 'objectif', 'montant_actuel',
             'statut', 'statut_display', 'date_limite', 'date_creation',
-            'porteur', 'image', 'pourcentage_finance', 'jours_restants',
+            'porteur', 'image', 'image_variants', 'pourcentage_finance', 'jours_restants',
             'nombre_investisseurs', 'latitude', 'longitude', 'adresse', 
-            'a_localisation', 'business_plan', 'plan_juridique'
+            'a_localisation', 'documents'
         )
 
 
@@ -95,6 +156,7 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
     """
     Sérialiseur pour les détails d'un projet
     """
+    documents = DocumentsField()
     porteur = UserProfileSerializer(read_only=True)
     pourcentage_finance = serializers.ReadOnlyField()
     jours_restants = serializers.ReadOnlyField()
@@ -103,16 +165,17 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
     est_expire = serializers.ReadOnlyField()
     statut_display = serializers.CharField(source='get_statut_display', read_only=True)
     a_localisation = serializers.ReadOnlyField()
+    image_variants = ImageVariantsField()
     
     class Meta:
         model = Project
         fields = (
             'id', 'titre', 'description', 'objectif', 'montant_actuel',
             'statut', 'statut_display', 'date_limite', 'date_creation',
-            'porteur', 'image', 'pourcentage_finance', 'jours_restants',
+            'porteur', 'image', 'image_variants', 'pourcentage_finance', 'jours_restants',
             'nombre_investisseurs', 'est_finance', 'est_expire',
-            'latitude', 'longitude', 'adresse', 'a_localisation',
-            'business_plan', 'plan_juridique'
+            'latitude', 'longitude', 'adresse', 'a_localisation', 'documents',
+            'date_completion_prevue', 'probabilite_financement', 'date_prevision'
         )
 
 
@@ -123,6 +186,7 @@ class ProjectUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ('titre', 'description', 'objectif', 'date_limite', 'image', 'latitude', 'longitude', 'adresse', 'business_plan', 'plan_juridique')
+        extra_kwargs = DOCUMENT_WRITE_ONLY
         
     def validate(self, attrs):
         project = self.instance
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .images import delete_variants
+from .models import Project
+
+
+@receiver(post_delete, sender=Project)
+def delete_image_variants(sender, instance, **kwargs):
+    # Les variantes ne sont pas des blobs partagés : elles disparaissent avec le projet
+    variants = instance.image_variants
+    if variants:
+        transaction.on_commit(lambda: delete_variants(variants))
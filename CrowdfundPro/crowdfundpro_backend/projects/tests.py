@@ -0,0 +1,145 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from PIL import Image
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from changefeed.models import ChangeLog
+from investments.models import Investment
+from ledger.models import LedgerEntry
+from rankings.models import ProjectScore
+from uploads.models import Blob
+from users.models import User
+from .deletion import run
+from .models import Project, ProjectDeletion
+
+
+def jpeg(name='image.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', (32, 24), 'red').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class MediaRootMixin:
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ImageVariantsTests(MediaRootMixin, APITestCase):
+    """
+    Génération des variantes d'image quand le broker django-q est indisponible.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.porteur = User.objects.create_user('p@example.com', 'secret', username='porteur', role='PORTEUR')
+
+    def test_creation_avec_broker_indisponible(self):
+        self.client.force_authenticate(self.porteur)
+        broker_down = RedisConnectionError('Error 111 connecting to 127.0.0.1:6379. Connection refused.')
+        with mock.patch('django_q.tasks.async_task', side_effect=broker_down) as async_task:
+            with self.assertLogs('projects.images', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/api/projects/', {
+                    'titre': 'Projet avec image',
+                    'description': 'd' * 60,
+                    'objectif': '1000',
+                    'date_limite': (timezone.now() + timedelta(days=30)).isoformat(),
+                    'image': jpeg(),
+                }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        async_task.assert_called_once()
+        project = Project.objects.get()
+        self.assertEqual(project.image_variants, {})
+
+        # La commande planifiée rattrape les variantes manquantes
+        call_command('generate_image_variants', stdout=StringIO())
+        project.refresh_from_db()
+        self.assertEqual(project.image_variants['source'], project.image.name)
+        self.assertEqual(set(project.image_variants) - {'source'}, {'thumbnail', 'card', 'hero'})
+
+
+class ProjectDeletionTests(MediaRootMixin, APITestCase):
+    """
+    Suppression d'un projet par la tâche de fond.
+    """
+
+    BLOB = 'blobs/ab/cd/abcd.jpg'
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser('admin@example.com', 'secret', username='admin')
+        self.porteur = User.objects.create_user('p@example.com', 'secret', username='porteur', role='PORTEUR')
+        investisseur = User.objects.create_user('i@example.com', 'secret', username='inv', role='INVESTISSEUR')
+        self.projet = Project.objects.create(
+            titre='Projet supprimé', description='d' * 60, objectif=Decimal('10000'),
+            statut='EN_COURS', date_limite=timezone.now() + timedelta(days=30), porteur=self.porteur,
+        )
+        self.investissements = [
+            Investment.objects.create(
+                investisseur=investisseur, projet=self.projet, montant=Decimal(montant),
+                statut_paiement='REUSSI', methode_paiement='CARTE',
+            ).pk
+            for montant in (100, 50)
+        ]
+        Blob.objects.create(name=self.BLOB, digest='abcd', size=1, refcount=2)
+        self.variant = default_storage.save('projects/variants/test-card.jpeg', ContentFile(b'jpeg'))
+        Project.objects.filter(pk=self.projet.pk).update(
+            image=self.BLOB,
+            image_variants={'source': self.BLOB, 'card': {'width': 1, 'height': 1, 'jpeg': self.variant}},
+        )
+        self.ledger_count = LedgerEntry.objects.count()
+
+    def _assert_deleted(self, deletion):
+        self.assertTrue(Project.objects.filter(pk=self.projet.pk).exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            run(deletion.pk)
+        deletion.refresh_from_db()
+        self.assertEqual(deletion.statut, 'TERMINE')
+        self.assertEqual(deletion.compteurs, {'investissements': 2, 'projets': 1})
+
+        self.assertFalse(Project.objects.filter(pk=self.projet.pk).exists())
+        self.assertFalse(Investment.objects.filter(pk__in=self.investissements).exists())
+        self.assertFalse(ProjectScore.objects.filter(projet_id=self.projet.pk).exists())
+        # Registre conservé tel quel (pas de remboursement par investissement)
+        self.assertEqual(LedgerEntry.objects.count(), self.ledger_count)
+        tombstones = set(ChangeLog.objects.filter(action='delete').values_list('entity', 'object_id'))
+        self.assertEqual(
+            tombstones, {('project', self.projet.pk), *(('investment', pk) for pk in self.investissements)}
+        )
+        self.assertEqual(Blob.objects.get(pk=self.BLOB).refcount, 1)
+        self.assertFalse(default_storage.exists(self.variant))
+
+    def test_suppression_par_l_api(self):
+        self.client.force_authenticate(self.porteur)
+        with mock.patch('projects.deletion.enqueue') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(f'/api/projects/{self.projet.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        deletion = ProjectDeletion.objects.get(pk=response.data['suppression'])
+        enqueue.assert_called_once_with(deletion.pk)
+        self._assert_deleted(deletion)
+
+    def test_suppression_depuis_l_admin(self):
+        self.client.force_login(self.admin)
+        with mock.patch('projects.deletion.enqueue'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(f'/admin/projects/project/{self.projet.pk}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self._assert_deleted(ProjectDeletion.objects.get(projet_id=self.projet.pk))
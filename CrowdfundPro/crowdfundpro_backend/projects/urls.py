@@ -5,8 +5,11 @@ urlpatterns = [
     path('', views.ProjectListView.as_view(), name='project-list'),
     path('user/', views.UserProjectsView.as_view(), name='user-projects'),
     path('<int:pk>/', views.ProjectDetailView.as_view(), name='project-detail'),
+    path('<int:pk>/documents/<str:kind>/', views.ProjectDocumentView.as_view(), name='project-document'),
     path('<int:pk>/update_status/', views.update_project_status, name='project-update-status'),
     path('<int:pk>/validate/', views.validate_project, name='project-validate'),
+    path('stats/', views.project_stats, name='project-stats'),
+    path('stats/platform/', views.platform_stats, name='platform-stats'),
     path('stats/porteur/', views_stats.porteur_stats, name='porteur-stats'),
     path('stats/investisseur/', views_stats.investisseur_stats, name='investisseur-stats'),
 ] 
\ No newline at end of file
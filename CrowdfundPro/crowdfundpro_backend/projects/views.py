@@ -1,10 +1,21 @@
+import logging
+import os
 from rest_framework import generics, permissions, status, filters
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from analytics.store import delta_store
+from archive.models import ArchivedProject
+from archive.serializers import ArchivedProjectSerializer
 from .models import Project
+from .conditional import ConditionalGetMixin, list_version, detail_version
+from .deletion import schedule_project_deletion
+from .documents import serve_document
 from .serializers import (
     ProjectCreateSerializer,
     ProjectListSerializer,
@@ -12,6 +23,12 @@ from .serializers import (
     ProjectUpdateSerializer
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Nombre maximal de projets par récupération groupée (?ids=)
+MAX_BATCH_IDS = 100
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
@@ -55,7 +72,35 @@ class IsAdminOrPorteurOrReadOnly(permissions.BasePermission):
         return obj.porteur == request.user
 
 
-class ProjectListView(generics.ListCreateAPIView):
+def projets_visibles(user):
+    """
+    Projets visibles selon le rôle de l'utilisateur :
+    - Admins : voient tous les projets
+    - Porteurs : voient leurs propres projets + projets validés
+    - Investisseurs : voient seulement les projets validés
+    """
+    queryset = Project.objects.all()
+
+    # Si l'utilisateur n'est pas connecté, ne montrer que les projets validés
+    if not user.is_authenticated:
+        return queryset.exclude(statut='EN_ATTENTE_VALIDATION')
+
+    # Si c'est un admin, montrer tous les projets
+    if user.is_superuser:
+        return queryset
+
+    # Si c'est un porteur, montrer ses propres projets + projets validés
+    if user.role == 'PORTEUR':
+        return queryset.filter(
+            Q(porteur=user) |  # Ses propres projets (tous statuts)
+            ~Q(statut='EN_ATTENTE_VALIDATION')  # Projets validés des autres
+        )
+
+    # Si c'est un investisseur ou autre, ne montrer que les projets validés
+    return queryset.exclude(statut='EN_ATTENTE_VALIDATION')
+
+
+class ProjectListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     Vue pour lister et créer des projets
     """
@@ -69,30 +114,48 @@ class ProjectListView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         """
-        Filtre les projets selon le rôle de l'utilisateur :
-        - Admins : voient tous les projets
-        - Porteurs : voient leurs propres projets + projets validés
-        - Investisseurs : voient seulement les projets validés
+        Filtre les projets selon le rôle de l'utilisateur (voir projets_visibles)
         """
-        queryset = Project.objects.all()
-        
-        # Si l'utilisateur n'est pas connecté, ne montrer que les projets validés
-        if not self.request.user.is_authenticated:
-            return queryset.exclude(statut='EN_ATTENTE_VALIDATION')
-        
-        # Si c'est un admin, montrer tous les projets
-        if self.request.user.is_superuser:
-            return queryset
-        
-        # Si c'est un porteur, montrer ses propres projets + projets validés
-        if self.request.user.role == 'PORTEUR':
-            return queryset.filter(
-                Q(porteur=self.request.user) |  # Ses propres projets (tous statuts)
-                ~Q(statut='EN_ATTENTE_VALIDATION')  # Projets validés des autres
-            )
-        
-        # Si c'est un investisseur ou autre, ne montrer que les projets validés
-        return queryset.exclude(statut='EN_ATTENTE_VALIDATION')
+        return projets_visibles(self.request.user)
+    
+    def get_version_marker(self):
+        return list_version(self.request, self.get_queryset())
+    
+    def filter_queryset(self, queryset):
+        ids = self.requested_ids()
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return super().filter_queryset(queryset).for_listing()
+    
+    def requested_ids(self):
+        """
+        Identifiants demandés par `?ids=1,2,3` (récupération groupée), ou None
+        """
+        raw = self.request.query_params.get('ids')
+        if raw is None:
+            return None
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in raw.split(',') if pk.strip()))
+        except ValueError:
+            raise ValidationError({'ids': "Liste d'identifiants séparés par des virgules attendue."})
+        if len(ids) > MAX_BATCH_IDS:
+            raise ValidationError({'ids': f'Au plus {MAX_BATCH_IDS} identifiants par requête.'})
+        return ids
+    
+    def paginate_queryset(self, queryset):
+        # Récupération groupée : tous les projets demandés en une réponse
+        if self.requested_ids() is not None:
+            return None
+        return super().paginate_queryset(queryset)
+    
+    def list(self, request, *args, **kwargs):
+        ids = self.requested_ids()
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        # Dans l'ordre demandé ; les projets invisibles ou inexistants sont omis
+        projects = {project.pk: project for project in self.filter_queryset(self.get_queryset())}
+        serializer = self.get_serializer([projects[pk] for pk in ids if pk in projects], many=True)
+        return Response(serializer.data)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -105,13 +168,12 @@ class ProjectListView(generics.ListCreateAPIView):
     def create(self, request, *args, **kwargs):
         try:
             return super().create(request, *args, **kwargs)
-        except Exception as e:
-            print(f"❌ Erreur lors de la création: {str(e)}")
-            print(f"❌ Données reçues: {request.data}")
+        except Exception:
+            logger.exception("Erreur lors de la création d'un projet (champs reçus: %s)", sorted(request.data.keys()))
             raise
 
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vue pour consulter, modifier et supprimer un projet
     """
@@ -122,30 +184,70 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         Filtre les projets selon le rôle de l'utilisateur pour l'accès en détail
         """
-        queryset = Project.objects.all()
-        
-        # Si l'utilisateur n'est pas connecté, ne montrer que les projets validés
-        if not self.request.user.is_authenticated:
-            return queryset.exclude(statut='EN_ATTENTE_VALIDATION')
-        
-        # Si c'est un admin, montrer tous les projets
-        if self.request.user.is_superuser:
-            return queryset
-        
-        # Si c'est un porteur, montrer ses propres projets + projets validés
-        if self.request.user.role == 'PORTEUR':
-            return queryset.filter(
-                Q(porteur=self.request.user) |  # Ses propres projets (tous statuts)
-                ~Q(statut='EN_ATTENTE_VALIDATION')  # Projets validés des autres
-            )
-        
-        # Si c'est un investisseur ou autre, ne montrer que les projets validés
-        return queryset.exclude(statut='EN_ATTENTE_VALIDATION')
+        return projets_visibles(self.request.user)
+    
+    def get_version_marker(self):
+        return detail_version(self.get_queryset(), self.kwargs['pk'])
+    
+    def filter_queryset(self, queryset):
+        return super().filter_queryset(queryset).for_listing()
     
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return ProjectUpdateSerializer
         return ProjectDetailSerializer
+    
+    def get_object_or_archived(self):
+        """
+        Projet visible, ou à défaut projet archivé de même identifiant
+        (les projets archivés sont clôturés, donc visibles de tous)
+        """
+        try:
+            return self.get_object()
+        except Http404:
+            return get_object_or_404(ArchivedProject.objects.select_related('porteur'), pk=self.kwargs['pk'])
+    
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object_or_archived()
+        if isinstance(instance, ArchivedProject):
+            serializer = ArchivedProjectSerializer(instance, context=self.get_serializer_context())
+        else:
+            serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+    
+    def destroy(self, request, *args, **kwargs):
+        # Investissements et fichiers supprimés en tâche de fond (voir projects.deletion)
+        deletion = schedule_project_deletion(self.get_object(), demandee_par=request.user)
+        return Response(
+            {'message': 'Suppression du projet programmée', 'suppression': deletion.pk},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class ProjectDocumentView(ProjectDetailView):
+    """
+    Vue pour télécharger un document d'un projet (business plan, plan juridique)
+    avec les mêmes règles de visibilité que ProjectDetailView
+    """
+    http_method_names = ['get', 'head', 'options']
+    DOCUMENTS = ('business_plan', 'plan_juridique')
+    
+    def filter_queryset(self, queryset):
+        # Seuls les chemins des fichiers sont utiles ici
+        return queryset
+    
+    def get(self, request, *args, **kwargs):
+        kind = self.kwargs['kind']
+        if kind not in self.DOCUMENTS:
+            return Response({'error': 'Document inconnu'}, status=status.HTTP_404_NOT_FOUND)
+        
+        project = self.get_object_or_archived()
+        document = getattr(project, kind)
+        if not document:
+            return Response({'error': 'Document non trouvé'}, status=status.HTTP_404_NOT_FOUND)
+        
+        extension = os.path.splitext(document.name)[1]
+        return serve_document(request, document, f'{kind}-{project.pk}{extension}')
 
 
 class UserProjectsView(generics.ListAPIView):
@@ -160,17 +262,17 @@ class UserProjectsView(generics.ListAPIView):
         # Les porteurs voient tous leurs projets (y compris en attente de validation)
         # Les autres utilisateurs ne voient que leurs projets validés
         if self.request.user.role == 'PORTEUR':
-            return Project.objects.filter(porteur=self.request.user)
+            return Project.objects.filter(porteur=self.request.user).for_listing()
         else:
             return Project.objects.filter(
                 porteur=self.request.user,
                 statut__in=['EN_COURS', 'FINANCE', 'ECHOUE']
-            )
+            ).for_listing()
     
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
-        print("📦 Données sérialisées:", serializer.data)  # Debug log
+        logger.debug("Projets de l'utilisateur %s: %s", request.user.pk, serializer.data)
         return Response(serializer.data)
 
 
@@ -207,10 +309,22 @@ def project_stats(request):
     projects_echoues = queryset.filter(statut='ECHOUE').count()
     
     # Calculate total funding
-    from django.db.models import Sum
+    from django.db.models import Count, Sum
     total_funding = queryset.aggregate(
         total=Sum('montant_actuel')
     )['total'] or 0
+
+    # Projets archivés (clôturés, donc visibles par tous les rôles)
+    archives = ArchivedProject.objects.aggregate(
+        total=Count('id'),
+        finances=Count('id', filter=Q(statut='FINANCE')),
+        echoues=Count('id', filter=Q(statut='ECHOUE')),
+        funding=Sum('montant_actuel'),
+    )
+    total_projects += archives['total']
+    projects_finances += archives['finances']
+    projects_echoues += archives['echoues']
+    total_funding += archives['funding'] or 0
     
     return Response({
         'total_projects': total_projects,
@@ -223,6 +337,46 @@ def project_stats(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def platform_stats(request):
+    """
+    Statistiques approchées de la plateforme (admin only), lues dans des
+    résumés de taille fixe : le coût ne dépend pas du nombre d'investissements.
+    """
+    if not request.user.is_superuser:
+        return Response(
+            {'error': 'Permission non accordée'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    sketches = delta_store.snapshot()
+    montants = sketches['montants_investis']
+    minimum, maximum = montants.bounds()
+    deciles = montants.quantiles([i / 10 for i in range(1, 10)])
+    p50, p90, p99 = montants.quantiles([0.5, 0.9, 0.99])
+
+    top = sketches['montants_par_projet'].top(10)
+    titres = dict(Project.objects.filter(pk__in=[pk for pk, _montant in top]).values_list('pk', 'titre'))
+
+    return Response({
+        'investisseurs_distincts': round(sketches['investisseurs_distincts'].count()),
+        'investissements': montants.n,
+        'montants': {
+            'min': minimum,
+            'p50': p50,
+            'p90': p90,
+            'p99': p99,
+            'max': maximum,
+            'deciles': deciles,
+        },
+        'top_projets': [
+            {'projet': pk, 'titre': titres.get(pk), 'montant_estime': round(montant, 2)}
+            for pk, montant in top
+        ],
+    })
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def update_project_status(request, pk):
@@ -7,6 +7,7 @@ from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 from .models import Project
+from archive.models import ArchivedInvestment, ArchivedProject
 from investments.models import Investment
 
 @api_view(['GET'])
@@ -19,20 +20,33 @@ def porteur_stats(request):
     if user.role != 'PORTEUR':
         return Response({'error': 'Accès non autorisé'}, status=403)
 
-    # Projets de l'utilisateur
+    # Projets de l'utilisateur (et ses projets archivés, comptés dans les totaux)
     projects = Project.objects.filter(porteur=user)
+    archived = ArchivedProject.objects.filter(porteur=user)
+    archives = archived.aggregate(
+        total=Count('id'),
+        funding=Sum('montant_actuel', default=Decimal('0.00')),
+        financed=Count('id', filter=Q(statut='FINANCE')),
+    )
     
     # Statistiques de base
-    total_projects = projects.count()
+    total_projects = projects.count() + archives['total']
     total_funding = projects.aggregate(
         total=Sum('montant_actuel', default=Decimal('0.00'))
-    )['total']
+    )['total'] + archives['funding']
     
-    financed_projects = projects.filter(statut='FINANCE').count()
+    financed_projects = projects.filter(statut='FINANCE').count() + archives['financed']
     success_rate = (financed_projects / total_projects * 100) if total_projects > 0 else 0
 
     # Top projets par financement
-    top_projects = projects.order_by('-montant_actuel')[:5].values('titre', 'montant_actuel')
+    top_projects = sorted(
+        [
+            *projects.order_by('-montant_actuel')[:5].values('titre', 'montant_actuel'),
+            *archived.order_by('-montant_actuel')[:5].values('titre', 'montant_actuel'),
+        ],
+        key=lambda p: p['montant_actuel'],
+        reverse=True,
+    )[:5]
     top_projects_data = [
         {'name': p['titre'], 'funding': float(p['montant_actuel'])}
         for p in top_projects
@@ -40,32 +54,56 @@ def porteur_stats(request):
 
     # Statistiques mensuelles
     six_months_ago = timezone.now() - timedelta(days=180)
+    # Investissements comptés à part : la jointure multiplierait les projets et leurs montants
     monthly_stats = projects.filter(
         date_creation__gte=six_months_ago
     ).annotate(
         month=TruncMonth('date_creation')
+    ).values('month').annotate(
+        newProjects=Count('id'),
+        totalFunding=Sum('montant_actuel')
+    ).order_by('month')
+    monthly_investments = Investment.objects.filter(
+        projet__porteur=user, projet__date_creation__gte=six_months_ago
+    ).annotate(
+        month=TruncMonth('projet__date_creation')
+    ).values('month').annotate(
+        newInvestments=Count('id')
+    ).order_by('month')
+    archived_monthly_stats = archived.filter(
+        date_creation__gte=six_months_ago
+    ).annotate(
+        month=TruncMonth('date_creation')
     ).values('month').annotate(
         newProjects=Count('id'),
         totalFunding=Sum('montant_actuel'),
-        newInvestments=Count('investissements')
+        newInvestments=Sum('nombre_investissements')
     ).order_by('month')
 
+    months = {}
+    for stats in [*monthly_stats, *monthly_investments, *archived_monthly_stats]:
+        month = months.setdefault(stats['month'], {'newProjects': 0, 'totalFunding': 0.0, 'newInvestments': 0})
+        month['newProjects'] += stats.get('newProjects', 0)
+        month['totalFunding'] += float(stats.get('totalFunding') or 0)
+        month['newInvestments'] += stats.get('newInvestments') or 0
     monthly_stats_data = [
-        {
-            'month': stats['month'].strftime('%b'),
-            'newProjects': stats['newProjects'],
-            'totalFunding': float(stats['totalFunding'] or 0),
-            'newInvestments': stats['newInvestments']
-        }
-        for stats in monthly_stats
+        {'month': month.strftime('%b'), **months[month]}
+        for month in sorted(months)
     ]
 
     # Investissements récents
-    recent_investments = Investment.objects.filter(
-        projet__porteur=user
-    ).select_related(
-        'projet', 'investisseur'
-    ).order_by('-date_investissement')[:5]
+    recent_investments = sorted(
+        [
+            *Investment.objects.filter(projet__porteur=user).select_related(
+                'projet', 'investisseur'
+            ).order_by('-date_investissement')[:5],
+            *ArchivedInvestment.objects.filter(projet__porteur=user).select_related(
+                'projet', 'investisseur'
+            ).order_by('-date_investissement')[:5],
+        ],
+        key=lambda inv: inv.date_investissement,
+        reverse=True,
+    )[:5]
 
     recent_investments_data = [
         {
@@ -96,56 +134,65 @@ def investisseur_stats(request):
     if user.role != 'INVESTISSEUR':
         return Response({'error': 'Accès non autorisé'}, status=403)
 
-    # Investissements de l'utilisateur
+    # Investissements de l'utilisateur (actifs et archivés)
     investments = Investment.objects.filter(investisseur=user)
+    archived = ArchivedInvestment.objects.filter(investisseur=user)
+    archives = archived.aggregate(
+        total=Sum('montant', default=Decimal('0.00')),
+        count=Count('id'),
+        financed=Count('id', filter=Q(projet__statut='FINANCE')),
+    )
     
     # Statistiques de base
     total_invested = investments.aggregate(
         total=Sum('montant', default=Decimal('0.00'))
-    )['total']
+    )['total'] + archives['total']
     
-    number_of_investments = investments.count()
+    number_of_investments = investments.count() + archives['count']
     average_investment = total_invested / number_of_investments if number_of_investments > 0 else 0
 
     # Calculer le ROI potentiel (exemple simplifié)
     successful_projects = investments.filter(
         projet__statut='FINANCE'
-    ).count()
+    ).count() + archives['financed']
     potential_roi = (successful_projects / number_of_investments * 25) if number_of_investments > 0 else 0
 
     # Distribution du portfolio par statut de projet
-    portfolio_distribution = investments.values(
-        'projet__statut'
-    ).annotate(
-        total=Sum('montant')
-    ).order_by('-total')
+    distribution = {}
+    for queryset in (investments, archived):
+        for item in queryset.values('projet__statut').annotate(total=Sum('montant')).order_by():
+            distribution[item['projet__statut']] = distribution.get(item['projet__statut'], 0) + item['total']
 
     colors = ['#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#6B7280', '#8B5CF6']
     portfolio_data = [
         {
-            'name': item['projet__statut'],
-            'value': float(item['total']),
+            'name': statut,
+            'value': float(total),
             'color': colors[i % len(colors)]
         }
-        for i, item in enumerate(portfolio_distribution)
+        for i, (statut, total) in enumerate(sorted(distribution.items(), key=lambda item: item[1], reverse=True))
     ]
 
     # Historique des investissements
     six_months_ago = timezone.now() - timedelta(days=180)
-    investment_history = investments.filter(
-        date_investissement__gte=six_months_ago
-    ).annotate(
-        month=TruncMonth('date_investissement')
-    ).values('month').annotate(
-        amount=Sum('montant')
-    ).order_by('month')
+    history = {}
+    for queryset in (investments, archived):
+        investment_history = queryset.filter(
+            date_investissement__gte=six_months_ago
+        ).annotate(
+            month=TruncMonth('date_investissement')
+        ).values('month').annotate(
+            amount=Sum('montant')
+        ).order_by('month')
+        for stats in investment_history:
+            history[stats['month']] = history.get(stats['month'], 0) + stats['amount']
 
     history_data = [
         {
-            'date': stats['month'].strftime('%b %Y'),
-            'amount': float(stats['amount'])
+            'date': month.strftime('%b %Y'),
+            'amount': float(history[month])
         }
-        for stats in investment_history
+        for month in sorted(history)
     ]
 
     return Response({
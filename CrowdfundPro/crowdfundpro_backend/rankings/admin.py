@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import ProjectScore
+
+
+@admin.register(ProjectScore)
+class ProjectScoreAdmin(admin.ModelAdmin):
+    """
+    Administration pour les scores de classement
+    """
+    list_display = ('projet', 'montant_total', 'score_jour', 'score_semaine', 'derniere_contribution')
+    search_fields = ('projet__titre',)
+    readonly_fields = ('projet', 'score_jour', 'score_semaine', 'montant_total', 'derniere_contribution')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class RankingsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'rankings'
+    verbose_name = 'Classements'
+
+    def ready(self):
+        from . import signals  # noqa: F401
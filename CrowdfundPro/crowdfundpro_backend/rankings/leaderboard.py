@@ -0,0 +1,122 @@
+"""
+Classements top-k tenus en mémoire.
+
+Chaque processus garde les `RANKING_TOP_K` meilleurs projets de chaque
+classement. Les scores ne font que croître : un investissement traité par ce
+processus met le classement à jour sur place (le projet ne peut entrer dans
+le top-k que par sa propre hausse). Les investissements traités par les
+autres processus et les changements de statut sont intégrés en rechargeant
+le top-k depuis `ProjectScore` (une requête LIMIT k sur un index), au plus
+toutes les `RANKING_REFRESH_SECONDS`. Au redémarrage, le classement repart de
+cette table, sans relire l'historique des investissements.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from monitoring.metrics import cache_requests
+from .models import ProjectScore
+from .scoring import WINDOWS, log_contribution, logaddexp
+
+
+class Leaderboard:
+
+    def __init__(self, name, field, statuts, size, refresh_interval):
+        self.name = name
+        self.field = field
+        self.statuts = statuts
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._entries = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        rows = ProjectScore.objects.filter(projet__statut__in=self.statuts).order_by(
+            '-' + self.field, 'projet_id'
+        ).values_list('projet_id', self.field)[:self.size]
+        return [(score, projet_id) for projet_id, score in rows]
+
+    def top(self, limit):
+        """Liste de (score, projet_id), meilleur en tête."""
+        if self._entries is None or time.monotonic() - self._loaded_at >= self.refresh_interval:
+            cache_requests.inc(cache='rankings', result='miss')
+            entries = self._load()
+            with self._lock:
+                self._entries = entries
+                self._loaded_at = time.monotonic()
+        else:
+            cache_requests.inc(cache='rankings', result='hit')
+        return self._entries[:limit]
+
+    def offer(self, projet_id, score, statut):
+        """Intègre le nouveau score d'un projet (scores croissants uniquement)."""
+        with self._lock:
+            if self._entries is None:
+                return
+            entries = [entry for entry in self._entries if entry[1] != projet_id]
+            if statut in self.statuts:
+                entries.append((score, projet_id))
+                entries.sort(key=lambda entry: (-entry[0], entry[1]))
+            self._entries = entries[:self.size]
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+
+
+_size = getattr(settings, 'RANKING_TOP_K', 100)
+_refresh = getattr(settings, 'RANKING_REFRESH_SECONDS', 30)
+
+leaderboards = {
+    name: Leaderboard(name, field, ('EN_COURS',), _size, _refresh)
+    for name, (field, _half_life) in WINDOWS.items()
+}
+leaderboards['total'] = Leaderboard('total', 'montant_total', ('EN_COURS', 'FINANCE'), _size, _refresh)
+
+
+def record_success(projet_id, montant, when=None):
+    """
+    Ajoute un investissement réussi aux scores du projet (un UPDATE atomique,
+    ou une création pour sa première contribution) puis aux classements en mémoire.
+    """
+    if montant <= 0:
+        return
+    when = when or timezone.now()
+    terms = {field: log_contribution(montant, when, half_life) for field, half_life in WINDOWS.values()}
+    changes = {field: logaddexp(field, term) for field, term in terms.items()}
+    scores = ProjectScore.objects.filter(projet_id=projet_id)
+    if not scores.update(montant_total=F('montant_total') + montant, derniere_contribution=when, **changes):
+        try:
+            with transaction.atomic():
+                ProjectScore.objects.create(
+                    projet_id=projet_id, montant_total=montant, derniere_contribution=when, **terms
+                )
+        except IntegrityError:
+            # Création concurrente par un autre processus
+            scores.update(montant_total=F('montant_total') + montant, derniere_contribution=when, **changes)
+
+    fields = [leaderboard.field for leaderboard in leaderboards.values()]
+    # Statut relu après la mise à jour du montant (le projet peut être passé FINANCE)
+    row = scores.values('projet__statut', *fields).first()
+    if row is not None:
+        for leaderboard in leaderboards.values():
+            leaderboard.offer(projet_id, row[leaderboard.field], row['projet__statut'])
+
+
+def record_refund(projet_id, montant):
+    """
+    Retire un investissement qui n'est plus réussi du montant total. Les
+    scores de tendance gardent sa contribution, qui s'efface avec la décroissance.
+    """
+    ProjectScore.objects.filter(projet_id=projet_id).update(montant_total=F('montant_total') - montant)
+    leaderboards['total'].invalidate()
+
+
+def invalidate_all():
+    for leaderboard in leaderboards.values():
+        leaderboard.invalidate()
@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from investments.models import Investment
+from rankings.leaderboard import invalidate_all
+from rankings.models import ProjectScore
+from rankings.scoring import WINDOWS, log_contribution, logaddexp_py
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule les scores de classement depuis l'historique des investissements réussis "
+        "(initialisation ou réparation ; en fonctionnement normal ils sont maintenus au fil de l'eau)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = Investment.objects.filter(statut_paiement='REUSSI').order_by('projet_id').values_list(
+            'projet_id', 'montant', 'date_investissement'
+        )
+        scores = {}
+        for projet_id, montant, date in rows.iterator(chunk_size=5000):
+            if montant <= 0:
+                continue
+            state = scores.get(projet_id)
+            terms = {field: log_contribution(montant, date, half_life) for field, half_life in WINDOWS.values()}
+            if state is None:
+                scores[projet_id] = state = {'montant_total': Decimal('0.00'), 'derniere_contribution': date, **terms}
+            else:
+                for field, term in terms.items():
+                    state[field] = logaddexp_py(state[field], term)
+                state['derniere_contribution'] = max(state['derniere_contribution'], date)
+            state['montant_total'] += montant
+
+        with transaction.atomic():
+            ProjectScore.objects.all().delete()
+            ProjectScore.objects.bulk_create(
+                (ProjectScore(projet_id=projet_id, **state) for projet_id, state in scores.items()),
+                batch_size=options['batch_size'],
+            )
+        invalidate_all()
+        self.stdout.write(self.style.SUCCESS(f'{len(scores)} projet(s) classé(s)'))
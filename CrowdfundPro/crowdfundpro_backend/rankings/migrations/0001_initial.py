@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:34
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0008_project_content_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectScore',
+            fields=[
+                ('projet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_classement', serialize=False, to='projects.project')),
+                ('score_jour', models.FloatField(db_index=True)),
+                ('score_semaine', models.FloatField(db_index=True)),
+                ('montant_total', models.DecimalField(db_index=True, decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('derniere_contribution', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Score de classement',
+                'verbose_name_plural': 'Scores de classement',
+                'db_table': 'project_scores',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from django.db import models
+from django.utils import timezone
+
+from projects.models import Project
+
+
+class ProjectScore(models.Model):
+    """
+    Scores de classement d'un projet, maintenus à chaque investissement réussi.
+
+    Les scores de tendance sont des sommes à décroissance vers l'avant, stockées
+    en logarithme (voir `rankings.scoring`) : l'ordre entre projets ne dépend
+    pas de l'instant de lecture, un index suffit donc pour le top-k.
+    """
+    projet = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_classement',
+    )
+    score_jour = models.FloatField(db_index=True)
+    score_semaine = models.FloatField(db_index=True)
+    montant_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), db_index=True)
+    derniere_contribution = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'project_scores'
+        verbose_name = 'Score de classement'
+        verbose_name_plural = 'Scores de classement'
+
+    def __str__(self):
+        return f"{self.projet_id} - {self.score_jour:.2f} / {self.score_semaine:.2f}"
@@ -0,0 +1,48 @@
+"""
+Décroissance vers l'avant (forward decay) pour les classements de tendance.
+
+Un investissement de montant `a` à l'instant `t` contribue
+`a * 2 ** ((t - L) / demi_vie)` au score, où `L` est un repère fixe. La valeur
+décroissante à l'instant `now` s'obtient en divisant par `2 ** ((now - L) / demi_vie)`,
+facteur commun à tous les projets : le classement se fait donc sur le score
+brut, qui ne fait que croître, sans recalcul périodique.
+
+Les scores sont stockés en logarithme pour éviter tout dépassement ; l'ajout
+d'une contribution est un `logaddexp` exprimé en SQL, appliqué par un seul
+UPDATE avec F().
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+
+LANDMARK = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# fenêtre -> (champ de ProjectScore, demi-vie)
+WINDOWS = {
+    'jour': ('score_jour', timedelta(days=1)),
+    'semaine': ('score_semaine', timedelta(days=7)),
+}
+
+
+def log_contribution(montant, when, half_life):
+    """Logarithme de la contribution d'un montant versé à l'instant `when`."""
+    return math.log(float(montant)) + (when - LANDMARK) / half_life * math.log(2)
+
+
+def decayed_value(log_score, now, half_life):
+    """Somme décroissante (en euros « récents ») correspondant à un score stocké."""
+    return math.exp(log_score - (now - LANDMARK) / half_life * math.log(2))
+
+
+def logaddexp(field, term):
+    """Expression SQL de log(exp(field) + exp(term)), numériquement stable."""
+    term = Value(term)
+    return Greatest(F(field), term) + Ln(1 + Exp(-Abs(F(field) - term)))
+
+
+def logaddexp_py(a, b):
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from investments.models import Investment
+from projects.models import Project
+from .leaderboard import invalidate_all, record_refund, record_success
+
+
+@receiver(post_save, sender=Investment)
+def update_scores(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_statut_paiement_initial', None)
+    if instance.statut_paiement == 'REUSSI' and previous != 'REUSSI':
+        projet_id, montant = instance.projet_id, instance.montant
+        transaction.on_commit(lambda: record_success(projet_id, montant))
+    elif previous == 'REUSSI' and instance.statut_paiement != 'REUSSI':
+        projet_id, montant = instance.projet_id, instance.montant
+        transaction.on_commit(lambda: record_refund(projet_id, montant))
+
+
+@receiver(post_save, sender=Project)
+def project_status_changed(sender, instance, created, raw=False, **kwargs):
+    if not created and getattr(instance, '_statut_initial', None) != instance.statut:
+        transaction.on_commit(invalidate_all)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_all)
@@ -0,0 +1,79 @@
+import math
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from investments.models import Investment
+from projects.models import Project
+from users.models import User
+from .leaderboard import leaderboards, record_success
+from .models import ProjectScore
+from .scoring import WINDOWS, log_contribution, logaddexp_py
+
+
+class ProjectScoreTests(TestCase):
+    """
+    Scores de tendance mis à jour par l'UPDATE logaddexp, comparés au calcul Python.
+    """
+
+    def setUp(self):
+        for leaderboard in leaderboards.values():
+            leaderboard.invalidate()
+        porteur = User.objects.create_user('porteur@example.com', 'secret', username='porteur', role='PORTEUR')
+        self.investisseur = User.objects.create_user('inv@example.com', 'secret', username='inv', role='INVESTISSEUR')
+        self.projet = Project.objects.create(
+            titre='Projet', description='d' * 60, objectif=Decimal('10000'), statut='EN_COURS',
+            date_limite=timezone.now() + timedelta(days=30), porteur=porteur,
+        )
+
+    def _expected(self, contributions):
+        scores = {}
+        for montant, when in contributions:
+            for field, half_life in WINDOWS.values():
+                term = log_contribution(montant, when, half_life)
+                scores[field] = term if field not in scores else logaddexp_py(scores[field], term)
+        return scores
+
+    def test_update_matches_python_logaddexp(self):
+        now = timezone.now()
+        # Écarts d'ordre de grandeur et contributions anciennes : termes très inégaux
+        contributions = [
+            (Decimal('100'), now - timedelta(days=3)),
+            (Decimal('25.50'), now),
+            (Decimal('100000'), now - timedelta(days=20)),
+            (Decimal('1'), now + timedelta(hours=1)),
+        ]
+        for montant, when in contributions:
+            record_success(self.projet.pk, montant, when=when)
+
+        score = ProjectScore.objects.get(projet=self.projet)
+        for field, expected in self._expected(contributions).items():
+            with self.subTest(field=field):
+                self.assertTrue(math.isfinite(getattr(score, field)))
+                self.assertAlmostEqual(getattr(score, field), expected, places=9)
+        self.assertEqual(score.montant_total, Decimal('100126.50'))
+        self.assertEqual(score.derniere_contribution, now + timedelta(hours=1))
+
+    def test_rebuild_matches_incremental_scores(self):
+        for montant in (40, 60, 500):
+            with self.captureOnCommitCallbacks(execute=True):
+                Investment.objects.create(
+                    investisseur=self.investisseur, projet=self.projet, montant=Decimal(montant),
+                    statut_paiement='REUSSI', methode_paiement='CARTE',
+                )
+        incremental = ProjectScore.objects.values().get(projet=self.projet)
+
+        call_command('rebuild_rankings', stdout=StringIO())
+
+        rebuilt = ProjectScore.objects.values().get(projet=self.projet)
+        self.assertEqual(rebuilt['montant_total'], Decimal('600.00'))
+        self.assertEqual(rebuilt['montant_total'], incremental['montant_total'])
+        for field, _half_life in WINDOWS.values():
+            with self.subTest(field=field):
+                # Même contributions, instants à la milliseconde près
+                self.assertAlmostEqual(rebuilt[field], incremental[field], places=6)
+        self.assertEqual([projet_id for _score, projet_id in leaderboards['total'].top(10)], [self.projet.pk])
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from projects.models import Project
+from projects.serializers import ProjectListSerializer
+from projects.views import projets_visibles
+from .leaderboard import leaderboards
+from .scoring import WINDOWS, decayed_value
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def trending(request):
+    """
+    Projets tendance : `window=jour|semaine` (sommes investies récemment, à
+    demi-vie d'un jour / d'une semaine) ou `window=total` (plus financés).
+    """
+    window = request.query_params.get('window', 'jour')
+    if window not in leaderboards:
+        return Response(
+            {'error': f'Fenêtre inconnue (valeurs possibles : {", ".join(leaderboards)})'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    size = getattr(settings, 'RANKING_TOP_K', 100)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), size)
+    except ValueError:
+        return Response({'error': 'limit doit être un entier'}, status=status.HTTP_400_BAD_REQUEST)
+
+    entries = leaderboards[window].top(limit)
+    projects = {
+        project.pk: project
+        for project in projets_visibles(request.user).filter(
+            pk__in=[projet_id for _score, projet_id in entries]
+        ).for_listing()
+    }
+
+    now = timezone.now()
+    results = []
+    for score, projet_id in entries:
+        project = projects.get(projet_id)
+        if project is None:
+            continue
+        data = ProjectListSerializer(project, context={'request': request}).data
+        if window == 'total':
+            data['score'] = float(score)
+        else:
+            data['score'] = round(decayed_value(score, now, WINDOWS[window][1]), 2)
+        results.append(data)
+    return Response({'window': window, 'results': results})
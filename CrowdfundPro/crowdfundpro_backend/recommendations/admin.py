@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import Recommendation
+
+
+@admin.register(Recommendation)
+class RecommendationAdmin(admin.ModelAdmin):
+    """
+    Administration pour les recommandations précalculées
+    """
+    list_display = ('investisseur', 'nombre_projets', 'date_calcul')
+    search_fields = ('investisseur__email',)
+    readonly_fields = ('investisseur', 'projet_ids', 'score_values', 'date_calcul')
+    exclude = ('projets', 'scores')
+
+    def nombre_projets(self, obj):
+        return len(obj.projet_ids)
+    nombre_projets.short_description = 'Projets'
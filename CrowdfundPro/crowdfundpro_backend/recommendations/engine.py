@@ -0,0 +1,183 @@
+"""
+Calcul des recommandations par lots, vectorisé avec NumPy / SciPy.
+
+Trois composantes, normalisées par investisseur puis pondérées
+(`RECOMMENDATION_WEIGHTS`) :
+- collaborative : similarité cosinus projet-projet sur la matrice creuse
+  investisseurs × projets (poids log(1 + montant)) ;
+- contenu : profil texte de l'investisseur (moyenne des vecteurs TF-IDF
+  hachés titre + description de ses projets) comparé aux candidats ;
+- proximité : distance entre le barycentre des projets financés et le projet.
+
+Seuls les projets EN_COURS sont candidats ; ceux où l'investisseur a déjà
+investi sont exclus. Les investisseurs sont traités par blocs dont la taille
+borne la mémoire des matrices denses (bloc × candidats).
+"""
+import math
+import re
+import zlib
+from array import array
+
+import numpy as np
+from scipy import sparse
+
+from investments.models import Investment
+from projects.models import Project
+
+TOKEN_RE = re.compile(r'\w{3,}')
+HASH_DIM = 2 ** 18
+EARTH_RADIUS_KM = 6371.0
+# Cellules (investisseurs × candidats) d'un bloc dense
+MAX_BLOCK_CELLS = 5_000_000
+
+
+def load_interactions(chunk_size=100000):
+    """Tableaux (investisseur_id, projet_id, montant) des investissements non échoués."""
+    investisseurs, projets, montants = array('q'), array('q'), array('d')
+    rows = Investment.objects.exclude(statut_paiement='ECHOUE').order_by().values_list(
+        'investisseur_id', 'projet_id', 'montant'
+    )
+    for investisseur_id, projet_id, montant in rows.iterator(chunk_size=chunk_size):
+        investisseurs.append(investisseur_id)
+        projets.append(projet_id)
+        montants.append(float(montant))
+    return (
+        np.frombuffer(investisseurs, dtype=np.int64),
+        np.frombuffer(projets, dtype=np.int64),
+        np.frombuffer(montants, dtype=np.float64),
+    )
+
+
+def load_projects(chunk_size=10000):
+    """Identifiants triés, textes, coordonnées et masque des candidats des projets validés."""
+    ids, textes, lat, lon, candidats = [], [], [], [], []
+    rows = Project.objects.exclude(statut='EN_ATTENTE_VALIDATION').order_by('id').values_list(
+        'id', 'titre', 'description', 'latitude', 'longitude', 'statut'
+    )
+    for pk, titre, description, latitude, longitude, statut in rows.iterator(chunk_size=chunk_size):
+        ids.append(pk)
+        textes.append(f'{titre} {description}')
+        lat.append(math.nan if latitude is None else float(latitude))
+        lon.append(math.nan if longitude is None else float(longitude))
+        candidats.append(statut == 'EN_COURS')
+    return np.array(ids, dtype=np.int64), textes, np.array(lat), np.array(lon), np.array(candidats, dtype=bool)
+
+
+def text_matrix(textes):
+    """Matrice creuse TF-IDF (projets × HASH_DIM) à lignes normalisées, tokens hachés."""
+    indptr, indices, counts = [0], array('i'), array('d')
+    for texte in textes:
+        hashes = {}
+        for token in TOKEN_RE.findall(texte.lower()):
+            h = zlib.crc32(token.encode()) % HASH_DIM
+            hashes[h] = hashes.get(h, 0) + 1
+        indices.extend(hashes.keys())
+        counts.extend(hashes.values())
+        indptr.append(len(indices))
+    tf = sparse.csr_matrix(
+        (1 + np.log(np.frombuffer(counts, dtype=np.float64)), np.frombuffer(indices, dtype=np.int32), indptr),
+        shape=(len(textes), HASH_DIM),
+    )
+    df = np.bincount(tf.indices, minlength=HASH_DIM)
+    idf = np.log((1 + len(textes)) / (1 + df)) + 1
+    tfidf = tf @ sparse.diags(idf)
+    return normalize_rows(tfidf)
+
+
+def normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def _row_max_normalize(block):
+    high = block.max(axis=1, keepdims=True)
+    high[high <= 0] = 1
+    return block / high
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1)))
+
+
+def compute(top_n, weights, distance_km, block_size=1000):
+    """
+    Génère (investisseur_id, projet_ids int32, scores float32) pour chaque
+    investisseur ayant au moins une recommandation.
+    """
+    investisseurs, projets, montants = load_interactions()
+    project_ids, textes, lat, lon, candidats = load_projects()
+    if not len(investisseurs) or not candidats.any():
+        return
+
+    # Index des projets (les investissements sur des projets non validés sont ignorés)
+    columns = np.searchsorted(project_ids, projets)
+    known = (columns < len(project_ids)) & (project_ids[np.minimum(columns, len(project_ids) - 1)] == projets)
+    user_ids, rows = np.unique(investisseurs[known], return_inverse=True)
+    interactions = sparse.csr_matrix(
+        (montants[known], (rows, columns[known])), shape=(len(user_ids), len(project_ids))
+    )
+    interactions.data = np.log1p(interactions.data)
+
+    candidate_index = np.flatnonzero(candidats)
+    candidate_ids = project_ids[candidate_index].astype('<i4')
+
+    # Collaboratif : similarités cosinus projets × candidats
+    column_norms = np.sqrt(np.asarray(interactions.multiply(interactions).sum(axis=0)).ravel())
+    column_norms[column_norms == 0] = 1
+    normalized = interactions @ sparse.diags(1 / column_norms)
+    similarity = (normalized.T @ normalized[:, candidate_index]).tocsr()
+
+    # Contenu et proximité : profils moyens (pondérés par les montants)
+    texts = text_matrix(textes)
+    candidate_texts = texts[candidate_index].T.tocsc()
+    row_sums = np.asarray(interactions.sum(axis=1)).ravel()
+    row_sums[row_sums == 0] = 1
+    profiles = (sparse.diags(1 / row_sums) @ interactions).tocsr()
+
+    located = ~np.isnan(lat)
+    weights_located = np.asarray(profiles[:, located].sum(axis=1)).ravel()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        user_lat = (profiles[:, located] @ lat[located]) / weights_located
+        user_lon = (profiles[:, located] @ lon[located]) / weights_located
+    candidate_lat, candidate_lon = lat[candidate_index], lon[candidate_index]
+
+    rows_per_block = max(1, min(block_size, MAX_BLOCK_CELLS // len(candidate_index)))
+    for start in range(0, len(user_ids), rows_per_block):
+        stop = min(start + rows_per_block, len(user_ids))
+        block = interactions[start:stop]
+
+        collaborative = _row_max_normalize((block @ similarity).toarray())
+        content = _row_max_normalize((profiles[start:stop] @ texts @ candidate_texts).toarray())
+        with np.errstate(invalid='ignore'):
+            distances = _haversine(
+                user_lat[start:stop, None], user_lon[start:stop, None], candidate_lat[None, :], candidate_lon[None, :]
+            )
+        proximity = np.nan_to_num(np.exp(-distances / distance_km), nan=0.0)
+
+        scores = (
+            weights.get('collaboratif', 0) * collaborative
+            + weights.get('contenu', 0) * content
+            + weights.get('proximite', 0) * proximity
+        )
+        # Projets déjà financés par l'investisseur
+        held = block[:, candidate_index].tocoo()
+        scores[held.row, held.col] = -np.inf
+
+        n = min(top_n, scores.shape[1])
+        best = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+        for offset in range(stop - start):
+            keep = best_scores[offset] > 0
+            if keep.any():
+                yield (
+                    int(user_ids[start + offset]),
+                    candidate_ids[best[offset][keep]],
+                    best_scores[offset][keep].astype('<f4'),
+                )
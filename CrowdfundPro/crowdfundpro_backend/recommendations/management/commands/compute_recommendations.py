@@ -0,0 +1,57 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from recommendations.engine import compute
+from recommendations.models import Recommendation
+
+
+class Command(BaseCommand):
+    help = "Précalcule les projets recommandés à chaque investisseur"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-n', type=int, default=getattr(settings, 'RECOMMENDATION_TOP_N', 20))
+        parser.add_argument('--block-size', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        debut = time.perf_counter()
+        date_calcul = timezone.now()
+        results = compute(
+            top_n=options['top_n'],
+            weights=getattr(settings, 'RECOMMENDATION_WEIGHTS', {'collaboratif': 0.6, 'contenu': 0.3, 'proximite': 0.1}),
+            distance_km=getattr(settings, 'RECOMMENDATION_DISTANCE_KM', 50),
+            block_size=options['block_size'],
+        )
+
+        total = 0
+        batch = []
+        for investisseur_id, projet_ids, scores in results:
+            batch.append(Recommendation(
+                investisseur_id=investisseur_id,
+                projets=projet_ids.tobytes(),
+                scores=scores.tobytes(),
+                date_calcul=date_calcul,
+            ))
+            if len(batch) >= options['batch_size']:
+                total += self._write(batch)
+        total += self._write(batch)
+
+        # Investisseurs sans recommandation à l'issue de ce calcul
+        obsoletes, _ = Recommendation.objects.filter(date_calcul__lt=date_calcul).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} investisseur(s) mis à jour, {obsoletes} supprimé(s) en {time.perf_counter() - debut:.1f}s'
+        ))
+
+    def _write(self, batch):
+        Recommendation.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['investisseur'],
+            update_fields=['projets', 'scores', 'date_calcul'],
+        )
+        count = len(batch)
+        batch.clear()
+        return count
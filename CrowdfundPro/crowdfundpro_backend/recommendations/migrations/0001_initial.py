@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0005_purge_expired_tokens_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recommendation',
+            fields=[
+                ('investisseur', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recommandations', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('projets', models.BinaryField()),
+                ('scores', models.BinaryField()),
+                ('date_calcul', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Recommandation',
+                'verbose_name_plural': 'Recommandations',
+                'db_table': 'recommendations',
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+import numpy as np
+from django.db import models
+from django.utils import timezone
+
+from users.models import User
+
+
+class Recommendation(models.Model):
+    """
+    Projets recommandés à un investisseur, précalculés par
+    `compute_recommendations`. Les identifiants (int32) et scores (float32)
+    sont stockés en tableaux binaires : une ligne par investisseur, lue en une
+    requête par clé primaire.
+    """
+    investisseur = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='recommandations',
+    )
+    projets = models.BinaryField()
+    scores = models.BinaryField()
+    date_calcul = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'recommendations'
+        verbose_name = 'Recommandation'
+        verbose_name_plural = 'Recommandations'
+
+    def __str__(self):
+        return f"{self.investisseur_id} - {len(self.projet_ids)} projet(s)"
+
+    @property
+    def projet_ids(self):
+        return np.frombuffer(self.projets, dtype='<i4').tolist()
+
+    @property
+    def score_values(self):
+        return np.frombuffer(self.scores, dtype='<f4').tolist()
@@ -0,0 +1,59 @@
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from projects.models import Project
+from projects.serializers import ProjectListSerializer
+from rankings.leaderboard import leaderboards
+from .models import Recommendation
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def recommendations(request):
+    """
+    Projets recommandés à l'investisseur connecté (précalculés). Sans
+    recommandation personnalisée (nouvel investisseur), les projets tendance
+    sont proposés.
+    """
+    user = request.user
+    if user.role != 'INVESTISSEUR':
+        return Response({'error': 'Accès non autorisé'}, status=status.HTTP_403_FORBIDDEN)
+
+    top_n = getattr(settings, 'RECOMMENDATION_TOP_N', 20)
+    try:
+        limit = min(max(int(request.query_params.get('limit', top_n)), 1), top_n)
+    except ValueError:
+        return Response({'error': 'limit doit être un entier'}, status=status.HTTP_400_BAD_REQUEST)
+
+    stored = Recommendation.objects.filter(investisseur=user).first()
+    if stored is not None:
+        source = 'personnalise'
+        entries = list(zip(stored.projet_ids, stored.score_values))
+    else:
+        source = 'tendance'
+        entries = [(projet_id, None) for _score, projet_id in leaderboards['jour'].top(limit)]
+
+    # Sur-sélection : certains projets ont pu être clôturés depuis le calcul
+    projects = {
+        project.pk: project
+        for project in Project.objects.filter(
+            statut='EN_COURS', pk__in=[projet_id for projet_id, _score in entries]
+        ).for_listing()
+    }
+    results = []
+    for projet_id, score in entries:
+        project = projects.get(projet_id)
+        if project is None:
+            continue
+        data = ProjectListSerializer(project, context={'request': request}).data
+        data['score'] = None if score is None else round(score, 4)
+        results.append(data)
+        if len(results) == limit:
+            break
+    return Response({
+        'source': source,
+        'date_calcul': stored.date_calcul if stored is not None else None,
+        'results': results,
+    })
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from .models import Blob, UploadSession
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    """
+    Administration pour les sessions de téléversement
+    """
+    list_display = ('filename', 'owner', 'kind', 'offset', 'size', 'statut', 'date_creation', 'expires_at')
+    list_filter = ('statut', 'kind')
+    search_fields = ('filename', 'owner__email')
+    readonly_fields = ('id', 'offset', 'size', 'chunk_size', 'sha256', 'date_creation')
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    """
+    Administration pour les blobs (fichiers dédupliqués)
+    """
+    list_display = ('name', 'size', 'refcount', 'date_creation', 'date_derniere_utilisation')
+    list_filter = ('date_creation',)
+    search_fields = ('name', 'digest')
+    readonly_fields = ('name', 'digest', 'size', 'refcount', 'date_creation', 'date_derniere_utilisation')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class UploadsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'uploads'
+    verbose_name = 'Téléversements'
+
+    def ready(self):
+        from . import signals  # noqa: F401
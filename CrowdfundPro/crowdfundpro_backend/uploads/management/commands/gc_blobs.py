@@ -0,0 +1,58 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from archive.models import ArchivedProject
+from projects.models import Project
+from uploads.models import Blob
+from uploads.storage import content_storage, is_blob
+
+
+class Command(BaseCommand):
+    help = "Supprime les blobs qui ne sont plus référencés par aucun projet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=24,
+            help="Ne supprime que les blobs inutilisés depuis ce délai (téléversements en cours)",
+        )
+        parser.add_argument(
+            '--recount', action='store_true',
+            help='Recalcule les compteurs de références à partir des projets (et archives) avant la collecte',
+        )
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self._recount()
+
+        limite = timezone.now() - timedelta(hours=options['grace_hours'])
+        storage = content_storage()
+        total = 0
+        for name in Blob.objects.filter(refcount__lte=0, date_derniere_utilisation__lt=limite).values_list('pk', flat=True):
+            with transaction.atomic():
+                # Revérifié sous verrou : le blob a pu être réutilisé entre-temps
+                deleted, _ = Blob.objects.filter(
+                    pk=name, refcount__lte=0, date_derniere_utilisation__lt=limite
+                ).delete()
+            if deleted:
+                storage.purge(name)
+                total += 1
+        self.stdout.write(self.style.SUCCESS(f'{total} blob(s) supprimé(s)'))
+
+    def _recount(self):
+        references = Counter(
+            name
+            for model in (Project, ArchivedProject)
+            for names in model.objects.values_list(*model.FILE_FIELDS).iterator()
+            for name in names if is_blob(name)
+        )
+        updated = 0
+        for blob in Blob.objects.only('refcount').iterator():
+            refcount = references.get(blob.pk, 0)
+            if blob.refcount != refcount:
+                Blob.objects.filter(pk=blob.pk).update(refcount=refcount)
+                updated += 1
+        self.stdout.write(f'{updated} compteur(s) de références corrigé(s)')
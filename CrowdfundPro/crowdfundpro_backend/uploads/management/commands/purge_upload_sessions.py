@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from uploads.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = "Supprime les sessions de téléversement expirées ou terminées et leurs fichiers temporaires"
+
+    def handle(self, *args, **options):
+        sessions = UploadSession.objects.filter(Q(expires_at__lte=timezone.now()) | Q(statut='TERMINE'))
+        total = 0
+        for session in sessions.iterator():
+            session.delete_temp_file()
+            session.delete()
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f'{total} session(s) de téléversement supprimée(s)'))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uploads.models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('business_plan', 'Business plan'), ('plan_juridique', 'Plan juridique')], max_length=20)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField(help_text='Taille totale annoncée, en octets')),
+                ('offset', models.PositiveBigIntegerField(default=0, help_text='Octets reçus et validés')),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(blank=True, help_text='Empreinte attendue du fichier complet (optionnelle)', max_length=64)),
+                ('statut', models.CharField(choices=[('EN_COURS', 'En cours'), ('TERMINE', 'Terminé')], default='EN_COURS', max_length=10)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True, default=uploads.models.default_expiration)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Session de téléversement',
+                'verbose_name_plural': 'Sessions de téléversement',
+                'db_table': 'upload_sessions',
+                'ordering': ['-date_creation'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:27
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0002_purge_upload_sessions_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('digest', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('refcount', models.IntegerField(db_index=True, default=0)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_derniere_utilisation', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Blob',
+                'verbose_name_plural': 'Blobs',
+                'db_table': 'blobs',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='gc_blobs',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'gc_blobs'",
+            'schedule_type': 'D',
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='gc_blobs').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0003_blob'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,90 @@
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+def default_expiration():
+    return timezone.now() + timedelta(hours=getattr(settings, 'CHUNKED_UPLOAD_EXPIRATION_HOURS', 24))
+
+
+class UploadSession(models.Model):
+    """
+    Téléversement d'un document en plusieurs morceaux, reprenable.
+
+    Les octets reçus sont ajoutés à un fichier temporaire hors de MEDIA_ROOT ;
+    `offset` est le nombre d'octets validés. Une fois complet, le fichier est
+    rattaché au champ `kind` d'un projet.
+    """
+    KIND_CHOICES = (
+        ('business_plan', 'Business plan'),
+        ('plan_juridique', 'Plan juridique'),
+    )
+    STATUT_CHOICES = (
+        ('EN_COURS', 'En cours'),
+        ('TERMINE', 'Terminé'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Taille totale annoncée, en octets")
+    offset = models.PositiveBigIntegerField(default=0, help_text="Octets reçus et validés")
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Empreinte attendue du fichier complet (optionnelle)")
+    statut = models.CharField(max_length=10, choices=STATUT_CHOICES, default='EN_COURS')
+    date_creation = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=default_expiration, db_index=True)
+
+    class Meta:
+        db_table = 'upload_sessions'
+        verbose_name = 'Session de téléversement'
+        verbose_name_plural = 'Sessions de téléversement'
+        ordering = ['-date_creation']
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def temp_path(self):
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f'{self.id}.part')
+
+    @property
+    def est_complet(self):
+        return self.offset == self.size
+
+    def delete_temp_file(self):
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class Blob(models.Model):
+    """
+    Fichier stocké une seule fois sous son empreinte SHA-256.
+
+    `refcount` est le nombre de champs fichier de projet qui le référencent.
+    """
+    name = models.CharField(max_length=255, primary_key=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.IntegerField(default=0, db_index=True)
+    date_creation = models.DateTimeField(auto_now_add=True)
+    date_derniere_utilisation = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'blobs'
+        verbose_name = 'Blob'
+        verbose_name_plural = 'Blobs'
+
+    def __str__(self):
+        return self.name
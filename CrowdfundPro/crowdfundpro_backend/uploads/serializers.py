@@ -0,0 +1,58 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import UploadSession
+from .validators import MAX_DOCUMENT_SIZE, validate_filename
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Sérialiseur pour l'état d'un téléversement (reprise à partir de `offset`)
+    """
+    class Meta:
+        model = UploadSession
+        fields = ('id', 'kind', 'filename', 'size', 'offset', 'chunk_size', 'statut', 'expires_at')
+        read_only_fields = fields
+
+
+class UploadSessionCreateSerializer(serializers.ModelSerializer):
+    """
+    Sérialiseur pour ouvrir une session de téléversement
+    """
+    class Meta:
+        model = UploadSession
+        fields = ('kind', 'filename', 'size', 'sha256')
+
+    def validate_filename(self, value):
+        error = validate_filename(value)
+        if error:
+            raise serializers.ValidationError(error)
+        return value
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Le fichier est vide.")
+        if value > MAX_DOCUMENT_SIZE:
+            raise serializers.ValidationError("Le document ne doit pas dépasser 10MB.")
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and (len(value) != 64 or any(c not in '0123456789abcdef' for c in value)):
+            raise serializers.ValidationError("Empreinte SHA-256 invalide.")
+        return value
+
+    def create(self, validated_data):
+        validated_data['owner'] = self.context['request'].user
+        validated_data['chunk_size'] = settings.CHUNKED_UPLOAD_CHUNK_SIZE
+        return super().create(validated_data)
+
+    def to_representation(self, instance):
+        return UploadSessionSerializer(instance, context=self.context).data
+
+
+class UploadCompleteSerializer(serializers.Serializer):
+    """
+    Sérialiseur pour rattacher un téléversement terminé à un projet
+    """
+    project = serializers.IntegerField()
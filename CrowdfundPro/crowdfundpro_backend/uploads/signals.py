@@ -0,0 +1,39 @@
+"""
+Comptage des références aux blobs depuis les champs fichier de Project (et
+des projets archivés, qui reprennent les références du projet d'origine).
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from archive.models import ArchivedProject
+from projects.models import Project
+from .models import Blob
+from .storage import is_blob
+
+
+def _adjust(name, delta):
+    if is_blob(name):
+        Blob.objects.filter(name=name).update(refcount=F('refcount') + delta)
+
+
+@receiver(post_save, sender=Project)
+def update_blob_references(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for ancien, nouveau in instance.fichiers_modifies().values():
+        _adjust(nouveau, 1)
+        _adjust(ancien, -1)
+
+
+@receiver(post_delete, sender=Project)
+def release_blob_references(sender, instance, **kwargs):
+    initiaux = getattr(instance, '_fichiers_initiaux', {})
+    for name in Project.FILE_FIELDS:
+        _adjust(initiaux.get(name), -1)
+
+
+@receiver(post_delete, sender=ArchivedProject)
+def release_archived_blob_references(sender, instance, **kwargs):
+    for name in ArchivedProject.FILE_FIELDS:
+        _adjust(getattr(instance, name).name, -1)
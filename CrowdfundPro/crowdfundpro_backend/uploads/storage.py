@@ -0,0 +1,103 @@
+"""
+Stockage adressé par le contenu des fichiers de projet.
+
+Chaque fichier est enregistré une seule fois sous `blobs/ab/cd/<sha256><ext>`.
+Le fichier reçu est lu une seule fois : copié dans un fichier temporaire
+pendant le calcul de l'empreinte, puis renommé en blob, ou supprimé si un
+blob identique existe déjà. Un même blob peut donc être référencé par
+plusieurs projets ; `Blob.refcount` compte ces références (voir `signals`) et
+`gc_blobs` supprime les blobs qui ne sont plus référencés.
+
+Le contenu d'une URL de blob ne change jamais : le serveur web peut servir
+`MEDIA_URL/blobs/` avec `Cache-Control: public, max-age=31536000, immutable`.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from django.utils.functional import LazyObject
+
+BLOB_PREFIX = 'blobs'
+
+
+def blob_name(digest, extension):
+    return f'{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_PREFIX + '/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        # Une seule lecture du contenu : copie dans un fichier temporaire en calculant l'empreinte
+        temp_dir = self.path(BLOB_PREFIX)
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir, suffix='.tmp')
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            content.seek(0)
+            with os.fdopen(fd, 'wb') as destination:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    destination.write(chunk)
+
+            name = blob_name(digest.hexdigest(), os.path.splitext(name)[1].lower())
+            if self.exists(name):
+                os.remove(temp_path)
+            else:
+                self._publish(temp_path, name)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._register(name, digest.hexdigest(), size)
+        return name
+
+    def _publish(self, temp_path, name):
+        """Renomme le fichier temporaire en blob : jamais de blob partiel visible."""
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(temp_path, self.file_permissions_mode)
+        os.replace(temp_path, full_path)
+
+    @staticmethod
+    def _register(name, digest, size):
+        from .models import Blob
+        blob, created = Blob.objects.get_or_create(name=name, defaults={'digest': digest, 'size': size})
+        if not created:
+            # Protège un blob fraîchement réutilisé d'une collecte en cours
+            Blob.objects.filter(pk=blob.pk).update(date_derniere_utilisation=timezone.now())
+
+    def delete(self, name):
+        # Un blob peut être partagé : seul gc_blobs supprime les fichiers
+        if not is_blob(name):
+            super().delete(name)
+
+    def purge(self, name):
+        super().delete(name)
+
+
+class _ContentStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage()
+
+
+_content_storage = _ContentStorage()
+
+
+def content_storage():
+    """Stockage des champs fichier de Project (callable : non sérialisé dans les migrations)."""
+    return _content_storage
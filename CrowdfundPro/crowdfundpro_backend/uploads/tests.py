@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from .models import Blob
+from .storage import ContentAddressedStorage
+
+
+class ContentAddressedStorageTests(TestCase):
+    """
+    Enregistrement des blobs : une lecture du contenu, pas de fichier temporaire restant.
+    """
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=location)
+
+    def _files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.storage.location)
+            for root, _, names in os.walk(self.storage.location) for name in names
+        )
+
+    def test_contenu_lu_une_fois_et_dedoublonne(self):
+        content = ContentFile(b'x' * 200000, name='plan.PDF')
+        with mock.patch.object(ContentFile, 'chunks', wraps=content.chunks) as chunks:
+            name = self.storage.save('projects/documents/plan.PDF', content)
+        self.assertEqual(chunks.call_count, 1)
+        self.assertTrue(name.startswith('blobs/') and name.endswith('.pdf'))
+
+        again = self.storage.save('autre.pdf', ContentFile(b'x' * 200000))
+        self.assertEqual(again, name)
+        self.assertEqual(self._files(), [name])
+        with self.storage.open(name) as stored:
+            self.assertEqual(stored.read(), b'x' * 200000)
+        self.assertEqual(Blob.objects.get(name=name).size, 200000)
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.UploadSessionCreateView.as_view(), name='upload-create'),
+    path('<uuid:pk>/', views.UploadSessionView.as_view(), name='upload-session'),
+    path('<uuid:pk>/complete/', views.UploadCompleteView.as_view(), name='upload-complete'),
+]
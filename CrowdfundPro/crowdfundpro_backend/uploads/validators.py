@@ -0,0 +1,32 @@
+"""
+Validation incrémentale des documents téléversés par morceaux.
+"""
+import os
+
+MAX_DOCUMENT_SIZE = 10 * 1024 * 1024  # 10MB, comme ProjectCreateSerializer
+
+# Extension -> signatures acceptées en début de fichier
+DOCUMENT_SIGNATURES = {
+    '.pdf': (b'%PDF-',),
+    '.doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),  # OLE2 (Word 97-2003)
+    '.docx': (b'PK\x03\x04',),  # archive ZIP (Office Open XML)
+}
+SIGNATURE_LENGTH = max(len(s) for signatures in DOCUMENT_SIGNATURES.values() for s in signatures)
+
+
+def extension(filename):
+    return os.path.splitext(filename)[1].lower()
+
+
+def validate_filename(filename):
+    """Retourne un message d'erreur, ou None si l'extension est acceptée."""
+    if extension(filename) not in DOCUMENT_SIGNATURES:
+        return "Le document doit être au format PDF, DOC ou DOCX."
+    return None
+
+
+def validate_signature(filename, head):
+    """Vérifie que les premiers octets correspondent à l'extension déclarée."""
+    if not head.startswith(DOCUMENT_SIGNATURES[extension(filename)]):
+        return "Le contenu du fichier ne correspond pas à son extension."
+    return None
@@ -0,0 +1,190 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from projects.models import Project
+from projects.serializers import ProjectDetailSerializer
+from .models import UploadSession
+from .serializers import UploadCompleteSerializer, UploadSessionCreateSerializer, UploadSessionSerializer
+from .validators import SIGNATURE_LENGTH, validate_signature
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class IsPorteurOrAdmin(permissions.BasePermission):
+    """
+    Seuls les porteurs (et les admins) téléversent des documents de projet
+    """
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (request.user.is_superuser or request.user.role == 'PORTEUR')
+
+
+def _get_session(request, pk, lock=False):
+    queryset = UploadSession.objects.filter(owner=request.user, statut='EN_COURS')
+    if lock:
+        queryset = queryset.select_for_update()
+    return queryset.filter(pk=pk).first()
+
+
+def _error(message, code, **extra):
+    return Response({'error': message, **extra}, status=code)
+
+
+class UploadSessionCreateView(generics.CreateAPIView):
+    """
+    Vue pour ouvrir une session de téléversement par morceaux
+    """
+    serializer_class = UploadSessionCreateSerializer
+    permission_classes = [IsPorteurOrAdmin]
+
+
+class UploadSessionView(APIView):
+    """
+    GET : état de la session (octets déjà reçus, pour reprendre).
+    PATCH : ajoute un morceau. Le corps est le contenu brut ; les en-têtes
+    `X-Upload-Offset` (position du morceau) et `X-Chunk-Sha256` (empreinte
+    hexadécimale du morceau) sont obligatoires.
+    DELETE : abandonne le téléversement.
+    """
+    permission_classes = [IsPorteurOrAdmin]
+
+    def get(self, request, pk):
+        session = _get_session(request, pk)
+        if session is None:
+            return _error('Téléversement non trouvé', status.HTTP_404_NOT_FOUND)
+        return Response(UploadSessionSerializer(session).data)
+
+    def delete(self, request, pk):
+        session = _get_session(request, pk)
+        if session is None:
+            return _error('Téléversement non trouvé', status.HTTP_404_NOT_FOUND)
+        session.delete_temp_file()
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def patch(self, request, pk):
+        try:
+            offset = int(request.headers['X-Upload-Offset'])
+            checksum = request.headers['X-Chunk-Sha256'].strip().lower()
+            length = int(request.headers.get('Content-Length') or 0)
+        except (KeyError, ValueError):
+            return _error('En-têtes X-Upload-Offset et X-Chunk-Sha256 requis', status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Verrou : deux envois concurrents du même morceau ne s'entrelacent pas
+            session = _get_session(request, pk, lock=True)
+            if session is None:
+                return _error('Téléversement non trouvé', status.HTTP_404_NOT_FOUND)
+            if session.expires_at <= timezone.now():
+                return _error('Téléversement expiré', status.HTTP_410_GONE)
+            if offset != session.offset:
+                return _error('Position invalide', status.HTTP_409_CONFLICT, offset=session.offset)
+            if length <= 0 or length > session.chunk_size:
+                return _error(f'Morceau de 1 à {session.chunk_size} octets attendu', status.HTTP_400_BAD_REQUEST)
+            if offset + length > session.size:
+                return _error('Le morceau dépasse la taille annoncée', status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            if offset == 0 and length < min(SIGNATURE_LENGTH, session.size):
+                return _error(f'Le premier morceau doit faire au moins {SIGNATURE_LENGTH} octets', status.HTTP_400_BAD_REQUEST)
+
+            received, digest, head = self._append(session, request, length)
+
+            if received != length:
+                return _error('Morceau incomplet', status.HTTP_400_BAD_REQUEST, offset=session.offset)
+            if digest != checksum:
+                self._truncate(session)
+                return _error('Somme de contrôle du morceau invalide', status.HTTP_400_BAD_REQUEST, offset=session.offset)
+            if offset == 0:
+                error = validate_signature(session.filename, head)
+                if error:
+                    session.delete_temp_file()
+                    session.delete()
+                    return _error(error, status.HTTP_400_BAD_REQUEST)
+
+            session.offset += received
+            session.save(update_fields=['offset'])
+
+        return Response(UploadSessionSerializer(session).data)
+
+    @staticmethod
+    def _append(session, request, length):
+        """Écrit le corps de la requête à `offset` sans le charger en mémoire."""
+        os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+        digest = hashlib.sha256()
+        received = 0
+        head = b''
+        mode = 'r+b' if os.path.exists(session.temp_path) else 'wb'
+        with open(session.temp_path, mode) as destination:
+            # Écrase un éventuel morceau partiel laissé par un envoi interrompu
+            destination.seek(session.offset)
+            destination.truncate()
+            while received < length:
+                block = request.stream.read(min(READ_BLOCK_SIZE, length - received))
+                if not block:
+                    break
+                if len(head) < SIGNATURE_LENGTH:
+                    head += block[:SIGNATURE_LENGTH - len(head)]
+                digest.update(block)
+                destination.write(block)
+                received += len(block)
+            if received != length:
+                destination.truncate(session.offset)
+        return received, digest.hexdigest(), head
+
+    @staticmethod
+    def _truncate(session):
+        with open(session.temp_path, 'r+b') as destination:
+            destination.truncate(session.offset)
+
+
+class UploadCompleteView(APIView):
+    """
+    Vue pour rattacher un téléversement complet à un projet
+    """
+    permission_classes = [IsPorteurOrAdmin]
+
+    def post(self, request, pk):
+        serializer = UploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            session = _get_session(request, pk, lock=True)
+            if session is None:
+                return _error('Téléversement non trouvé', status.HTTP_404_NOT_FOUND)
+            if not session.est_complet:
+                return _error('Téléversement incomplet', status.HTTP_400_BAD_REQUEST, offset=session.offset)
+
+            projects = Project.objects.all()
+            if not request.user.is_superuser:
+                projects = projects.filter(porteur=request.user)
+            project = projects.filter(pk=serializer.validated_data['project']).first()
+            if project is None:
+                return _error('Projet non trouvé', status.HTTP_404_NOT_FOUND)
+            if project.statut not in ['EN_ATTENTE_VALIDATION', 'EN_COURS']:
+                return _error(
+                    'Seuls les projets en attente de validation ou en cours peuvent être modifiés.',
+                    status.HTTP_400_BAD_REQUEST
+                )
+
+            with open(session.temp_path, 'rb') as source:
+                if session.sha256:
+                    digest = hashlib.sha256()
+                    for block in iter(lambda: source.read(READ_BLOCK_SIZE), b''):
+                        digest.update(block)
+                    if digest.hexdigest() != session.sha256:
+                        return _error('Empreinte du fichier complet invalide', status.HTTP_400_BAD_REQUEST)
+                    source.seek(0)
+                getattr(project, session.kind).save(session.filename, File(source), save=False)
+            project.save()
+
+            session.statut = 'TERMINE'
+            session.save(update_fields=['statut'])
+            transaction.on_commit(session.delete_temp_file)
+
+        return Response(ProjectDetailSerializer(project, context={'request': request}).data)
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from .deletion import schedule_deletion
+from .models import User, UserDeletion
 
 
 @admin.register(User)
@@ -23,4 +24,28 @@ class CustomUserAdmin(UserAdmin):
         ('Informations supplémentaires', {
             'fields': ('email', 'role', 'nom')
         }),
-    ) 
\ No newline at end of file
+    )
+    
+    def delete_model(self, request, obj):
+        # Compte désactivé immédiatement, données supprimées en tâche de fond
+        schedule_deletion(obj, demandee_par=request.user)
+    
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            schedule_deletion(user, demandee_par=request.user)
+    
+    def get_deleted_objects(self, objs, request):
+        # Données supprimées en tâche de fond : pas de parcours des objets liés (Collector)
+        objs = list(objs)
+        return [str(obj) for obj in objs], {self.model._meta.verbose_name_plural: len(objs)}, set(), []
+
+
+@admin.register(UserDeletion)
+class UserDeletionAdmin(admin.ModelAdmin):
+    """
+    Administration pour les suppressions de comptes en tâche de fond
+    """
+    list_display = ('email', 'utilisateur_id', 'statut', 'date_demande', 'date_fin')
+    list_filter = ('statut',)
+    search_fields = ('email',)
+    readonly_fields = ('utilisateur_id', 'email', 'demandee_par', 'compteurs', 'projets_impactes', 'erreur', 'date_demande', 'date_fin')
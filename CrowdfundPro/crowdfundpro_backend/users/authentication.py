@@ -0,0 +1,93 @@
+"""
+Authentification JWT sans requête utilisateur par appel.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from monitoring.metrics import cache_requests
+
+from .models import User, ClaimsUser
+from .revocation import disabled_users
+
+
+class UserLRUCache:
+    """
+    Cache LRU borné (avec durée de vie) des utilisateurs complets, pour les
+    vues qui ont besoin d'autres champs que ceux portés par le jeton.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pk):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pk)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(pk)
+                cache_requests.inc(cache='jwt_user', result='hit')
+                return entry[0]
+
+        cache_requests.inc(cache='jwt_user', result='miss')
+        user = User.objects.filter(pk=pk).first()
+        if user is None:
+            return None
+        with self._lock:
+            self._entries[pk] = (user, now + self.ttl)
+            self._entries.move_to_end(pk)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, pk):
+        with self._lock:
+            self._entries.pop(pk, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserLRUCache(
+    maxsize=getattr(settings, 'JWT_USER_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'JWT_USER_CACHE_TTL', 300),
+)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Construit `request.user` à partir des claims `role` / `is_superuser` /
+    `is_staff` / `is_active` du jeton d'accès, sans charger la ligne `users`.
+
+    Les jetons émis avant l'ajout de ces claims sont authentifiés comme avant,
+    par une requête. Ceux des comptes désactivés ou supprimés sont refusés
+    sans attendre leur expiration (voir `users.revocation.disabled_users`).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+            role = validated_token['role']
+            is_superuser = validated_token['is_superuser']
+        except KeyError:
+            return super().get_user(validated_token)
+
+        is_active = validated_token.get('is_active', True)
+        if not is_active or user_id in disabled_users:
+            raise AuthenticationFailed('Compte désactivé', code='user_inactive')
+        return ClaimsUser.from_claims(
+            user_id,
+            role,
+            is_superuser,
+            validated_token.get('is_staff', False),
+            is_active,
+        )
@@ -0,0 +1,306 @@
+"""
+Suppression des comptes en tâche de fond.
+
+`schedule_deletion` désactive le compte, blackliste ses jetons de
+rafraîchissement et enregistre une `UserDeletion`, sans rien supprimer :
+l'appel est immédiat. La tâche `run` supprime ensuite les données par lots,
+chacun dans sa propre transaction (verrous d'écriture courts), par DELETE
+direct sans passer par le Collector ni les signaux. Les effets des signaux
+sont reproduits en masse :
+
+- investissements réussis de l'utilisateur sur les projets d'autres porteurs :
+  remboursement au registre des financements et retrait du montant total des
+  classements, puis recalcul de `montant_actuel` de ces projets en fin de tâche ;
+- flux de modifications : une suppression par projet et investissement ;
+- fichiers : références aux blobs libérées (`gc_blobs` supprime les fichiers),
+  variantes d'images et fichiers temporaires des téléversements supprimés
+  après validation de chaque lot.
+
+Comme pour l'archivage, le registre des projets supprimés est conservé tel
+quel. Les lots sont idempotents (ils portent sur les lignes restantes, sous
+verrou de la demande) : une tâche interrompue est reprise par
+`resume_user_deletions`. Une tâche qui dépasse `USER_DELETION_TIME_BUDGET`
+secondes se replanifie pour rester sous le délai des workers. Les étapes
+`delete_project_investments` et `delete_projects` servent aussi à la
+suppression d'un projet seul (`projects.deletion`).
+"""
+import logging
+import time
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from archive.models import ArchivedInvestment, ArchivedProject
+from changefeed.models import ChangeLog
+from investments.models import Investment
+from ledger.models import LedgerEntry
+from projects.images import delete_variants
+from projects.models import Project
+from rankings.leaderboard import invalidate_all
+from rankings.models import ProjectScore
+from uploads.models import Blob, UploadSession
+from uploads.storage import is_blob
+from .authentication import user_cache
+from .models import User, UserDeletion
+from .revocation import disabled_users, revocation_filter
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUTS = ('EN_ATTENTE', 'EN_COURS', 'ECHEC')
+
+
+def _chunk_size():
+    return getattr(settings, 'USER_DELETION_CHUNK_SIZE', 2000)
+
+
+def enqueue(deletion_id, func='users.deletion.run'):
+    """
+    Met la tâche en file. Un broker indisponible n'est pas une erreur pour
+    l'appelant : la demande reste en attente et `resume_user_deletions` (ou
+    `resume_project_deletions`) la replanifie.
+    """
+    from django_q.tasks import async_task
+
+    try:
+        async_task(func, deletion_id)
+    except Exception:
+        logger.exception('Impossible de planifier la suppression %s (%s)', deletion_id, func)
+
+
+def schedule_deletion(user, demandee_par=None):
+    """Désactive `user` et planifie la suppression de ses données ; retourne la demande."""
+    with transaction.atomic():
+        deletion = UserDeletion.objects.filter(utilisateur_id=user.pk, statut__in=PENDING_STATUTS).first()
+        if deletion is not None:
+            return deletion
+
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        tokens = list(
+            OutstandingToken.objects.filter(user_id=user.pk, expires_at__gt=timezone.now(), blacklistedtoken__isnull=True)
+            .values_list('pk', 'jti')
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=pk) for pk, _ in tokens], ignore_conflicts=True
+        )
+        deletion = UserDeletion.objects.create(utilisateur_id=user.pk, email=user.email, demandee_par=demandee_par)
+
+        def after_commit():
+            for _, jti in tokens:
+                revocation_filter.add(jti)
+            disabled_users.add(user.pk)
+            user_cache.invalidate(user.pk)
+            enqueue(deletion.pk)
+
+        transaction.on_commit(after_commit)
+    return deletion
+
+
+def _release_blobs(rows):
+    """Décrémente les compteurs des blobs référencés par `rows` (tuples de noms de fichiers)."""
+    references = Counter(name for names in rows for name in names if is_blob(name))
+    for name, count in references.items():
+        Blob.objects.filter(name=name).update(refcount=F('refcount') - count)
+
+
+def _delete_variants_on_commit(rows):
+    """Supprime, après validation, les variantes d'images de `rows` (valeurs de `image_variants`)."""
+    variants = [row for row in rows if row]
+    if variants:
+        transaction.on_commit(lambda: [delete_variants(row) for row in variants])
+
+
+def _delete_investments(deletion, chunk_size):
+    """Investissements de l'utilisateur sur les projets d'autres porteurs."""
+    uid = deletion.utilisateur_id
+    rows = list(
+        Investment.objects.filter(investisseur_id=uid).exclude(projet__porteur_id=uid).order_by('pk')
+        .values_list('pk', 'projet_id', 'projet__porteur_id', 'montant', 'statut_paiement')[:chunk_size]
+    )
+    if not rows:
+        return 0
+    now = timezone.now()
+    refunds = defaultdict(Decimal)
+    journal = []
+    ledger = []
+    for pk, projet_id, porteur_id, montant, statut in rows:
+        journal.append(ChangeLog(
+            entity='investment', object_id=pk, action='delete', porteur_id=porteur_id, investisseur_id=uid, date=now,
+        ))
+        if statut == 'REUSSI':
+            refunds[projet_id] += montant
+            ledger.append(LedgerEntry(projet_id=projet_id, investissement_id=pk, type='REMBOURSEMENT', montant=-montant))
+    LedgerEntry.objects.bulk_create(ledger)
+    for projet_id, montant in refunds.items():
+        ProjectScore.objects.filter(projet_id=projet_id).update(montant_total=F('montant_total') - montant)
+    ChangeLog.objects.bulk_create(journal)
+    investments = Investment.objects.filter(pk__in=[row[0] for row in rows])
+    investments._raw_delete(investments.db)
+    deletion.projets_impactes = sorted(set(deletion.projets_impactes) | set(refunds))
+    return len(rows)
+
+
+def delete_project_investments(projects, chunk_size):
+    """
+    Un lot d'investissements (de tous les investisseurs) sur les projets
+    `projects` (queryset), qui vont être supprimés : le registre reste tel quel.
+    """
+    rows = list(
+        Investment.objects.filter(projet__in=projects.values('pk')).order_by('pk')
+        .values_list('pk', 'investisseur_id', 'projet__porteur_id')[:chunk_size]
+    )
+    if not rows:
+        return 0
+    now = timezone.now()
+    ChangeLog.objects.bulk_create([
+        ChangeLog(
+            entity='investment', object_id=pk, action='delete', porteur_id=porteur_id,
+            investisseur_id=investisseur_id, date=now,
+        )
+        for pk, investisseur_id, porteur_id in rows
+    ])
+    investments = Investment.objects.filter(pk__in=[row[0] for row in rows])
+    investments._raw_delete(investments.db)
+    return len(rows)
+
+
+def delete_projects(projects, chunk_size):
+    """Un lot des projets `projects` (queryset), une fois leurs investissements supprimés."""
+    rows = list(
+        projects.order_by('pk').values_list('pk', 'porteur_id', 'image_variants', *Project.FILE_FIELDS)[:chunk_size]
+    )
+    if not rows:
+        return 0
+    ids = [row[0] for row in rows]
+    now = timezone.now()
+    _release_blobs(row[3:] for row in rows)
+    _delete_variants_on_commit(row[2] for row in rows)
+    ChangeLog.objects.bulk_create([
+        ChangeLog(entity='project', object_id=pk, action='delete', porteur_id=porteur_id, date=now)
+        for pk, porteur_id, *_ in rows
+    ])
+    for queryset in (ProjectScore.objects.filter(projet_id__in=ids), Project.objects.filter(pk__in=ids)):
+        queryset._raw_delete(queryset.db)
+    transaction.on_commit(invalidate_all)
+    return len(rows)
+
+
+def _delete_project_investments(deletion, chunk_size):
+    """Investissements (de tous les investisseurs) sur les projets de l'utilisateur."""
+    return delete_project_investments(Project.objects.filter(porteur_id=deletion.utilisateur_id), chunk_size)
+
+
+def _delete_projects(deletion, chunk_size):
+    return delete_projects(Project.objects.filter(porteur_id=deletion.utilisateur_id), chunk_size)
+
+
+def _delete_archived_investments(deletion, chunk_size):
+    """Investissements archivés de l'utilisateur et ceux de ses projets archivés."""
+    uid = deletion.utilisateur_id
+    ids = list(
+        ArchivedInvestment.objects.filter(investisseur_id=uid).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+    )
+    if len(ids) < chunk_size:
+        ids += ArchivedInvestment.objects.filter(projet__porteur_id=uid).order_by('pk').values_list(
+            'pk', flat=True
+        )[:chunk_size - len(ids)]
+    if not ids:
+        return 0
+    investments = ArchivedInvestment.objects.filter(pk__in=ids)
+    investments._raw_delete(investments.db)
+    return len(ids)
+
+
+def _delete_archived_projects(deletion, chunk_size):
+    rows = list(
+        ArchivedProject.objects.filter(porteur_id=deletion.utilisateur_id).order_by('pk')
+        .values_list('pk', 'image_variants', *ArchivedProject.FILE_FIELDS)[:chunk_size]
+    )
+    if not rows:
+        return 0
+    _release_blobs(row[2:] for row in rows)
+    _delete_variants_on_commit(row[1] for row in rows)
+    projects = ArchivedProject.objects.filter(pk__in=[row[0] for row in rows])
+    projects._raw_delete(projects.db)
+    return len(rows)
+
+
+def _delete_uploads(deletion, chunk_size):
+    sessions = list(UploadSession.objects.filter(owner_id=deletion.utilisateur_id).order_by('pk')[:chunk_size])
+    if not sessions:
+        return 0
+    queryset = UploadSession.objects.filter(pk__in=[session.pk for session in sessions])
+    queryset._raw_delete(queryset.db)
+    transaction.on_commit(lambda: [session.delete_temp_file() for session in sessions])
+    return len(sessions)
+
+
+# Dans l'ordre : les investissements avant les projets qu'ils référencent
+STEPS = (
+    ('investissements', _delete_investments),
+    ('investissements_projets', _delete_project_investments),
+    ('projets', _delete_projects),
+    ('investissements_archives', _delete_archived_investments),
+    ('projets_archives', _delete_archived_projects),
+    ('televersements', _delete_uploads),
+)
+
+
+def _chunk(deletion_id, step, chunk_size):
+    """Un lot d'une étape, sous verrou de la demande ; retourne le nombre de lignes supprimées."""
+    with transaction.atomic():
+        deletion = UserDeletion.objects.select_for_update().get(pk=deletion_id)
+        name, delete = step
+        count = delete(deletion, chunk_size)
+        if count:
+            deletion.compteurs[name] = deletion.compteurs.get(name, 0) + count
+            deletion.save(update_fields=['compteurs', 'projets_impactes', 'date_maj'])
+    return count
+
+
+def _recompute(deletion_id, deadline):
+    """Recalcule montant_actuel des projets restants ; False si le temps est écoulé avant la fin."""
+    deletion = UserDeletion.objects.get(pk=deletion_id)
+    remaining = list(deletion.projets_impactes)
+    while remaining:
+        if time.monotonic() > deadline:
+            UserDeletion.objects.filter(pk=deletion_id).update(projets_impactes=remaining, date_maj=timezone.now())
+            return False
+        project = Project.objects.filter(pk=remaining.pop()).first()
+        if project is not None:
+            project.update_montant_actuel()
+    UserDeletion.objects.filter(pk=deletion_id).update(projets_impactes=[], date_maj=timezone.now())
+    return True
+
+
+def run(deletion_id):
+    """Tâche de suppression : reprend là où la précédente s'est arrêtée."""
+    deletion = UserDeletion.objects.filter(pk=deletion_id, statut__in=PENDING_STATUTS).first()
+    if deletion is None:
+        return
+    UserDeletion.objects.filter(pk=deletion_id).update(statut='EN_COURS', erreur='', date_maj=timezone.now())
+    deadline = time.monotonic() + getattr(settings, 'USER_DELETION_TIME_BUDGET', 45)
+    chunk_size = _chunk_size()
+
+    try:
+        for step in STEPS:
+            while _chunk(deletion_id, step, chunk_size):
+                if time.monotonic() > deadline:
+                    enqueue(deletion_id)
+                    return
+        if not _recompute(deletion_id, deadline):
+            enqueue(deletion_id)
+            return
+        # Ne restent que des lignes peu nombreuses (jetons, journal d'administration) : Collector
+        User.objects.filter(pk=deletion.utilisateur_id).delete()
+    except Exception as exc:
+        logger.exception('Échec de la suppression du compte %s', deletion.utilisateur_id)
+        UserDeletion.objects.filter(pk=deletion_id).update(statut='ECHEC', erreur=str(exc), date_maj=timezone.now())
+        raise
+
+    UserDeletion.objects.filter(pk=deletion_id).update(statut='TERMINE', date_fin=timezone.now(), date_maj=timezone.now())
+    invalidate_all()
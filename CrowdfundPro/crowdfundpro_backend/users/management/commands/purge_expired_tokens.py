@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = "Supprime par lots les jetons expirés (outstanding et blacklistés)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        total = 0
+
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            # Deux DELETE par lot, sans charger les lignes ni passer par le Collector
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                outstanding = OutstandingToken.objects.filter(pk__in=ids)
+                outstanding._raw_delete(outstanding.db)
+            total += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(f'{total} jeton(s) expiré(s) supprimé(s)'))
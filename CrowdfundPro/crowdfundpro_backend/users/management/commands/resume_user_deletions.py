@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.deletion import PENDING_STATUTS, enqueue
+from users.models import UserDeletion
+
+
+class Command(BaseCommand):
+    help = "Replanifie les suppressions de comptes interrompues ou en échec"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--idle-minutes', type=int, default=15,
+            help="Ne reprend que les demandes sans progression depuis ce délai (tâche encore en cours)",
+        )
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(minutes=options['idle_minutes'])
+        ids = list(
+            UserDeletion.objects.filter(statut__in=PENDING_STATUTS, date_maj__lt=limite).values_list('pk', flat=True)
+        )
+        for pk in ids:
+            enqueue(pk)
+        self.stdout.write(self.style.SUCCESS(f'{len(ids)} suppression(s) replanifiée(s)'))
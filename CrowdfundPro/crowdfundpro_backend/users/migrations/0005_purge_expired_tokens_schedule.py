@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.get_or_create(
+        name='purge_expired_tokens',
+        defaults={
+            'func': 'django.core.management.call_command',
+            'args': "'purge_expired_tokens'",
+            'schedule_type': 'H',
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='purge_expired_tokens').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_claimsuser'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_purge_expired_tokens_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('utilisateur_id', models.BigIntegerField(db_index=True)),
+                ('email', models.EmailField(max_length=254)),
+                ('statut', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('TERMINE', 'Terminé'), ('ECHEC', 'Échec')], default='EN_ATTENTE', max_length=10)),
+                ('compteurs', models.JSONField(blank=True, default=dict, help_text='Lignes supprimées par type')),
+                ('projets_impactes', models.JSONField(blank=True, default=list, help_text='Projets restants dont le montant est à recalculer')),
+                ('erreur', models.TextField(blank=True)),
+                ('date_demande', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('date_maj', models.DateTimeField(auto_now=True)),
+                ('date_fin', models.DateTimeField(blank=True, null=True)),
+                ('demandee_par', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='suppressions_demandees', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Suppression de compte',
+                'verbose_name_plural': 'Suppressions de comptes',
+                'db_table': 'user_deletions',
+                'ordering': ['-date_demande'],
+            },
+        ),
+    ]
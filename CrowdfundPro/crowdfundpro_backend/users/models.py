@@ -61,4 +61,84 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     @property
     def is_investisseur(self):
-        return self.role == 'INVESTISSEUR' 
\ No newline at end of file
+        return self.role == 'INVESTISSEUR' 
+
+class ClaimsUser(User):
+    """
+    Utilisateur reconstruit à partir des claims du jeton d'accès, sans requête.
+
+    Seuls `id`, `role`, `is_superuser`, `is_staff` et `is_active` sont chargés ; les autres
+    champs sont différés et copiés en une fois depuis le cache LRU des
+    utilisateurs complets au premier accès.
+    """
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, user_id, role, is_superuser, is_staff, is_active=True):
+        claims = {
+            'id': user_id,
+            'role': role,
+            'is_superuser': is_superuser,
+            'is_staff': is_staff,
+            'is_active': is_active,
+        }
+        # from_db attend les valeurs dans l'ordre des champs du modèle
+        field_names = [f.attname for f in cls._meta.concrete_fields if f.attname in claims]
+        return cls.from_db('default', field_names, [claims[name] for name in field_names])
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred = self.get_deferred_fields()
+        if fields is None or not deferred:
+            return super().refresh_from_db(using=using, fields=fields)
+
+        from .authentication import user_cache
+        full_user = user_cache.get(self.pk)
+        if full_user is None:
+            raise User.DoesNotExist('Utilisateur introuvable')
+        for attname in deferred:
+            setattr(self, attname, getattr(full_user, attname))
+
+
+class UserDeletion(models.Model):
+    """
+    Suppression d'un compte exécutée en tâche de fond (voir `users.deletion`).
+
+    Le compte est désactivé dès la demande ; ses données sont ensuite
+    supprimées par lots. `utilisateur_id` n'est pas une clé étrangère : la
+    ligne survit à l'utilisateur et sert de trace.
+    """
+    STATUT_CHOICES = (
+        ('EN_ATTENTE', 'En attente'),
+        ('EN_COURS', 'En cours'),
+        ('TERMINE', 'Terminé'),
+        ('ECHEC', 'Échec'),
+    )
+
+    utilisateur_id = models.BigIntegerField(db_index=True)
+    email = models.EmailField()
+    demandee_par = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='suppressions_demandees'
+    )
+    statut = models.CharField(max_length=10, choices=STATUT_CHOICES, default='EN_ATTENTE')
+    compteurs = models.JSONField(default=dict, blank=True, help_text="Lignes supprimées par type")
+    projets_impactes = models.JSONField(
+        default=list, blank=True, help_text="Projets restants dont le montant est à recalculer"
+    )
+    erreur = models.TextField(blank=True)
+    date_demande = models.DateTimeField(auto_now_add=True, db_index=True)
+    date_maj = models.DateTimeField(auto_now=True)
+    date_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'user_deletions'
+        verbose_name = 'Suppression de compte'
+        verbose_name_plural = 'Suppressions de comptes'
+        ordering = ['-date_demande']
+
+    def __str__(self):
+        return f"{self.email} ({self.statut})"
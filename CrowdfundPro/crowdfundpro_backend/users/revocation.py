@@ -0,0 +1,170 @@
+"""
+Filtre de révocation en mémoire pour les jetons de rafraîchissement.
+
+Un filtre de Bloom contient les `jti` blacklistés : un jeton absent du filtre
+n'est pas révoqué et aucune requête n'est faite. Un résultat positif (vrai ou
+faux positif) est confirmé en base.
+
+Le filtre est construit au démarrage du processus (première requête, voir
+`signals`), puis
+resynchronisé de façon incrémentale (nouvelles lignes de la blacklist par id
+croissant, avec un léger recouvrement pour les transactions validées dans le
+désordre) au plus toutes les `TOKEN_REVOCATION_SYNC_SECONDS`. Les jetons
+blacklistés par ce processus y sont ajoutés immédiatement ; ceux blacklistés par
+un autre processus le sont au plus tard après ce délai. Les jetons purgés
+(`purge_expired_tokens`) restent dans le filtre jusqu'à sa reconstruction,
+déclenchée par sa saturation.
+
+Les jetons d'accès ne sont pas blacklistés : `disabled_users` tient la liste
+des comptes désactivés (ou en cours de suppression), resynchronisée selon le
+même délai, pour refuser leurs jetons avant expiration.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from monitoring.metrics import cache_requests
+
+
+# Nombre de lignes relues à chaque synchronisation (ids attribués avant commit)
+SYNC_LOOKBACK = 100
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom à double hachage sur blake2b.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        if key in self:
+            return
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationFilter:
+
+    def __init__(self, capacity, error_rate, sync_interval):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = None
+        self._last_id = 0
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self, bloom, since_id):
+        """Ajoute au filtre les jetons blacklistés (non expirés) d'id > since_id."""
+        rows = BlacklistedToken.objects.filter(
+            pk__gt=since_id,
+            token__expires_at__gt=timezone.now(),
+        ).order_by('pk').values_list('pk', 'token__jti')
+        last_id = since_id
+        for pk, jti in rows.iterator(chunk_size=2000):
+            bloom.add(jti)
+            last_id = pk
+        return last_id
+
+    def rebuild(self):
+        with self._lock:
+            live = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()).count()
+            bloom = BloomFilter(max(self.capacity, live * 2), self.error_rate)
+            self._last_id = self._load(bloom, 0)
+            self._bloom = bloom
+            self._last_sync = time.monotonic()
+
+    def _sync(self):
+        if self._bloom is None:
+            self.rebuild()
+            return
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        with self._lock:
+            since_id = max(0, self._last_id - SYNC_LOOKBACK)
+            self._last_id = max(self._last_id, self._load(self._bloom, since_id))
+            self._last_sync = time.monotonic()
+            saturated = self._bloom.count > self._bloom.capacity
+        if saturated:
+            self.rebuild()
+
+    def add(self, jti):
+        if self._bloom is not None:
+            with self._lock:
+                self._bloom.add(jti)
+
+    def is_revoked(self, jti):
+        self._sync()
+        if jti not in self._bloom:
+            cache_requests.inc(cache='token_revocation', result='hit')
+            return False
+        cache_requests.inc(cache='token_revocation', result='miss')
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+class DisabledUsers:
+    """
+    Identifiants des comptes dont les jetons d'accès sont refusés : comptes
+    inactifs, et comptes supprimés depuis moins d'une durée de vie de jeton
+    d'accès (la ligne `users` n'existe plus, la demande de suppression reste).
+    """
+
+    def __init__(self, sync_interval):
+        self.sync_interval = sync_interval
+        self._ids = None
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    def sync(self, force=False):
+        if not force and self._ids is not None and time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        from .models import User, UserDeletion
+
+        depuis = timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+        rows = User.objects.filter(is_active=False).order_by().values_list('pk').union(
+            UserDeletion.objects.filter(date_demande__gt=depuis).order_by().values_list('utilisateur_id')
+        )
+        ids = frozenset(pk for pk, in rows)
+        with self._lock:
+            self._ids = ids
+            self._last_sync = time.monotonic()
+
+    def add(self, user_id):
+        if self._ids is not None:
+            with self._lock:
+                self._ids = self._ids | {user_id}
+
+    def __contains__(self, user_id):
+        self.sync()
+        return user_id in self._ids
+
+
+revocation_filter = RevocationFilter(
+    capacity=getattr(settings, 'TOKEN_REVOCATION_FILTER_CAPACITY', 100000),
+    error_rate=getattr(settings, 'TOKEN_REVOCATION_FILTER_ERROR_RATE', 0.001),
+    sync_interval=getattr(settings, 'TOKEN_REVOCATION_SYNC_SECONDS', 5),
+)
+
+disabled_users = DisabledUsers(sync_interval=getattr(settings, 'TOKEN_REVOCATION_SYNC_SECONDS', 5))
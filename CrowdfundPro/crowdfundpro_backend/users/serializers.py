@@ -1,5 +1,9 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
+from .tokens import CLAIM_FIELDS, ClaimsRefreshToken
 
 User = get_user_model()
 
@@ -61,4 +65,34 @@ class UserPublicSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'nom', 'role')
-        read_only_fields = fields 
\ No newline at end of file
+        read_only_fields = fields 
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rafraîchissement avec relecture des claims en base (une requête par
+    rafraîchissement) : un compte rétrogradé ne conserve pas ses droits par
+    rotation, un compte désactivé ou supprimé ne peut plus rafraîchir. La
+    révocation est contrôlée par le filtre de Bloom ; un jeton déjà utilisé
+    que le filtre ignore encore est refusé par l'insertion dans la blacklist.
+    """
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).only(*CLAIM_FIELDS).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('Compte désactivé ou supprimé', code='user_inactive')
+        refresh.set_claims(user)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.consume()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
@@ -0,0 +1,25 @@
+from django.core.signals import request_started
+from django.db.models.signals import post_save, post_delete
+
+from .authentication import user_cache
+from .models import User, ClaimsUser
+from .revocation import disabled_users, revocation_filter
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+for sender in (User, ClaimsUser):
+    post_save.connect(invalidate_cached_user, sender=sender, dispatch_uid=f'invalidate_cached_user_{sender.__name__}')
+    post_delete.connect(invalidate_cached_user, sender=sender, dispatch_uid=f'invalidate_cached_user_delete_{sender.__name__}')
+
+
+def build_revocation_filters(sender, **kwargs):
+    """Construit les filtres de révocation au démarrage du processus (première requête)."""
+    request_started.disconnect(build_revocation_filters, dispatch_uid='build_revocation_filters')
+    revocation_filter.rebuild()
+    disabled_users.sync(force=True)
+
+
+request_started.connect(build_revocation_filters, dispatch_uid='build_revocation_filters')
@@ -0,0 +1,253 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from changefeed.models import ChangeLog
+from investments.models import Investment
+from ledger.models import LedgerEntry, balance
+from projects.models import Project
+from uploads.models import Blob
+from .authentication import user_cache
+from .deletion import run
+from .models import User, UserDeletion
+from .revocation import revocation_filter
+from .tokens import ClaimsRefreshToken
+
+
+class ClaimsTokenTests(APITestCase):
+    """
+    Claims de contrôle d'accès portés par les jetons JWT.
+    """
+
+    def setUp(self):
+        user_cache.clear()
+        self.admin = User.objects.create_superuser('admin@example.com', 'secret', username='admin')
+        self.investisseur = User.objects.create_user(
+            'inv@example.com', 'secret', username='inv', role='INVESTISSEUR'
+        )
+
+    def _refresh(self, refresh):
+        return self.client.post('/api/token/refresh/', {'refresh': str(refresh)}, format='json')
+
+    def test_refresh_relit_les_claims(self):
+        refresh = ClaimsRefreshToken.for_user(self.admin)
+        User.objects.filter(pk=self.admin.pk).update(is_superuser=False, is_staff=False, role='INVESTISSEUR')
+
+        response = self._refresh(refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for token in (AccessToken(response.data['access']), ClaimsRefreshToken(response.data['refresh'])):
+            self.assertEqual(token['role'], 'INVESTISSEUR')
+            self.assertFalse(token['is_superuser'])
+            self.assertFalse(token['is_staff'])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.data["access"]}')
+        response = self.client.delete(f'/api/users/{self.investisseur.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_refuse_un_compte_inactif(self):
+        refresh = ClaimsRefreshToken.for_user(self.investisseur)
+        User.objects.filter(pk=self.investisseur.pk).update(is_active=False)
+        self.assertEqual(self._refresh(refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_refuse_un_compte_supprime(self):
+        refresh = ClaimsRefreshToken.for_user(self.investisseur)
+        User.objects.filter(pk=self.investisseur.pk).delete()
+        self.assertEqual(self._refresh(refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_refuse_un_jeton_revoque_ailleurs(self):
+        refresh = ClaimsRefreshToken.for_user(self.investisseur)
+        # Révoqué par un autre processus : absent du filtre de Bloom local
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=refresh['jti']))
+        with mock.patch.object(revocation_filter, 'is_revoked', return_value=False):
+            self.assertEqual(self._refresh(refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_sans_lecture_de_la_blacklist(self):
+        refresh = ClaimsRefreshToken.for_user(self.investisseur)
+        revocation_filter.rebuild()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._refresh(refresh).status_code, status.HTTP_200_OK)
+        lectures = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'blacklistedtoken' in q['sql']]
+        self.assertEqual(lectures, [])
+        # Jeton déjà utilisé : refusé (filtre local)
+        self.assertEqual(self._refresh(refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_acces_refuse_si_claim_inactif(self):
+        access = ClaimsRefreshToken.for_user(self.investisseur).access_token
+        access['is_active'] = False
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profil_partiel_ne_reecrit_pas_le_mot_de_passe(self):
+        access = ClaimsRefreshToken.for_user(self.investisseur).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        # Remplit le cache avec l'utilisateur courant, puis change le mot de passe ailleurs
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, status.HTTP_200_OK)
+        self.investisseur.set_password('nouveau')
+        User.objects.filter(pk=self.investisseur.pk).update(password=self.investisseur.password)
+
+        response = self.client.patch('/api/users/profile/', {'nom': 'Nouveau nom'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = User.objects.get(pk=self.investisseur.pk)
+        self.assertEqual(user.nom, 'Nouveau nom')
+        self.assertTrue(check_password('nouveau', user.password))
+
+
+class UserDeletionTests(APITestCase):
+    """
+    Suppression d'un investisseur et d'un porteur par la tâche de fond.
+    """
+
+    BLOB = 'blobs/ab/cd/abcd.jpg'
+
+    def setUp(self):
+        user_cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.admin = User.objects.create_superuser('admin@example.com', 'secret', username='admin')
+        self.porteur = User.objects.create_user('porteur@example.com', 'secret', username='porteur', role='PORTEUR')
+        autre_porteur = User.objects.create_user('autre@example.com', 'secret', username='autre', role='PORTEUR')
+        self.investisseur = User.objects.create_user('inv@example.com', 'secret', username='inv', role='INVESTISSEUR')
+        autre_investisseur = User.objects.create_user('inv2@example.com', 'secret', username='inv2', role='INVESTISSEUR')
+
+        date_limite = timezone.now() + timedelta(days=30)
+        self.projet_supprime = Project.objects.create(
+            titre='Projet du porteur supprimé', description='d' * 60, objectif=Decimal('10000'),
+            statut='EN_COURS', date_limite=date_limite, porteur=self.porteur,
+        )
+        self.projet_conserve = Project.objects.create(
+            titre='Projet conservé', description='d' * 60, objectif=Decimal('10000'),
+            statut='EN_COURS', date_limite=date_limite, porteur=autre_porteur,
+        )
+
+        def invest(investisseur, projet, montant, statut):
+            return Investment.objects.create(
+                investisseur=investisseur, projet=projet, montant=Decimal(montant),
+                statut_paiement=statut, methode_paiement='CARTE',
+            )
+
+        self.rembourse = invest(self.investisseur, self.projet_conserve, 100, 'REUSSI')
+        self.echoue = invest(self.investisseur, self.projet_conserve, 30, 'ECHOUE')
+        invest(autre_investisseur, self.projet_conserve, 50, 'REUSSI')
+        self.sur_projet_supprime = [
+            invest(autre_investisseur, self.projet_supprime, 200, 'REUSSI').pk,
+            invest(self.investisseur, self.projet_supprime, 70, 'REUSSI').pk,
+        ]
+
+        # Après les investissements (qui enregistrent le projet en mémoire) : image
+        # partagée avec un autre projet (refcount 2) et variantes générées
+        Blob.objects.create(name=self.BLOB, digest='abcd', size=1, refcount=2)
+        self.variant = default_storage.save('projects/variants/test-card.jpeg', ContentFile(b'jpeg'))
+        Project.objects.filter(pk=self.projet_supprime.pk).update(
+            image=self.BLOB,
+            image_variants={'source': self.BLOB, 'card': {'width': 1, 'height': 1, 'jpeg': self.variant}},
+        )
+
+    def _delete(self, user):
+        self.client.force_authenticate(self.admin)
+        with mock.patch('users.deletion.enqueue') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(f'/api/users/{user.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        enqueue.assert_called_once_with(response.data['suppression'])
+        return response.data['suppression']
+
+    def _run(self, deletion_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            run(deletion_id)
+        self.assertEqual(UserDeletion.objects.get(pk=deletion_id).statut, 'TERMINE')
+
+    def test_compte_desactive_avant_la_suppression(self):
+        access = ClaimsRefreshToken.for_user(self.investisseur).access_token
+        self._delete(self.investisseur)
+
+        self.assertFalse(User.objects.get(pk=self.investisseur.pk).is_active)
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(USER_DELETION_CHUNK_SIZE=1)
+    def test_suppression_complete(self):
+        now = timezone.now()
+        for user in (self.investisseur, self.porteur):
+            self._run(self._delete(user))
+
+        self.assertFalse(User.objects.filter(pk__in=[self.investisseur.pk, self.porteur.pk]).exists())
+        self.assertFalse(Investment.objects.filter(investisseur_id=self.investisseur.pk).exists())
+        self.assertFalse(Project.objects.filter(pk=self.projet_supprime.pk).exists())
+
+        # Registre : les investissements réussis de l'investisseur sont remboursés (projet
+        # encore présent à sa suppression), pas ceux des autres sur le projet supprimé ensuite
+        remboursements = LedgerEntry.objects.filter(type='REMBOURSEMENT').order_by('investissement_id')
+        self.assertEqual(
+            list(remboursements.values_list('projet_id', 'investissement_id', 'montant')),
+            [
+                (self.projet_conserve.pk, self.rembourse.pk, Decimal('-100.00')),
+                (self.projet_supprime.pk, self.sur_projet_supprime[1], Decimal('-70.00')),
+            ],
+        )
+
+        # Montant recalculé du projet conservé
+        projet = Project.objects.get(pk=self.projet_conserve.pk)
+        self.assertEqual(projet.montant_actuel, Decimal('50.00'))
+        self.assertEqual(balance(projet.pk), Decimal('50.00'))
+
+        # Flux de modifications : une suppression par investissement et projet supprimés
+        tombstones = set(
+            ChangeLog.objects.filter(action='delete', date__gte=now).values_list('entity', 'object_id')
+        )
+        expected = {('investment', pk) for pk in [self.rembourse.pk, self.echoue.pk, *self.sur_projet_supprime]}
+        expected.add(('project', self.projet_supprime.pk))
+        self.assertEqual(tombstones, expected)
+
+        # Fichiers : référence au blob libérée, variantes supprimées
+        self.assertEqual(Blob.objects.get(pk=self.BLOB).refcount, 1)
+        self.assertFalse(default_storage.exists(self.variant))
+
+    def test_broker_indisponible(self):
+        self.client.force_authenticate(self.admin)
+        broker_down = RedisConnectionError('Error 111 connecting to 127.0.0.1:6379. Connection refused.')
+        with mock.patch('django_q.tasks.async_task', side_effect=broker_down):
+            with self.assertLogs('users.deletion', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(f'/api/users/{self.investisseur.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        deletion = UserDeletion.objects.get(pk=response.data['suppression'])
+        self.assertEqual(deletion.statut, 'EN_ATTENTE')
+        self.assertFalse(User.objects.get(pk=self.investisseur.pk).is_active)
+
+        # Reprise planifiée une fois le broker revenu
+        with mock.patch('django_q.tasks.async_task') as async_task:
+            call_command('resume_user_deletions', idle_minutes=0, stdout=StringIO())
+        async_task.assert_called_once_with('users.deletion.run', deletion.pk)
+
+    def test_suppression_depuis_l_admin(self):
+        self.client.force_login(self.admin)
+        with mock.patch('users.deletion.enqueue') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(f'/admin/users/user/{self.porteur.pk}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        deletion = UserDeletion.objects.get(utilisateur_id=self.porteur.pk)
+        enqueue.assert_called_once_with(deletion.pk)
+        # Rien n'est supprimé dans la requête
+        self.assertFalse(User.objects.get(pk=self.porteur.pk).is_active)
+        self.assertTrue(Project.objects.filter(pk=self.projet_supprime.pk).exists())
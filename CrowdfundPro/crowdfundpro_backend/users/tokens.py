@@ -0,0 +1,71 @@
+"""
+Jetons JWT portant les claims utilisés par les contrôles d'accès.
+"""
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .revocation import revocation_filter
+
+
+# Claims de contrôle d'accès, relus en base à chaque rafraîchissement
+CLAIM_FIELDS = ('role', 'is_superuser', 'is_staff', 'is_active')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Jeton de rafraîchissement incluant `role`, `is_superuser`, `is_staff` et
+    `is_active`.
+
+    Les claims sont recopiés dans chaque jeton d'accès dérivé, ce qui permet à
+    `ClaimsJWTAuthentication` de construire l'utilisateur sans requête. Ils
+    sont relus en base à chaque rafraîchissement (voir
+    `ClaimsTokenRefreshSerializer`) : un changement de rôle est pris en compte
+    au plus tard à l'expiration du jeton d'accès.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_claims(user)
+        return token
+
+    def set_claims(self, user):
+        for name in CLAIM_FIELDS:
+            self[name] = getattr(user, name)
+
+    def check_blacklist(self):
+        """
+        Contrôle de révocation via le filtre de Bloom en mémoire : la base
+        n'est interrogée que pour confirmer un résultat positif.
+        """
+        if revocation_filter.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        result = super().blacklist()
+        revocation_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+    def consume(self):
+        """
+        Blackliste le jeton lors de sa rotation, par une insertion qui échoue
+        s'il l'est déjà : un jeton rejoué (révoqué par un autre processus, pas
+        encore dans le filtre local) lève `TokenError`, sans lecture préalable.
+        """
+        jti = self.payload[api_settings.JTI_CLAIM]
+        token, _created = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={'token': str(self), 'expires_at': datetime_from_epoch(self.payload['exp'])},
+        )
+        try:
+            with transaction.atomic():
+                BlacklistedToken.objects.create(token=token)
+        except IntegrityError:
+            raise TokenError(_('Token is blacklisted'))
+        finally:
+            revocation_filter.add(jti)
@@ -2,7 +2,8 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import ClaimsRefreshToken
+from .deletion import schedule_deletion
 from django.contrib.auth import authenticate, get_user_model
 from .models import User
 from .serializers import (
@@ -38,7 +39,7 @@ class UserRegistrationView(generics.CreateAPIView):
         user = serializer.save()
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         
         return Response({
             'message': 'Inscription réussie',
@@ -63,7 +64,10 @@ class UserProfileView(APIView):
 
     def patch(self, request):
         try:
-            serializer = UserProfileSerializer(request.user, data=request.data, partial=True)
+            # request.user est construit depuis le jeton (champs complétés par un
+            # cache) : l'enregistrement part de la ligne courante, pas de ces copies
+            user = User.objects.get(pk=request.user.pk)
+            serializer = UserProfileSerializer(user, data=request.data, partial=True)
             if serializer.is_valid():
                 serializer.save()
                 return Response(serializer.data)
@@ -81,8 +85,6 @@ class UserLoginView(APIView):
 
     def post(self, request):
         try:
-            logger.info(f"Tentative de connexion - données reçues: {request.data}")
-            
             serializer = LoginSerializer(data=request.data)
             if serializer.is_valid():
                 email = serializer.validated_data['email']
@@ -93,7 +95,7 @@ class UserLoginView(APIView):
                 
                 if user:
                     logger.info(f"Authentification réussie pour l'utilisateur: {user.email}")
-                    refresh = RefreshToken.for_user(user)
+                    refresh = ClaimsRefreshToken.for_user(user)
                     user_serializer = UserSerializer(user)
                     
                     return Response({
@@ -124,7 +126,7 @@ class UserLogoutView(APIView):
         try:
             refresh_token = request.data.get('refresh_token')
             if refresh_token:
-                token = RefreshToken(refresh_token)
+                token = ClaimsRefreshToken(refresh_token)
                 token.blacklist()
             return Response(status=status.HTTP_205_RESET_CONTENT)
         except Exception:
@@ -179,10 +181,11 @@ def delete_user(request, pk):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        user.delete()
+        # Compte désactivé immédiatement, données supprimées en tâche de fond
+        deletion = schedule_deletion(user, demandee_par=request.user)
         return Response(
-            {'message': 'Utilisateur supprimé avec succès'}, 
-            status=status.HTTP_204_NO_CONTENT
+            {'message': 'Suppression de l\'utilisateur programmée', 'suppression': deletion.pk},
+            status=status.HTTP_202_ACCEPTED
         )
     except User.DoesNotExist:
         return Response(
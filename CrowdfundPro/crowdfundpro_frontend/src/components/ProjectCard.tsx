@@ -74,19 +74,19 @@ export default function ProjectCard({ project }: ProjectCardProps) {
         </div>
         
         {/* Documents disponibles */}
-        {(project.business_plan || project.plan_juridique) && (
+        {(project.documents?.business_plan || project.documents?.plan_juridique) && (
           <div className="mt-2 pt-2 border-t border-gray-100">
             <div className="flex items-center text-xs text-gray-500">
               <span className="mr-1">📄</span>
               <span>Documents:</span>
             </div>
             <div className="flex flex-wrap gap-1 mt-1">
-              {project.business_plan && (
+              {project.documents?.business_plan && (
                 <span className="inline-flex items-center px-2 py-1 rounded-full text-xs bg-blue-100 text-blue-800">
                   📊 Business Plan
                 </span>
               )}
-              {project.plan_juridique && (
+              {project.documents?.plan_juridique && (
                 <span className="inline-flex items-center px-2 py-1 rounded-full text-xs bg-purple-100 text-purple-800">
                   ⚖️ Plan Juridique
                 </span>
@@ -8,6 +8,7 @@ import ProjectOwnerActions from './ProjectOwnerActions';
 import dynamic from 'next/dynamic';
 import InvestmentModal from './InvestmentModal';
 import { formatCurrency } from '../utils/format';
+import { projectsService } from '../services/projects';
 
 const ProjectMap = dynamic(() => import('./ProjectMap'), {
   ssr: false,
@@ -98,43 +99,41 @@ export default function ProjectDetails({ project }: ProjectDetailsProps) {
           )}
 
           {/* Documents */}
-          {(project.business_plan || project.plan_juridique) && (
+          {(project.documents?.business_plan || project.documents?.plan_juridique) && (
             <div className="mb-6 p-4 bg-blue-50 rounded-lg">
               <h3 className="text-lg font-semibold text-gray-900 mb-3 flex items-center">
                 <span className="mr-2">📄</span>
                 Documents du projet
               </h3>
               <div className="space-y-2">
-                {project.business_plan && (
+                {project.documents?.business_plan && (
                   <div className="flex items-center justify-between p-3 bg-white rounded border">
                     <div className="flex items-center">
                       <span className="mr-2">📊</span>
                       <span className="font-medium">Business Plan</span>
                     </div>
-                    <a
-                      href={project.business_plan}
-                      target="_blank"
-                      rel="noopener noreferrer"
+                    <button
+                      type="button"
+                      onClick={() => projectsService.downloadDocument(project.documents!.business_plan!, 'business_plan-' + project.id)}
                       className="text-blue-600 hover:text-blue-800 text-sm font-medium"
                     >
                       Télécharger →
-                    </a>
+                    </button>
                   </div>
                 )}
-                {project.plan_juridique && (
+                {project.documents?.plan_juridique && (
                   <div className="flex items-center justify-between p-3 bg-white rounded border">
                     <div className="flex items-center">
                       <span className="mr-2">⚖️</span>
                       <span className="font-medium">Plan Juridique et Réglementaire</span>
                     </div>
-                    <a
-                      href={project.plan_juridique}
-                      target="_blank"
-                      rel="noopener noreferrer"
+                    <button
+                      type="button"
+                      onClick={() => projectsService.downloadDocument(project.documents!.plan_juridique!, 'plan_juridique-' + project.id)}
                       className="text-blue-600 hover:text-blue-800 text-sm font-medium"
                     >
                       Télécharger →
-                    </a>
+                    </button>
                   </div>
                 )}
               </div>
@@ -63,6 +63,20 @@ export const projectsService = {
     return response.data;
   },
 
+  // Download a project document (authenticated request, then local save)
+  async downloadDocument(url: string, filename: string): Promise<void> {
+    const response = await api.get(url, { responseType: 'blob' });
+    // Nom complet (avec extension) fourni par le serveur : filename*=UTF-8''...
+    const disposition: string = response.headers['content-disposition'] || '';
+    const match = disposition.match(/filename\*=UTF-8''([^;]+)/);
+    const objectUrl = URL.createObjectURL(response.data);
+    const link = document.createElement('a');
+    link.href = objectUrl;
+    link.download = match ? decodeURIComponent(match[1]) : filename;
+    link.click();
+    URL.revokeObjectURL(objectUrl);
+  },
+
   // Update project
   async updateProject(id: number, data: Partial<Project>): Promise<Project> {
     const response = await api.patch(`/projects/${id}/`, data);
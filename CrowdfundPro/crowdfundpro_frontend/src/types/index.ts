@@ -57,8 +57,13 @@ export interface Project {
   longitude?: number;
   adresse?: string;
   a_localisation?: boolean;
-  business_plan?: string;
-  plan_juridique?: string;
+  documents?: ProjectDocuments;
+}
+
+// URLs de téléchargement contrôlé (requêtes authentifiées), null si absent
+export interface ProjectDocuments {
+  business_plan: string | null;
+  plan_juridique: string | null;
 }
 
 export interface ProjectCreateData {
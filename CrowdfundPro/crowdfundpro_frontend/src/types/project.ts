@@ -26,7 +26,9 @@ export interface Project {
   longitude?: number;
   adresse?: string;
   a_localisation?: boolean;
-  // Nouveaux champs pour les documents
-  business_plan?: string;
-  plan_juridique?: string;
+  // Documents : URLs de téléchargement contrôlé, null si absent
+  documents?: {
+    business_plan: string | null;
+    plan_juridique: string | null;
+  };
 } 
\ No newline at end of file